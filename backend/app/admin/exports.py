@@ -0,0 +1,154 @@
+# app/admin/exports.py
+import csv
+import datetime
+import decimal
+import enum
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Sequence
+
+from sqlalchemy import asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.books import schemas as book_schemas
+from app.books.service import book_service
+from app.exchanges import schemas as exchange_schemas
+from app.exchanges.service import exchange_service
+from app.models import books as book_models
+from app.models import exchange as exchange_models
+from app.models.review import Review
+from app.reviews import schemas as review_schemas
+from app.reviews.service import review_service
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+YIELD_PER = 1000 # Rows fetched per round trip from the server-side cursor
+FLUSH_BYTES = 64 * 1024 # Output is sent in chunks of roughly this size
+
+EXCHANGE_COLUMNS = (
+    "id", "slug", "name", "website_url", "overall_average_rating", "total_review_count", "total_rating_count",
+    "year_founded", "registration_country_id", "trading_volume_24h",
+    "has_kyc", "has_p2p", "has_copy_trading", "has_staking", "has_futures", "has_spot_trading", "has_demo_trading",
+    "spot_maker_fee", "spot_taker_fee", "futures_maker_fee", "futures_taker_fee", "created_at", "updated_at",
+)
+BOOK_COLUMNS = (
+    "id", "slug", "name", "author", "publisher", "year", "pages", "number", "website_url",
+    "overall_average_rating", "total_review_count", "total_rating_count", "created_at", "updated_at",
+)
+REVIEW_COLUMNS = (
+    "id", "item_id", "user_id", "guest_name", "rating", "comment", "moderation_status",
+    "useful_votes_count", "not_useful_votes_count", "created_at", "updated_at",
+)
+
+
+# --- Queries (plain columns, no ORM entities or relationship loading) ---
+def exchanges_query(filters: exchange_schemas.ExchangeFilterParams):
+    query, joins_applied = exchange_service._apply_filters(
+        select(*[getattr(exchange_models.Exchange, col) for col in EXCHANGE_COLUMNS]), filters
+    )
+    if joins_applied:
+        query = query.distinct()
+    return query.order_by(asc(exchange_models.Exchange.id)), EXCHANGE_COLUMNS
+
+def books_query(filters: book_schemas.BookFilterParams):
+    query, tag_filter_applied = book_service._apply_filters(
+        select(*[getattr(book_models.Book, col) for col in BOOK_COLUMNS]), filters
+    )
+    if tag_filter_applied:
+        query = query.distinct()
+    return query.order_by(asc(book_models.Book.id)), BOOK_COLUMNS
+
+def reviews_query(filters: review_schemas.ReviewFilterParams):
+    query = review_service._apply_filters(select(*[getattr(Review, col) for col in REVIEW_COLUMNS]), filters)
+    return query.order_by(asc(Review.id)), REVIEW_COLUMNS
+
+
+# --- Encoding ---
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+class _NdjsonEncoder:
+    def __init__(self, columns: Sequence[str]):
+        self.columns = columns
+
+    def header(self) -> str:
+        return ""
+
+    def row(self, row: Sequence[Any]) -> str:
+        return json.dumps({col: _plain(value) for col, value in zip(self.columns, row)}, ensure_ascii=False) + "\n"
+
+class _CsvEncoder:
+    def __init__(self, columns: Sequence[str]):
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _line(self, values: Sequence[Any]) -> str:
+        self._writer.writerow(values)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+    def header(self) -> str:
+        return self._line(self.columns)
+
+    def row(self, row: Sequence[Any]) -> str:
+        return self._line([_plain(value) for value in row])
+
+
+async def stream_export(
+    session_factory: Callable[[], AsyncSession],
+    query,
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of `query` as NDJSON or CSV (optionally gzip'd) in constant memory.
+    Rows come from a server-side cursor, YIELD_PER at a time. The session is opened here
+    rather than taken from a request dependency, because it must outlive the endpoint for a streamed body.
+    """
+    encoder = _NdjsonEncoder(columns) if fmt == "ndjson" else _CsvEncoder(columns)
+    gzip = zlib.compressobj(wbits=31) if compress else None # wbits=31: gzip container
+
+    def emit(text: str) -> bytes:
+        data = text.encode()
+        return gzip.compress(data) if gzip is not None else data
+
+    chunk: List[bytes] = [emit(encoder.header())]
+    size = 0
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=YIELD_PER))
+        async for row in result:
+            data = emit(encoder.row(row))
+            chunk.append(data)
+            size += len(data)
+            if size >= FLUSH_BYTES:
+                yield b"".join(chunk)
+                chunk, size = [], 0
+    if gzip is not None:
+        chunk.append(gzip.flush())
+    if chunk:
+        yield b"".join(chunk)
+
+
+def export_filename(dataset: str, fmt: ExportFormat, compress: bool) -> str:
+    stamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    return f"{dataset}-{stamp}.{fmt}" + (".gz" if compress else "")
+
+
+DATASETS: Dict[str, Callable[[Optional[Any]], Any]] = {
+    "exchanges": lambda filters: exchanges_query(filters or exchange_schemas.ExchangeFilterParams()),
+    "books": lambda filters: books_query(filters or book_schemas.BookFilterParams()),
+    "reviews": lambda filters: reviews_query(filters or review_schemas.ReviewFilterParams()),
+}
@@ -0,0 +1,387 @@
+# app/admin/imports.py
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from sqlalchemy import delete, func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.admin import schemas
+from app.books.service import book_service
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.exchanges.service import exchange_service
+from app.models import books as book_models
+from app.models import exchange as exchange_models
+from app.models.common import Country, FiatCurrency, Language
+from app.models.item import Item, ItemTypeEnum
+from app.models.tag import Tag, item_tags_association
+
+logger = logging.getLogger(__name__)
+
+Ref = Union[int, str] # Reference by id, or by ISO code (tags: by name)
+
+ITEM_COLUMNS = ("name", "overview", "description", "logo_url", "website_url", "referral_link", "reviews_page_content")
+
+
+# --- Line schemas ---
+class _ItemImportRow(BaseModel):
+    model_config = ConfigDict(extra="forbid") # A misspelled field is an error, not silently dropped
+
+    slug: str = Field(..., min_length=2, max_length=255, pattern=r"^[a-z0-9-]+$")
+    name: str = Field(..., min_length=2, max_length=255)
+    overview: Optional[str] = None
+    description: Optional[str] = None
+    logo_url: Optional[str] = Field(None, max_length=512)
+    website_url: Optional[str] = Field(None, max_length=512)
+    referral_link: Optional[str] = Field(None, max_length=512)
+    reviews_page_content: Optional[str] = None
+    tags: Optional[List[Ref]] = None
+
+class ExchangeImportRow(_ItemImportRow):
+    year_founded: Optional[int] = Field(None, ge=1990, le=datetime.now().year)
+    registration_country: Optional[Ref] = None
+    headquarters_country: Optional[Ref] = None
+
+    has_kyc: Optional[bool] = None
+    has_p2p: Optional[bool] = None
+    has_copy_trading: Optional[bool] = None
+    has_staking: Optional[bool] = None
+    has_futures: Optional[bool] = None
+    has_spot_trading: Optional[bool] = None
+    has_demo_trading: Optional[bool] = None
+
+    trading_volume_24h: Optional[Decimal] = Field(None, ge=0, max_digits=20, decimal_places=2)
+    spot_maker_fee: Optional[Decimal] = Field(None, ge=0, max_digits=8, decimal_places=5)
+    futures_maker_fee: Optional[Decimal] = Field(None, ge=0, max_digits=8, decimal_places=5)
+    spot_taker_fee: Optional[Decimal] = Field(None, ge=0, max_digits=8, decimal_places=5)
+    futures_taker_fee: Optional[Decimal] = Field(None, ge=0, max_digits=8, decimal_places=5)
+
+    fee_structure_summary: Optional[str] = None
+    security_details: Optional[str] = None
+    kyc_aml_policy: Optional[str] = None
+    liquidity_score: Optional[Decimal] = Field(None, ge=0, max_digits=5, decimal_places=2)
+    newbie_friendliness_score: Optional[Decimal] = Field(None, ge=0, max_digits=3, decimal_places=2)
+
+    available_in_countries: Optional[List[Ref]] = None
+    languages: Optional[List[Ref]] = None
+    fiat_currencies: Optional[List[Ref]] = None
+
+class BookImportRow(_ItemImportRow):
+    year: Optional[int] = Field(None, ge=1500, le=datetime.now().year)
+    number: Optional[str] = Field(None, max_length=50)
+    pages: Optional[int] = Field(None, ge=1)
+    author: Optional[str] = Field(None, max_length=255)
+    publisher: Optional[str] = Field(None, max_length=255)
+
+
+class UnknownReference(ValueError):
+    pass
+
+
+class _Lookup:
+    """Ids of one reference table, keyed by id and by (casefolded) code or name."""
+
+    def __init__(self, what: str, rows: List[Tuple[int, str]]):
+        self.what = what
+        self.ids: Set[int] = {row_id for row_id, _ in rows}
+        self.by_key: Dict[str, int] = {key.casefold(): row_id for row_id, key in rows if key}
+
+    def resolve(self, ref: Ref) -> int:
+        if isinstance(ref, int):
+            if ref in self.ids:
+                return ref
+        else:
+            key = ref.strip().casefold()
+            if key in self.by_key:
+                return self.by_key[key]
+            if key.isdigit() and int(key) in self.ids:
+                return int(key)
+        raise UnknownReference(f"Unknown {self.what} {ref!r}")
+
+    def resolve_all(self, refs: List[Ref]) -> List[int]:
+        return list(dict.fromkeys(self.resolve(ref) for ref in refs)) # Deduplicated, in order
+
+
+@dataclass
+class _References:
+    countries: _Lookup
+    languages: _Lookup
+    fiat_currencies: _Lookup
+    tags: _Lookup
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "_References":
+        async def rows(query) -> List[Tuple[int, str]]:
+            return [tuple(row) for row in (await db.execute(query)).all()]
+        return cls(
+            countries=_Lookup("country", await rows(select(Country.id, Country.code_iso_alpha2))),
+            languages=_Lookup("language", await rows(select(Language.id, Language.code_iso_639_1))),
+            fiat_currencies=_Lookup("fiat currency", await rows(select(FiatCurrency.id, FiatCurrency.code_iso_4217))),
+            tags=_Lookup("tag", await rows(select(Tag.id, Tag.name))),
+        )
+
+
+@dataclass
+class _Kind:
+    """What differs between importing exchanges and books."""
+    item_type: ItemTypeEnum
+    row_schema: Type[_ItemImportRow]
+    model: Any
+    columns: Tuple[str, ...] # Columns of the subclass table (besides id)
+    references: Dict[str, Tuple[str, str]] # Single-id field -> (column, lookup)
+    associations: Dict[str, Tuple[Any, str, str]] # List field -> (table, id column, lookup); "tags" is added for all kinds
+    invalidate: Callable[[], Any]
+
+EXCHANGE_KIND = _Kind(
+    item_type=ItemTypeEnum.exchange,
+    row_schema=ExchangeImportRow,
+    model=exchange_models.Exchange,
+    columns=(
+        "year_founded", "registration_country_id", "headquarters_country_id",
+        "has_kyc", "has_p2p", "has_copy_trading", "has_staking", "has_futures", "has_spot_trading", "has_demo_trading",
+        "trading_volume_24h", "spot_maker_fee", "futures_maker_fee", "spot_taker_fee", "futures_taker_fee",
+        "fee_structure_summary", "security_details", "kyc_aml_policy", "liquidity_score", "newbie_friendliness_score",
+    ),
+    references={
+        "registration_country": ("registration_country_id", "countries"),
+        "headquarters_country": ("headquarters_country_id", "countries"),
+    },
+    associations={
+        "available_in_countries": (exchange_models.exchange_availability_table, "country_id", "countries"),
+        "languages": (exchange_models.exchange_languages_table, "language_id", "languages"),
+        "fiat_currencies": (exchange_models.exchange_fiat_support_table, "fiat_currency_id", "fiat_currencies"),
+    },
+    invalidate=lambda: exchange_service.invalidate_caches(None),
+)
+
+BOOK_KIND = _Kind(
+    item_type=ItemTypeEnum.book,
+    row_schema=BookImportRow,
+    model=book_models.Book,
+    columns=("year", "number", "pages", "author", "publisher"),
+    references={},
+    associations={},
+    invalidate=lambda: book_service.invalidate_caches(None),
+)
+
+KINDS: Dict[str, _Kind] = {"exchange": EXCHANGE_KIND, "book": BOOK_KIND}
+
+
+@dataclass
+class _Line:
+    number: int
+    row: _ItemImportRow
+    values: Dict[str, Any] # Item and subclass columns
+    links: Dict[str, List[int]] # Association field -> ids, only for lists given on the line
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """(1-based line number, line) for every non-blank line of a byte stream, without buffering the whole body."""
+    pending = b""
+    number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if pending.strip():
+        yield number + 1, pending
+
+
+class NdjsonImporter:
+    """
+    Bulk import of exchanges or books from NDJSON, one object per line.
+
+    Lines are validated and upserted IMPORT_CHUNK_SIZE at a time, one transaction per chunk:
+    items are upserted by slug with a single multi-row INSERT .. ON CONFLICT, then the
+    subclass rows by id, then association lists are replaced with multi-row inserts.
+    Existing values are kept for fields a line leaves out or sets to null, and association
+    lists are only replaced when the line has them. References (countries, languages,
+    fiat currencies, tags) may be ids or ISO codes (tag names for tags), resolved in memory.
+    Invalid lines are reported by line number and skipped; a chunk that fails in the
+    database is reported line by line too, and the import carries on with the next chunk.
+    """
+
+    def __init__(self, kind: str, chunk_size: int = settings.IMPORT_CHUNK_SIZE, max_errors: int = settings.IMPORT_MAX_REPORTED_ERRORS):
+        self.kind = KINDS[kind]
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.report = schemas.ImportReport(kind=kind)
+        self._slugs: Set[str] = set()
+        self._names: Dict[str, str] = {} # Name -> slug, within this import
+
+    def _fail(self, number: int, slug: Optional[str], error: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(schemas.ImportLineError(line=number, slug=slug, error=error))
+        else:
+            self.report.errors_truncated = True
+
+    def _parse(self, number: int, raw: bytes, refs: _References) -> Optional[_Line]:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            self._fail(number, None, f"Invalid JSON: {e}")
+            return None
+        slug = data.get("slug") if isinstance(data, dict) else None
+        try:
+            row = self.kind.row_schema.model_validate(data)
+        except ValidationError as e:
+            first = e.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            self._fail(number, slug, f"{location}: {first['msg']}" if location else first["msg"])
+            return None
+
+        if row.slug in self._slugs:
+            self._fail(number, row.slug, "Duplicate slug in this import")
+            return None
+        if self._names.get(row.name, row.slug) != row.slug:
+            self._fail(number, row.slug, f"Name '{row.name}' is already used by '{self._names[row.name]}' in this import")
+            return None
+
+        values = {col: getattr(row, col) for col in ITEM_COLUMNS}
+        links: Dict[str, List[int]] = {}
+        try:
+            for field, (column, lookup) in self.kind.references.items():
+                ref = getattr(row, field)
+                values[column] = getattr(refs, lookup).resolve(ref) if ref is not None else None
+            for field, (_, _, lookup) in self._associations().items():
+                refs_in_line = getattr(row, field)
+                if refs_in_line is not None:
+                    links[field] = getattr(refs, lookup).resolve_all(refs_in_line)
+        except UnknownReference as e:
+            self._fail(number, row.slug, str(e))
+            return None
+        for col in self.kind.columns:
+            values.setdefault(col, getattr(row, col, None))
+
+        self._slugs.add(row.slug)
+        self._names[row.name] = row.slug
+        return _Line(number, row, values, links)
+
+    def _associations(self) -> Dict[str, Tuple[Any, str, str]]:
+        return {**self.kind.associations, "tags": (item_tags_association, "tag_id", "tags")}
+
+    async def _taken_names(self, db: AsyncSession, lines: List[_Line]) -> Dict[str, str]:
+        """Names in the chunk already used by another item of this type: name -> slug."""
+        query = select(Item.name, Item.slug).where(
+            Item.item_type == self.kind.item_type, Item.name.in_([line.row.name for line in lines])
+        )
+        return dict((await db.execute(query)).all())
+
+    async def _write_chunk(self, db: AsyncSession, lines: List[_Line]) -> List[_Line]:
+        """Upsert one chunk; returns the lines that were written."""
+        taken = await self._taken_names(db, lines)
+        accepted = []
+        for line in lines:
+            owner = taken.get(line.row.name)
+            if owner is not None and owner != line.row.slug:
+                self._fail(line.number, line.row.slug, f"Name '{line.row.name}' is already used by '{owner}'")
+            else:
+                accepted.append(line)
+        if not accepted:
+            return []
+
+        items = Item.__table__
+        item_stmt = insert(items).values([
+            {"item_type": self.kind.item_type, "slug": line.row.slug, **{col: line.values[col] for col in ITEM_COLUMNS}}
+            for line in accepted
+        ])
+        item_stmt = item_stmt.on_conflict_do_update(
+            index_elements=[items.c.slug],
+            set_={
+                "name": item_stmt.excluded.name,
+                **{col: func.coalesce(getattr(item_stmt.excluded, col), items.c[col]) for col in ITEM_COLUMNS if col != "name"},
+                "updated_at": func.now(),
+            },
+            where=items.c.item_type == self.kind.item_type,
+        ).returning(items.c.id, items.c.slug, literal_column("xmax = 0").label("inserted"))
+        ids_by_slug: Dict[str, int] = {}
+        inserted = 0
+        for item_id, slug, was_inserted in (await db.execute(item_stmt)).all():
+            ids_by_slug[slug] = item_id
+            inserted += bool(was_inserted)
+
+        written = []
+        for line in accepted:
+            if line.row.slug in ids_by_slug:
+                written.append(line)
+            else:
+                self._fail(line.number, line.row.slug, f"Slug is used by an item that is not a {self.kind.item_type.value}")
+        if not written:
+            return []
+
+        table = self.kind.model.__table__
+        sub_stmt = insert(table).values([
+            {"id": ids_by_slug[line.row.slug], **{col: line.values[col] for col in self.kind.columns}} for line in written
+        ])
+        await db.execute(sub_stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={col: func.coalesce(getattr(sub_stmt.excluded, col), table.c[col]) for col in self.kind.columns},
+        ))
+
+        for field, (assoc, id_column, _) in self._associations().items():
+            owner_column = next(col.name for col in assoc.c if col.name != id_column)
+            replaced = [ids_by_slug[line.row.slug] for line in written if field in line.links]
+            if not replaced:
+                continue
+            await db.execute(delete(assoc).where(assoc.c[owner_column].in_(replaced)))
+            pairs = [
+                {owner_column: ids_by_slug[line.row.slug], id_column: linked_id}
+                for line in written if field in line.links for linked_id in line.links[field]
+            ]
+            if pairs:
+                # executemany: sent as batched multi-row INSERTs, whatever the number of pairs
+                await db.execute(insert(assoc).on_conflict_do_nothing(), pairs)
+
+        await invalidation_bus.publish(db, self.kind.item_type.value)
+        await db.commit()
+        self.report.inserted += inserted
+        self.report.updated += len(written) - inserted
+        return written
+
+    async def _flush(self, session_factory: Callable[[], AsyncSession], lines: List[_Line]) -> None:
+        if not lines:
+            return
+        async with session_factory() as db:
+            try:
+                await self._write_chunk(db, lines)
+            except SQLAlchemyError as e:
+                await db.rollback()
+                logger.warning(f"Import chunk at lines {lines[0].number}-{lines[-1].number} failed: {e}")
+                message = f"Chunk failed in the database: {getattr(e, 'orig', e)}"
+                for line in lines:
+                    self._fail(line.number, line.row.slug, message)
+
+    async def run(self, session_factory: Callable[[], AsyncSession], body: AsyncIterator[bytes]) -> schemas.ImportReport:
+        async with session_factory() as db:
+            refs = await _References.load(db)
+
+        pending: List[_Line] = []
+        async for number, raw in iter_lines(body):
+            self.report.received += 1
+            line = self._parse(number, raw, refs)
+            if line is not None:
+                pending.append(line)
+            if len(pending) >= self.chunk_size:
+                await self._flush(session_factory, pending)
+                pending = []
+        await self._flush(session_factory, pending)
+
+        if self.report.inserted or self.report.updated:
+            await self.kind.invalidate()
+        logger.info(
+            f"Imported {self.kind.item_type.value}s: {self.report.inserted} inserted, "
+            f"{self.report.updated} updated, {self.report.failed} failed."
+        )
+        return self.report
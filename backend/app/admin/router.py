@@ -1,20 +1,32 @@
 # app/admin/router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Literal, Optional
+from datetime import datetime, timedelta
 from decimal import Decimal
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, AsyncSessionFactory, replica_router
+from app.core.config import settings
+from app.core.fast_json import FastJSONResponse
+from app.core.profiling import request_profiler, to_speedscope
 from app.admin.dependencies import AdminUser
+from app.admin import exports, imports
+from app.admin import schemas as admin_schemas
 from app.models.user import User
 from app.schemas.common import Message, PaginationParams, PaginatedResponse
+from app.schemas.item import AssociationPatch
 
 # Import services and schemas from other modules
 from app.auth import schemas as auth_schemas
 from app.exchanges import schemas, service as exchange_service
+from app.exchanges.redirects import redirect_service
+from app.books import schemas as book_schemas
+from app.books.service import book_service
 from app.dependencies import get_current_admin_user
 from app.reviews import service as review_service
 from app.reviews import schemas as review_schemas
+from app.reviews import serializers as review_serializers
 from app.models import review as review_models
 from app.news import service as news_service
 from app.news import schemas as news_schemas
@@ -101,8 +113,135 @@ async def delete_exchange(
     await exchange_service.exchange_service.delete_exchange(db=db, exchange_id=db_exchange.id)
     return None
 
+@router.patch("/exchanges/{slug}/links/{relation}", response_model=schemas.ExchangeRead)
+async def update_exchange_links(
+    slug: str,
+    relation: Literal["countries", "languages", "fiat-currencies", "tags"],
+    links_in: AssociationPatch,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Add and/or remove available countries, languages, fiat currencies or tags of an exchange by id (admin only).
+    """
+    db_exchange = await exchange_service.exchange_service.get_exchange_by_slug(db, slug=slug)
+    if db_exchange is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exchange not found")
+    return await exchange_service.exchange_service.update_exchange_links(db, db_exchange, relation, links_in)
+
+
+@router.patch("/books/{slug}/tags", response_model=book_schemas.BookRead)
+async def update_book_tags(
+    slug: str,
+    links_in: AssociationPatch,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Add and/or remove tags of a book by id (admin only).
+    """
+    db_book = await book_service.get_book_by_slug(db, slug=slug)
+    if db_book is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    return await book_service.update_book_tags(db, db_book, links_in)
+
 # Add PUT/PATCH/DELETE for exchanges
 
+@router.get("/exchanges/clicks/stats", response_model=List[schemas.ExchangeClickStats])
+async def admin_exchange_click_stats(
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    (Admin) Outbound clicks per exchange over the last `days` days, most clicked first.
+    """
+    return await redirect_service.get_click_stats(db, since=datetime.utcnow() - timedelta(days=days), limit=limit)
+
+# --- Bulk exports ---
+async def _export_response(dataset: str, query_and_columns, fmt: exports.ExportFormat, gzip: bool) -> StreamingResponse:
+    """Stream an export from a replica when one is healthy (exports are bulk reads), else the primary."""
+    query, columns = query_and_columns
+    replica_engine = await replica_router.choose()
+    session_factory = AsyncSessionFactory if replica_engine is None else (lambda: AsyncSessionFactory(bind=replica_engine))
+    headers = {"Content-Disposition": f'attachment; filename="{exports.export_filename(dataset, fmt, gzip)}"'}
+    media_type = exports.MEDIA_TYPES[fmt]
+    if gzip:
+        media_type = "application/gzip"
+    return StreamingResponse(
+        exports.stream_export(session_factory, query, columns, fmt, compress=gzip),
+        media_type=media_type,
+        headers=headers,
+    )
+
+@router.get("/export/exchanges")
+async def admin_export_exchanges(
+    filters: schemas.ExchangeFilterParams = Depends(),
+    format: exports.ExportFormat = Query("ndjson"),
+    gzip: bool = Query(False),
+):
+    """
+    (Admin) Stream all exchanges matching the list filters as NDJSON or CSV.
+    """
+    return await _export_response("exchanges", exports.exchanges_query(filters), format, gzip)
+
+@router.get("/export/books")
+async def admin_export_books(
+    filters: book_schemas.BookFilterParams = Depends(),
+    format: exports.ExportFormat = Query("ndjson"),
+    gzip: bool = Query(False),
+):
+    """
+    (Admin) Stream all books matching the list filters as NDJSON or CSV.
+    """
+    return await _export_response("books", exports.books_query(filters), format, gzip)
+
+@router.get("/export/reviews")
+async def admin_export_reviews(
+    filters: review_schemas.ReviewFilterParams = Depends(),
+    format: exports.ExportFormat = Query("ndjson"),
+    gzip: bool = Query(False),
+):
+    """
+    (Admin) Stream all reviews (any moderation status unless filtered) as NDJSON or CSV.
+    """
+    return await _export_response("reviews", exports.reviews_query(filters), format, gzip)
+
+
+# --- Bulk import ---
+@router.post("/import", response_model=admin_schemas.ImportReport)
+async def admin_import(request: Request, kind: admin_schemas.ImportKind = Query(...)):
+    """
+    (Admin) Create or update exchanges or books from an NDJSON body (one object per line, keyed by slug).
+    Returns a per-line error report; valid lines are imported even when others fail.
+    """
+    return await imports.NdjsonImporter(kind).run(AsyncSessionFactory, request.stream())
+
+
+# --- Request profiles (PROFILER_ENABLED) ---
+@router.get("/profiles", response_model=List[admin_schemas.ProfileSummary])
+async def admin_list_profiles():
+    """
+    (Admin) Stored request profiles, newest first. Profile a request by sending it with an
+    admin token and `?__profile=1`; its id comes back in the X-Profile-Id header.
+    """
+    return request_profiler.store.list()
+
+
+@router.get("/profiles/{profile_id}")
+async def admin_download_profile(profile_id: str, format: Literal["speedscope", "collapsed"] = Query("speedscope")):
+    """
+    (Admin) Download a profile: speedscope JSON (open in https://www.speedscope.app) or
+    collapsed stacks (flamegraph.pl, inferno).
+    """
+    meta = request_profiler.store.get_meta(profile_id)
+    if meta is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    headers = {"Content-Disposition": f'attachment; filename="profile-{profile_id}.{"txt" if format == "collapsed" else "speedscope.json"}"'}
+    if format == "collapsed":
+        return PlainTextResponse(request_profiler.store.get_collapsed(profile_id) or "", headers=headers)
+    name = f"{meta['method']} {meta['path']} ({meta['wall_ms']} ms)"
+    return JSONResponse(to_speedscope(name, request_profiler.store.get_stacks(profile_id) or {}, meta["sample_ms"]), headers=headers)
+
+
 # --- Review Moderation ---
 # This route might be redundant if /admin/reviews/ is handled by the reviews router included below
 @router.get("/reviews/pending", response_model=PaginatedResponse[review_schemas.ReviewRead])
@@ -118,6 +257,8 @@ async def admin_list_pending_reviews(
     reviews, total = await review_service.review_service.list_reviews(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(review_serializers.review_page(reviews, total, pagination))
     return PaginatedResponse(total=total, items=reviews, skip=pagination.skip, limit=pagination.limit)
 
 
@@ -0,0 +1,36 @@
+# app/admin/schemas.py
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+
+ImportKind = Literal["exchange", "book"]
+
+class ImportLineError(BaseModel):
+    line: int # 1-based line number in the uploaded NDJSON
+    slug: Optional[str] = None
+    error: str
+
+class ImportReport(BaseModel):
+    kind: ImportKind
+    received: int = 0 # Non-empty lines
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ImportLineError] = []
+    errors_truncated: bool = False # More than IMPORT_MAX_REPORTED_ERRORS lines failed
+
+class ProfileSummary(BaseModel):
+    id: str
+    created_at: datetime
+    trigger: str # "admin" (?__profile=1) or "sampled"
+    method: str
+    path: str
+    route: Optional[str] = None
+    status_code: Optional[int] = None
+    wall_ms: float
+    db_queries: int
+    db_ms: float
+    samples: int
+    interval_ms: float # Requested sampling interval
+    sample_ms: float # Wall time each sample stands for
+    breakdown_ms: Dict[str, float] = {} # Sampled time per category (io_wait, db, orm, validation, auth, app, other)
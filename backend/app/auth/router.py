@@ -3,7 +3,9 @@ from fastapi import APIRouter, Depends, HTTPException, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
+from app.core.config import settings
 from app.core.database import get_async_db
+from app.core.rate_limit import rate_limit
 from app.auth import schemas as auth_schemas
 from app.schemas import token as token_schemas
 from app.schemas import common as common_schemas
@@ -17,7 +19,10 @@ router = APIRouter(
     tags=["Authentication & Profile"]
 )
 
-@router.post("/register", response_model=auth_schemas.UserRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register", response_model=auth_schemas.UserRead, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register", settings.RATE_LIMIT_REGISTER))],
+)
 async def register_user(
     user_in: auth_schemas.UserCreate,
     db: AsyncSession = Depends(get_async_db)
@@ -29,7 +34,10 @@ async def register_user(
     # Here you would typically trigger an email verification flow
     return db_user
 
-@router.post("/login", response_model=token_schemas.Token)
+@router.post(
+    "/login", response_model=token_schemas.Token,
+    dependencies=[Depends(rate_limit("login", settings.RATE_LIMIT_LOGIN))],
+)
 async def login_for_access_token(
     db: AsyncSession = Depends(get_async_db),
     form_data: auth_schemas.LoginRequest = Body(...) # Use Body for JSON payload
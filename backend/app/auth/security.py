@@ -1,12 +1,19 @@
 # app/auth/security.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = settings.ALGORITHM
@@ -54,9 +61,113 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool and its queue are full."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL, so `workers` hashes run in parallel while the loop keeps
+    serving other requests. At most `workers + queue_limit` jobs are accepted at once;
+    beyond that the call fails fast with PasswordHasherBusy instead of queueing forever.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+    async def _run(self, func, *args):
+        if self.pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def shutdown(self) -> None:
+        # Waits for running hashes in a thread, so the event loop keeps serving the rest of shutdown
+        await asyncio.to_thread(self._executor.shutdown, True, cancel_futures=True)
+        if self.rejected:
+            logger.warning(f"Password hashing rejected {self.rejected} requests while saturated.")
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+
 def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of access token -> user id for tokens whose signature and claims were already checked.
+    An entry is only served until the token's own `exp`, so caching never extends a token's life.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[int]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return entry[1]
+
+    def set(self, token: str, expires_at: float, user_id: int) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[token] = (expires_at, user_id)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+def get_access_token_user_id(token: str) -> Optional[int]:
+    """
+    User id of a valid access token, or None when the token is invalid, expired or not an access token.
+    Verified tokens are served from `verified_tokens` without re-checking the signature.
+    """
+    user_id = verified_tokens.get(token)
+    if user_id is not None:
+        return user_id
+    payload = decode_token(token) # Verifies the signature and rejects expired tokens
+    if payload is None or payload.get("type") != "access":
+        return None
+    try:
+        user_id = int(payload["sub"])
+        expires_at = float(payload["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    verified_tokens.set(token, expires_at, user_id)
+    return user_id
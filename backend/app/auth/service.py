@@ -6,9 +6,29 @@ from typing import Optional
 
 from app.models.user import User
 from app.auth import schemas, security
+from app.core.config import settings
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly.",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
 
 class AuthService:
 
+    async def _hash_password(self, password: str) -> str:
+        try:
+            return await security.password_hasher.hash(password)
+        except security.PasswordHasherBusy:
+            raise _hashing_busy()
+
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        try:
+            return await security.password_hasher.verify(plain_password, hashed_password)
+        except security.PasswordHasherBusy:
+            raise _hashing_busy()
+
     async def get_user_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         result = await db.execute(select(User).filter(User.email == email))
         return result.scalar_one_or_none()
@@ -37,7 +57,7 @@ class AuthService:
                 detail="Nickname already taken.",
             )
 
-        hashed_password = security.get_password_hash(user_in.password)
+        hashed_password = await self._hash_password(user_in.password)
         db_user = User(
             email=user_in.email,
             nickname=user_in.nickname,
@@ -55,7 +75,7 @@ class AuthService:
         user = await self.get_user_by_email(db, email=email)
         if not user:
             return None
-        if not security.verify_password(password, user.password_hash):
+        if not await self._verify_password(password, user.password_hash):
             return None
         # Add checks for active status or verified email if needed
         # if not user.is_active: return None
@@ -82,10 +102,10 @@ class AuthService:
         return db_user
 
     async def update_user_password(self, db: AsyncSession, db_user: User, password_in: schemas.UserPasswordUpdate) -> User:
-        if not security.verify_password(password_in.current_password, db_user.password_hash):
+        if not await self._verify_password(password_in.current_password, db_user.password_hash):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect current password")
 
-        hashed_password = security.get_password_hash(password_in.new_password)
+        hashed_password = await self._hash_password(password_in.new_password)
         db_user.password_hash = hashed_password
         await db.commit()
         # No need to refresh db_user here unless password_hash is needed immediately
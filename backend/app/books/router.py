@@ -1,14 +1,19 @@
 # app/books/router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import Optional, List
 
-from app.core.database import get_async_db
+from app.core import http_cache
+from app.core.database import get_async_db, get_read_db, replica_router
+from app.core.response_cache import CachedResponse, response_cache, item_tag, item_type_tag, tag_tag
 from app.books import schemas
 from app.books.service import book_service  # Updated import
 from app.schemas.common import PaginationParams, PaginatedResponse
 from app.schemas.tag import TagRead
+from app.common.reference_data import reference_data, reference_response
+from app.item.service import item_service
+from app.models.item import ItemTypeEnum
 
 router = APIRouter(
     prefix="/books",
@@ -18,19 +23,32 @@ router = APIRouter(
 @router.get("/details/{slug}", response_model=schemas.BookRead)
 async def get_book_details_by_slug(
     slug: str,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get detailed information about a specific book by its slug.
+    Supports If-None-Match / If-Modified-Since; a 304 is answered before any relationship is loaded.
     """
+    version = await item_service.get_item_version(db, slug=slug, item_type=ItemTypeEnum.book)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    etag = http_cache.weak_etag(tuple(version), await reference_data.versions(db, "tags"))
+    cache_control = http_cache.catalog_cache_control()
+    if http_cache.is_not_modified(request, etag, version.updated_at):
+        return http_cache.not_modified_response(etag, cache_control, version.updated_at)
+
     db_book = await book_service.get_book_by_slug(db, slug=slug)
     if db_book is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    http_cache.set_cache_headers(response, etag, cache_control, version.updated_at)
     return db_book
 
 @router.get("/", response_model=PaginatedResponse[schemas.BookReadBrief])
 async def list_books(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     # Filtering parameters
     name: Optional[str] = Query(None, description="Search by book title (partial match)"),
     tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
@@ -53,18 +71,44 @@ async def list_books(
         min_total_review_count=min_total_review_count,
     )
 
-    books, total = await book_service.list_books(
-        db=db, filters=filters, sort=sort_by, pagination=pagination
-    )
+    async def list_etag() -> str:
+        # A fingerprint of the filtered set (one aggregate query)
+        version = await book_service.get_list_version(db, filters)
+        return http_cache.weak_etag(
+            tuple(version), filters.model_dump(), sort_by.model_dump(), pagination.skip, pagination.limit,
+            await reference_data.versions(db, "tags"),
+        )
 
-    # Convert ORM objects to Pydantic models
-    books_out = [schemas.BookReadBrief.model_validate(book) for book in books]
+    # Answer a revalidation before the page is looked up or loaded
+    etag = await list_etag() if http_cache.is_conditional(request) else None
+    if etag is not None and http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, http_cache.catalog_cache_control())
 
-    return PaginatedResponse(
-        total=total,
-        items=books_out,
-        skip=pagination.skip,
-        limit=pagination.limit,
+    async def load_page() -> CachedResponse:
+        books, total = await book_service.list_books(
+            db=db, filters=filters, sort=sort_by, pagination=pagination
+        )
+        page = PaginatedResponse[schemas.BookReadBrief](
+            total=total,
+            items=[schemas.BookReadBrief.model_validate(book) for book in books],
+            skip=pagination.skip,
+            limit=pagination.limit,
+        )
+        tags = {item_type_tag(ItemTypeEnum.book)}
+        for book in page.items:
+            tags.add(item_tag(book.id))
+            tags.update(tag_tag(tag.id) for tag in book.tags)
+        if filters.tag_id is not None:
+            tags.add(tag_tag(filters.tag_id))
+        return CachedResponse(page.model_dump_json().encode(), etag or await list_etag(), tags)
+
+    key = response_cache.make_key(
+        "books:list", filters=filters.model_dump(exclude_none=True), sort=sort_by.model_dump(),
+        skip=pagination.skip, limit=pagination.limit,
+    )
+    cached = await response_cache.get_or_load(key, load_page, bypass=await replica_router.is_request_pinned(request))
+    return http_cache.conditional_response(
+        request, cached.body, cached.etag, http_cache.catalog_cache_control(), compressed=cached.compressed
     )
 
 # --- Optional CRUD Endpoints (Potentially Admin Only) ---
@@ -127,10 +171,11 @@ async def create_book(
 
 @router.get("/tags", response_model=list[TagRead])
 async def get_book_tags(
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all unique tags that are attached to books.
     """
-    tags = await book_service.get_book_tags(db)
-    return tags
+    tags = await reference_data.get(db, "book_tags")
+    return reference_response(request, tags.body, tags.etag, tags.compressed)
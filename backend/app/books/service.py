@@ -11,17 +11,24 @@ from app.models import item as item_models # For Item base query if needed
 from app.models.tag import Tag, item_tags_association # Import Tag and association table
 from app.books import schemas
 from app.schemas.common import PaginationParams
+from app.schemas.tag import TagRead
+from app.common.reference_data import reference_data
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import response_cache, item_tag, item_type_tag
+from app.schemas.item import AssociationPatch
+from app.utils.associations import Association
 import logging
 
 logger = logging.getLogger(__name__)
 
+BOOK_TAGS = Association(item_tags_association, "item_id", "tag_id", "tags")
+
 class BookService:
 
     async def get_book_by_slug(self, db: AsyncSession, slug: str) -> Optional[book_models.Book]:
         """Fetches a single book by its slug, including related tags."""
         query = select(book_models.Book).options(
             selectinload(book_models.Book.tags),
-            selectinload(book_models.Book.reviews)  # Eagerly load reviews if needed
         ).filter(book_models.Book.slug == slug)
         result = await db.execute(query)
         return result.scalar_one_or_none()
@@ -30,7 +37,6 @@ class BookService:
         """Fetches a single book by its ID, including related tags."""
         query = select(book_models.Book).options(
             selectinload(book_models.Book.tags),
-            selectinload(book_models.Book.reviews)
         ).filter(book_models.Book.id == book_id)
         result = await db.execute(query)
         return result.scalar_one_or_none()
@@ -41,22 +47,11 @@ class BookService:
         result = await db.execute(select(book_models.Book).filter(book_models.Book.name == name))
         return result.scalar_one_or_none()
 
-    async def list_books(
-        self,
-        db: AsyncSession,
-        filters: schemas.BookFilterParams,
-        sort: schemas.BookSortBy,
-        pagination: PaginationParams,
-    ) -> Tuple[List[book_models.Book], int]:
-        """Lists books with filtering, sorting, and pagination."""
-
-        # Base query with eager loading
-        query = select(book_models.Book).options(
-            selectinload(book_models.Book.tags),  # Eagerly load tags
-            selectinload(book_models.Book.reviews)  # Eagerly load reviews if needed
-        )
-
-        # --- Filtering ---
+    def _apply_filters(self, query, filters: schemas.BookFilterParams):
+        """
+        Apply the list filters to a query over books; shared by the page, count and version queries.
+        Returns the query and whether the tag join (which can duplicate rows) was added.
+        """
         filter_conditions = []
         if filters.name:
             filter_conditions.append(book_models.Book.name.ilike(f"%{filters.name}%"))
@@ -72,27 +67,38 @@ class BookService:
         # Filtering by M2M relationship (tags) - only if tag_id is provided
         tag_filter_applied = False
         if filters.tag_id is not None:
-            query = query.join(item_tags_association).filter(item_tags_association.c.tag_id == filters.tag_id)
+            query = query.join(item_tags_association, item_tags_association.c.item_id == book_models.Book.id)
+            filter_conditions.append(item_tags_association.c.tag_id == filters.tag_id)
             tag_filter_applied = True
 
         if filter_conditions:
             query = query.where(and_(*filter_conditions))
+        return query, tag_filter_applied
+
+    async def list_books(
+        self,
+        db: AsyncSession,
+        filters: schemas.BookFilterParams,
+        sort: schemas.BookSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[book_models.Book], int]:
+        """Lists books with filtering, sorting, and pagination."""
+
+        # Base query with eager loading
+        query = select(book_models.Book).options(
+            selectinload(book_models.Book.tags),  # Eagerly load tags
+        )
 
+        # --- Filtering ---
+        query, tag_filter_applied = self._apply_filters(query, filters)
         # Use distinct if joins were added (like for tag_id)
         if tag_filter_applied:
             query = query.distinct()
 
         # --- Count Total ---
-        count_query = select(func.count(book_models.Book.id))
-        if filter_conditions:
-            count_query = count_query.where(and_(*filter_conditions))
-        if tag_filter_applied:
-            count_query = count_query.join(item_tags_association).filter(item_tags_association.c.tag_id == filters.tag_id)
-            count_query = select(func.count(book_models.Book.id.distinct())).select_from(book_models.Book)
-            if filter_conditions:
-                count_query = count_query.where(and_(*filter_conditions))
-            count_query = count_query.join(item_tags_association).filter(item_tags_association.c.tag_id == filters.tag_id)
-
+        count_query, _ = self._apply_filters(
+            select(func.count(book_models.Book.id.distinct())).select_from(book_models.Book), filters
+        )
         total_result = await db.execute(count_query)
         total = total_result.scalar_one() or 0
 
@@ -112,6 +118,22 @@ class BookService:
 
         return books, total
 
+    async def get_list_version(self, db: AsyncSession, filters: schemas.BookFilterParams):
+        """
+        Fingerprint of the filtered book set: row count, newest updated_at and review-stat sums.
+        Used to answer conditional GETs on the list before loading the page.
+        """
+        matching_ids, _ = self._apply_filters(select(book_models.Book.id).select_from(book_models.Book), filters)
+        query = select(
+            func.count(book_models.Book.id),
+            func.max(book_models.Book.updated_at),
+            func.sum(book_models.Book.total_review_count),
+            func.sum(book_models.Book.total_rating_count),
+            func.sum(book_models.Book.overall_average_rating),
+        ).where(book_models.Book.id.in_(matching_ids))
+        result = await db.execute(query)
+        return result.one()
+
     # --- CRUD (Likely Admin Only) ---
     async def create_book(self, db: AsyncSession, book_in: schemas.BookCreate) -> book_models.Book:
         """Creates a new book."""
@@ -139,8 +161,11 @@ class BookService:
             db_book.tags.extend(tags.scalars().all())
 
         db.add(db_book)
+        await db.flush()
+        await invalidation_bus.publish(db, "book", db_book.id)
         await db.commit()
         await db.refresh(db_book, attribute_names=['tags']) # Refresh tags relationship
+        await self.invalidate_caches(db_book.id)
         logger.info(f"Book '{db_book.name}' created successfully with ID {db_book.id}")
         return await self.get_book_by_slug(db, db_book.slug)
 
@@ -165,20 +190,32 @@ class BookService:
         update_data = book_in.model_dump(exclude={"tags_ids"}, exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_book, key, value)
+        # Tag-only updates don't touch the items row; bump it so ETags change
+        db_book.updated_at = func.now()
 
         # Update M2M relationships for tags
         if book_in.tags_ids is not None:
             logger.info(f"Updating tags for book ID {db_book.id}")
-            db_book.tags = []
-            if book_in.tags_ids:
-                tags = await db.execute(select(Tag).filter(Tag.id.in_(book_in.tags_ids)))
-                db_book.tags.extend(tags.scalars().all())
+            await BOOK_TAGS.replace(db, db_book.id, book_in.tags_ids)
+            db.expire(db_book, [BOOK_TAGS.attribute])
 
+        await invalidation_bus.publish(db, "book", db_book.id)
         await db.commit()
-        await db.refresh(db_book, attribute_names=['tags']) # Refresh tags relationship
+        await self.invalidate_caches(db_book.id)
         logger.info(f"Book '{db_book.name}' (ID: {db_book.id}) updated successfully.")
         return await self.get_book_by_slug(db, db_book.slug)
 
+    async def update_book_tags(self, db: AsyncSession, db_book: book_models.Book, links_in: AssociationPatch) -> book_models.Book:
+        """Adds and/or removes tags of a book without replacing the whole list."""
+        await BOOK_TAGS.remove(db, db_book.id, links_in.remove)
+        await BOOK_TAGS.add(db, db_book.id, links_in.add)
+        db.expire(db_book, [BOOK_TAGS.attribute])
+        db_book.updated_at = func.now() # Bump it so ETags change
+        await invalidation_bus.publish(db, "book", db_book.id)
+        await db.commit()
+        await self.invalidate_caches(db_book.id)
+        return await self.get_book_by_slug(db, db_book.slug)
+
     async def delete_book(self, db: AsyncSession, book_id: int) -> bool:
         """Deletes a book by its ID."""
         logger.info(f"Attempting to delete book with ID: {book_id}")
@@ -186,26 +223,33 @@ class BookService:
         db_book = await db.get(book_models.Book, book_id)
         if db_book:
             await db.delete(db_book) # SQLAlchemy handles cascade delete to Item table
+            await invalidation_bus.publish(db, "book", book_id)
             await db.commit()
+            await self.invalidate_caches(book_id)
             logger.info(f"Book with ID: {book_id} deleted successfully.")
             return True
         logger.warning(f"Delete failed: Book with ID {book_id} not found.")
         return False
 
-    async def get_book_tags(self, db: AsyncSession) -> List[Tag]:
+    async def invalidate_caches(self, book_id: Optional[int]) -> None:
         """
-        Get all unique tags that are attached to books.
+        Drop cached data showing this book after it was created, updated or deleted
+        (without book_id: after a bulk write such as an admin import).
         """
-        query = (
-            select(Tag)
-            .join(item_tags_association)
-            .join(item_models.Item)
-            .where(item_models.Item.item_type == item_models.ItemTypeEnum.book)
-            .distinct()
-            .order_by(Tag.name)
-        )
-        result = await db.execute(query)
-        return result.scalars().all()
+        reference_data.invalidate("book_tags")
+        # Any field may move the book in or out of a filtered/sorted page
+        tags = [item_type_tag(item_models.ItemTypeEnum.book)]
+        if book_id is not None:
+            tags.append(item_tag(book_id))
+        await response_cache.invalidate(*tags)
+
+    async def get_book_tags(self, db: AsyncSession) -> List[TagRead]:
+        """
+        Get all unique tags that are attached to books (served from the reference-data store).
+        """
+        return (await reference_data.get(db, "book_tags")).items
 
 
 book_service = BookService()
+
+invalidation_bus.subscribe("book", lambda book_id, data: book_service.invalidate_caches(book_id))
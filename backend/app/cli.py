@@ -5,6 +5,7 @@ import asyncio
 from .core.database import init_db, init_countries, AsyncSessionFactory
 from ..scripts.init_fiat_currencies import seed_fiat_currencies
 from ..scripts.init_static_pages import generate_static_pages
+from ..scripts.seed_synthetic import seed_synthetic
 
 
 @click.group()
@@ -52,6 +53,23 @@ def init_pages():
     asyncio.run(run_generate())
     click.echo("Static pages generated successfully.")
 
+@cli.command("seed-synthetic")
+@click.option("--exchanges", default=5000, show_default=True)
+@click.option("--books", default=20000, show_default=True)
+@click.option("--users", default=200000, show_default=True)
+@click.option("--reviews", default=5000000, show_default=True)
+@click.option("--votes", default=20000000, show_default=True)
+@click.option("--tags", default=200, show_default=True)
+@click.option("--news", default=2000, show_default=True)
+@click.option("--seed", default=42, show_default=True, help="Same seed, same dataset.")
+def seed_synthetic_data(exchanges: int, books: int, users: int, reviews: int, votes: int, tags: int, news: int, seed: int):
+    """Bulk-load a synthetic, production-sized dataset (for load testing only) on top of the current data."""
+    click.echo("Seeding synthetic data...")
+    asyncio.run(seed_synthetic(
+        exchanges=exchanges, books=books, users=users, reviews=reviews, votes=votes, tags=tags, news=news, seed=seed,
+    ))
+    click.echo("Synthetic data seeded successfully.")
+
 @cli.command("drop-db")
 @click.option("--force", is_flag=True, help="Force drop the database without confirmation.")
 def drop_database(force: bool):
@@ -66,6 +84,27 @@ def drop_database(force: bool):
     click.echo("All tables dropped successfully.")
 
 
+@cli.command("export")
+@click.argument("dataset", type=click.Choice(["exchanges", "books", "reviews"]))
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]), default="ndjson", show_default=True)
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None, help="Output file (default: generated name).")
+def export_dataset(dataset: str, fmt: str, compress: bool, output: str):
+    """Dump a whole dataset (exchanges, books or reviews) to a file, streaming it in constant memory."""
+    from .admin import exports
+
+    path = output or exports.export_filename(dataset, fmt, compress)
+    query, columns = exports.DATASETS[dataset](None)
+
+    async def run_export():
+        with open(path, "wb") as f:
+            async for chunk in exports.stream_export(AsyncSessionFactory, query, columns, fmt, compress=compress):
+                f.write(chunk)
+
+    asyncio.run(run_export())
+    click.echo(f"Exported {dataset} to {path}.")
+
+
 def entrypoint():
     """Entry point for the CLI."""
     cli()
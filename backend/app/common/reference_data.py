@@ -0,0 +1,151 @@
+# app/common/reference_data.py
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core import compression, http_cache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models import common as common_models
+from app.models import item as item_models
+from app.models.tag import Tag, item_tags_association
+from app.schemas.common import CountryRead, FiatCurrencyRead, LanguageRead
+from app.schemas.tag import TagRead
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceList:
+    """
+    One immutable snapshot of a reference list.
+    Rows are kept as schema objects (by position and by id) and each row is
+    JSON-encoded once, so list and detail responses are plain byte copies.
+    """
+
+    def __init__(self, items: List[BaseModel]):
+        self.items = items
+        self.by_id: Dict[int, BaseModel] = {item.id: item for item in items}
+        self.encoded_items = [item.model_dump_json().encode() for item in items]
+        self.encoded_by_id: Dict[int, bytes] = {item.id: encoded for item, encoded in zip(items, self.encoded_items)}
+        self.body = b"[" + b",".join(self.encoded_items) + b"]"
+        self.compressed = compression.precompress(self.body) # Variants of the full list, built once per snapshot
+        self.version = hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        self.loaded_at = time.monotonic()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def page(self, skip: int, limit: int) -> bytes:
+        if skip == 0 and limit >= len(self.encoded_items):
+            return self.body
+        return b"[" + b",".join(self.encoded_items[skip:skip + limit]) + b"]"
+
+
+# --- Loaders (one query per list) ---
+async def _load_countries(db: AsyncSession) -> List[BaseModel]:
+    result = await db.execute(select(common_models.Country).order_by(common_models.Country.name))
+    return [CountryRead.model_validate(row) for row in result.scalars().all()]
+
+async def _load_fiat_currencies(db: AsyncSession) -> List[BaseModel]:
+    result = await db.execute(select(common_models.FiatCurrency).order_by(common_models.FiatCurrency.name))
+    return [FiatCurrencyRead.model_validate(row) for row in result.scalars().all()]
+
+async def _load_languages(db: AsyncSession) -> List[BaseModel]:
+    result = await db.execute(select(common_models.Language).order_by(common_models.Language.name))
+    return [LanguageRead.model_validate(row) for row in result.scalars().all()]
+
+async def _load_tags(db: AsyncSession) -> List[BaseModel]:
+    result = await db.execute(select(Tag).order_by(Tag.name))
+    return [TagRead.model_validate(row) for row in result.scalars().all()]
+
+def _item_type_tags_loader(item_type: item_models.ItemTypeEnum):
+    async def load(db: AsyncSession) -> List[BaseModel]:
+        query = (
+            select(Tag)
+            .join(item_tags_association)
+            .join(item_models.Item)
+            .where(item_models.Item.item_type == item_type)
+            .distinct()
+            .order_by(Tag.name)
+        )
+        result = await db.execute(query)
+        return [TagRead.model_validate(row) for row in result.scalars().all()]
+    return load
+
+
+class ReferenceDataStore:
+    """
+    In-process store for small, rarely changing lookup lists
+    (countries, fiat currencies, languages, tags).
+
+    Lists load lazily on first use (or all at once during warm-up), are dropped by
+    invalidate() after admin writes, and are reloaded after REFERENCE_DATA_TTL_SECONDS
+    as a safety net for writes made by other processes.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._loaders: Dict[str, Callable[[AsyncSession], Awaitable[List[BaseModel]]]] = {
+            "countries": _load_countries,
+            "fiat_currencies": _load_fiat_currencies,
+            "languages": _load_languages,
+            "tags": _load_tags,
+            "exchange_tags": _item_type_tags_loader(item_models.ItemTypeEnum.exchange),
+            "book_tags": _item_type_tags_loader(item_models.ItemTypeEnum.book),
+        }
+        self._lists: Dict[str, ReferenceList] = {}
+        self._locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in self._loaders}
+
+    def _is_fresh(self, ref_list: Optional[ReferenceList]) -> bool:
+        return ref_list is not None and time.monotonic() - ref_list.loaded_at < self.ttl_seconds
+
+    async def get(self, db: AsyncSession, name: str) -> ReferenceList:
+        ref_list = self._lists.get(name)
+        if self._is_fresh(ref_list):
+            return ref_list
+        async with self._locks[name]:
+            # Another request may have loaded it while we waited for the lock
+            ref_list = self._lists.get(name)
+            if self._is_fresh(ref_list):
+                return ref_list
+            ref_list = ReferenceList(await self._loaders[name](db))
+            self._lists[name] = ref_list
+            logger.debug(f"Loaded reference list '{name}' ({len(ref_list.items)} rows).")
+            return ref_list
+
+    async def load_all(self, db: AsyncSession) -> None:
+        for name in self._loaders:
+            await self.get(db, name)
+
+    async def versions(self, db: AsyncSession, *names: str) -> tuple:
+        """Content versions of the given lists, for ETags of responses that embed their rows."""
+        return tuple([(await self.get(db, name)).version for name in names])
+
+    def invalidate(self, *names: str) -> None:
+        """Drop the given lists (all when called without names); they reload on next access."""
+        for name in names or tuple(self._loaders):
+            self._lists.pop(name, None)
+
+
+reference_data = ReferenceDataStore(ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS)
+
+
+async def _drop_all_reference_data() -> None:
+    reference_data.invalidate()
+
+invalidation_bus.on_resync(_drop_all_reference_data)
+
+
+def reference_response(request: Request, body: bytes, etag: str, compressed: Optional[Dict[str, bytes]] = None) -> Response:
+    """Serve pre-encoded reference data with ETag/Cache-Control, answering 304 on a matching If-None-Match."""
+    return http_cache.conditional_response(
+        request, body, etag, f"public, max-age={settings.REFERENCE_DATA_CACHE_MAX_AGE}", compressed=compressed
+    )
@@ -1,11 +1,11 @@
 # app/common/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_async_db
+from app.core.database import get_read_db
 from app.schemas import common as common_schemas
-from app.common import service
+from app.common.reference_data import reference_data, reference_response
 
 router = APIRouter(
     tags=["Common Data"],
@@ -15,46 +15,52 @@ router = APIRouter(
 
 @router.get("/countries", response_model=List[common_schemas.CountryRead])
 async def list_countries(
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a list of all available countries.
     """
-    countries = await service.common_service.get_all_countries(db=db)
-    return countries
+    countries = await reference_data.get(db, "countries")
+    return reference_response(request, countries.body, countries.etag, countries.compressed)
 
 @router.get("/countries/{country_id}", response_model=common_schemas.CountryRead)
 async def get_country(
     country_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific country by its ID.
     """
-    country = await service.common_service.get_country_by_id(db=db, country_id=country_id)
-    if not country:
+    countries = await reference_data.get(db, "countries")
+    body = countries.encoded_by_id.get(country_id)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Country not found")
-    return country
+    return reference_response(request, body, f'"{countries.version}-{country_id}"')
 
 @router.get("/fiat_currencies", response_model=List[common_schemas.FiatCurrencyRead])
 async def list_fiat_currencies(
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a list of all available fiat currencies.
     """
-    currencies = await service.common_service.get_all_fiat_currencies(db=db)
-    return currencies
+    currencies = await reference_data.get(db, "fiat_currencies")
+    return reference_response(request, currencies.body, currencies.etag, currencies.compressed)
 
 @router.get("/fiat_currencies/{currency_id}", response_model=common_schemas.FiatCurrencyRead)
 async def get_fiat_currency(
     currency_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific fiat currency by its ID.
     """
-    currency = await service.common_service.get_fiat_currency_by_id(db=db, currency_id=currency_id)
-    if not currency:
+    currencies = await reference_data.get(db, "fiat_currencies")
+    body = currencies.encoded_by_id.get(currency_id)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fiat currency not found")
-    return currency
+    return reference_response(request, body, f'"{currencies.version}-{currency_id}"')
@@ -1,5 +1,6 @@
 # app/core/config.py
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from pathlib import Path
@@ -15,15 +16,126 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
 
+    # Connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # Seconds, -1 disables recycling
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # asyncpg statement caches and server-side limits
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100)) # asyncpg per-connection cache
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)) # SQLAlchemy adapter cache
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0)) # 0 = server default
+    DB_PGBOUNCER_MODE: bool = os.getenv("DB_PGBOUNCER_MODE", "false").lower() in ("1", "true", "yes") # Disables prepared statements
+
+    # Startup warm-up and graceful shutdown
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", os.getenv("DB_POOL_SIZE", 5)))
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", 10))
+
+    # Reference data (countries, fiat currencies, languages, tags)
+    REFERENCE_DATA_TTL_SECONDS: int = int(os.getenv("REFERENCE_DATA_TTL_SECONDS", 3600))
+    REFERENCE_DATA_CACHE_MAX_AGE: int = int(os.getenv("REFERENCE_DATA_CACHE_MAX_AGE", 300)) # Cache-Control max-age for clients/CDN
+
+    # Conditional GET on catalog endpoints (exchange/book/item details and lists)
+    CATALOG_CACHE_MAX_AGE: int = int(os.getenv("CATALOG_CACHE_MAX_AGE", 60))
+    CATALOG_STALE_WHILE_REVALIDATE: int = int(os.getenv("CATALOG_STALE_WHILE_REVALIDATE", 300))
+
+    # Response cache for list endpoints
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory") # "memory", "redis" or "none"
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048)) # memory backend only
+
+    # Response compression (gzip, and brotli when the optional `brotli` package is installed)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024)) # Smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+
+    # Cross-worker cache invalidation (Postgres LISTEN/NOTIFY)
+    INVALIDATION_BUS_ENABLED: bool = os.getenv("INVALIDATION_BUS_ENABLED", "true").lower() in ("1", "true", "yes")
+    INVALIDATION_LISTEN_URL: str = os.getenv("INVALIDATION_LISTEN_URL", "") # Direct (non-PgBouncer) URL; empty = DATABASE_URL
+    INVALIDATION_POLL_INTERVAL_SECONDS: float = float(os.getenv("INVALIDATION_POLL_INTERVAL_SECONDS", 5))
+    INVALIDATION_GAP_GRACE_SECONDS: float = float(os.getenv("INVALIDATION_GAP_GRACE_SECONDS", 10)) # How long a missing version may lag before resyncing
+
+    # Outbound click tracking for /exchanges/go/{slug}
+    REDIRECT_TARGETS_TTL_SECONDS: int = int(os.getenv("REDIRECT_TARGETS_TTL_SECONDS", 300)) # Backstop for the /exchanges/go targets
+    CLICK_BUFFER_SIZE: int = int(os.getenv("CLICK_BUFFER_SIZE", 10000)) # Ring buffer; oldest clicks are dropped when full
+    CLICK_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("CLICK_FLUSH_INTERVAL_SECONDS", 5))
+    CLICK_FLUSH_BATCH_SIZE: int = int(os.getenv("CLICK_FLUSH_BATCH_SIZE", 1000))
+
+    # CoinGecko exchange ingestion (scripts/update_data.py)
+    COINGECKO_BASE_URL: str = os.getenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
+    COINGECKO_API_KEY: str = os.getenv("COINGECKO_API_KEY", "") # Demo/Pro API key, sent as x-cg-api-key; empty = keyless public API
+    COINGECKO_CONCURRENCY: int = int(os.getenv("COINGECKO_CONCURRENCY", 3))
+    COINGECKO_MAX_RETRIES: int = int(os.getenv("COINGECKO_MAX_RETRIES", 5))
+    COINGECKO_UPSERT_CHUNK_SIZE: int = int(os.getenv("COINGECKO_UPSERT_CHUNK_SIZE", 500))
+
+    # Per-request SQL statement count/time as X-DB-Queries / X-DB-Time-Ms headers (benchmarks, debugging)
+    DB_QUERY_STATS_HEADERS: bool = os.getenv("DB_QUERY_STATS_HEADERS", "false").lower() in ("1", "true", "yes")
+
+    # Build hot list responses (reviews, exchanges) as dicts from the loaded rows and encode them with orjson,
+    # skipping pydantic validation of the ORM objects (app/core/fast_json.py)
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+    # Request profiler (admin token + ?__profile=1, or a sampled share of requests); no middleware when disabled
+    PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILER_SAMPLE_RATE: float = float(os.getenv("PROFILER_SAMPLE_RATE", 0.0)) # 0.001 = one request in a thousand
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", 1))
+    PROFILER_DIR: str = os.getenv("PROFILER_DIR", os.path.join(tempfile.gettempdir(), "crypta-profiles")) # Shared by all workers
+    PROFILER_MAX_PROFILES: int = int(os.getenv("PROFILER_MAX_PROFILES", 200))
+
+    # Admin NDJSON import (POST /admin/import)
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", 500)) # Lines validated and upserted per transaction
+    IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+    # Read replicas (comma-separated list of async URLs, empty = primary only)
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_SELECTION_STRATEGY: str = os.getenv("REPLICA_SELECTION_STRATEGY", "round_robin") # "round_robin" or "least_busy"
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", 5))
+    # Where read-your-writes pins live: "memory" (per worker) or "redis" (shared, needed with several workers)
+    REPLICA_PIN_BACKEND: str = os.getenv("REPLICA_PIN_BACKEND", "memory")
+    REPLICA_PIN_REDIS_URL: str = os.getenv("REPLICA_PIN_REDIS_URL", os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"))
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: int = int(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", 10))
+    REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS", 1.0))
+    REPLICA_UNHEALTHY_COOLDOWN_SECONDS: int = int(os.getenv("REPLICA_UNHEALTHY_COOLDOWN_SECONDS", 30))
+
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "default_secret_key_change_this") # CHANGE THIS IN PRODUCTION
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 4096)) # Verified access tokens kept per worker, 0 disables
+
+    # Password hashing (bcrypt runs in its own thread pool, off the event loop)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32)) # Waiting jobs beyond the busy workers
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", 1))
+
+    # Rate limits ("<limit>/<seconds>", keyed by route and user id or IP)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory") # "memory", "redis" or "none"
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000)) # memory backend only
+    RATE_LIMIT_LOGIN: str = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+    RATE_LIMIT_REGISTER: str = os.getenv("RATE_LIMIT_REGISTER", "5/3600")
+    RATE_LIMIT_REVIEW_CREATE: str = os.getenv("RATE_LIMIT_REVIEW_CREATE", "10/3600")
+
+    # Load shedding (503 before queueing for a database connection)
+    LOAD_SHED_ENABLED: bool = os.getenv("LOAD_SHED_ENABLED", "true").lower() in ("1", "true", "yes")
+    # Defaults to what the pool can serve at once; /auth routes are left out (bounded by the password hasher and rate limits)
+    LOAD_SHED_MAX_CONCURRENT_WRITES: int = int(os.getenv("LOAD_SHED_MAX_CONCURRENT_WRITES", DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    LOAD_SHED_WRITE_QUEUE_DEPTH: int = int(os.getenv("LOAD_SHED_WRITE_QUEUE_DEPTH", 10))
+    LOAD_SHED_MAX_QUEUE_DEPTH: int = int(os.getenv("LOAD_SHED_MAX_QUEUE_DEPTH", 100))
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = int(os.getenv("LOAD_SHED_RETRY_AFTER_SECONDS", 1))
 
     # API Prefixes (optional, good practice)
     API_V1_STR: str = "/api/v1"
 
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         case_sensitive = True
         env_file = '.env'
@@ -1,14 +1,45 @@
 # app/core/database.py
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy import text
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Any, Dict
+from uuid import uuid4
+import logging
 
 from .config import settings
+from .replicas import ReplicaRouter, create_pin_store
 from ..models.base import Base
 from ..models.common import Country
 
+logger = logging.getLogger(__name__)
+
+def engine_options() -> Dict[str, Any]:
+    """Build create_async_engine() keyword arguments from the pool/driver settings."""
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer in transaction mode can't keep named prepared statements between transactions
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    else:
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+        "echo": False, # Set echo=True for debugging SQL
+    }
+
 # Create async engine instance
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True, echo=False) # Set echo=True for debugging SQL
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 
 # Create sessionmaker
 AsyncSessionFactory = async_sessionmaker(
@@ -28,6 +59,68 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+# Read replicas (empty list when DATABASE_REPLICA_URLS is not set)
+replica_engines = [create_async_engine(url, **engine_options()) for url in settings.replica_urls]
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    strategy=settings.REPLICA_SELECTION_STRATEGY,
+    read_your_writes_seconds=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    health_check_interval_seconds=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    health_check_timeout_seconds=settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS,
+    unhealthy_cooldown_seconds=settings.REPLICA_UNHEALTHY_COOLDOWN_SECONDS,
+    pin_store=create_pin_store(settings.REPLICA_PIN_BACKEND, settings.REPLICA_PIN_REDIS_URL),
+)
+
+# Dependency to get a read-only DB session (replica when available, primary otherwise)
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    replica_engine = await replica_router.engine_for_request(request)
+    if replica_engine is None:
+        session = AsyncSessionFactory()
+    else:
+        session = AsyncSessionFactory(bind=replica_engine)
+    async with session:
+        try:
+            yield session
+        except DBAPIError as e:
+            # Stop routing to a replica whose connection broke mid-request
+            if replica_engine is not None and e.connection_invalidated:
+                replica_router.mark_unhealthy(replica_engine)
+            await session.rollback()
+            raise
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+# Startup self-check: log the effective pool/driver settings and what the server reports
+async def check_database_settings() -> None:
+    options = engine_options()
+    connect_args = options["connect_args"]
+    logger.info(
+        f"Database pool: size={options['pool_size']}, max_overflow={options['max_overflow']}, "
+        f"timeout={options['pool_timeout']}s, recycle={options['pool_recycle']}s, pre_ping={options['pool_pre_ping']}, "
+        f"replicas={len(replica_engines)}"
+    )
+    logger.info(
+        f"asyncpg: statement_cache_size={connect_args['statement_cache_size']}, "
+        f"prepared_statement_cache_size={connect_args['prepared_statement_cache_size']}, "
+        f"pgbouncer_mode={settings.DB_PGBOUNCER_MODE}"
+    )
+    if settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        logger.warning(
+            "DB_STATEMENT_TIMEOUT_MS is ignored in PgBouncer mode (startup parameters are not forwarded); "
+            "set statement_timeout on the database role instead."
+        )
+    try:
+        async with engine.connect() as conn:
+            server_version = (await conn.execute(text("SHOW server_version"))).scalar()
+            statement_timeout = (await conn.execute(text("SHOW statement_timeout"))).scalar()
+        logger.info(f"Database server {server_version}: statement_timeout={statement_timeout}")
+    except Exception as e:
+        logger.error(f"Database self-check failed: {e}")
+
 # Init database schema via Base.metadata.create_all
 async def init_db() -> None:
     try:
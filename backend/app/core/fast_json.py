@@ -0,0 +1,37 @@
+# app/core/fast_json.py
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.schemas.common import PaginationParams
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value) # Same as pydantic's JSON form of Decimal fields
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    orjson encoding matching pydantic's JSON output for the types our schemas use:
+    enums by value, naive datetimes without offset, aware UTC ones with "Z", Decimals as strings.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def page(total: int, items: List[Dict[str, Any]], pagination: PaginationParams) -> Dict[str, Any]:
+    """A PaginatedResponse as a plain dict."""
+    return {"total": total, "items": items, "skip": pagination.skip, "limit": pagination.limit}
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Renders with orjson. Returning it from a route skips the response_model pass, so the content
+    must already have the schema's shape (see the serializers modules, FAST_JSON_RESPONSES).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,105 @@
+# app/core/http_cache.py
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+from app.core import compression
+from app.core.config import settings
+
+
+def weak_etag(*parts: Any) -> str:
+    """Build a weak ETag from anything that identifies a representation's version."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """Format a DB timestamp (naive values are UTC) as an HTTP date."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def catalog_cache_control() -> str:
+    return (
+        f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={settings.CATALOG_STALE_WHILE_REVALIDATE}"
+    )
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison (RFC 9110 8.8.3.2): ignore the W/ prefix
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_conditional(request: Request) -> bool:
+    """True when the request revalidates a cached copy (If-None-Match or If-Modified-Since)."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    True when the client's cached copy is still current.
+    If-None-Match wins; If-Modified-Since is only consulted without it and when last_modified is given.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, cache_control: str, last_modified: Optional[datetime] = None) -> dict:
+    # JSON bodies are served compressed or not depending on Accept-Encoding: every variant, the
+    # identity one and 304s included, must say so or a shared cache hands one copy to everyone
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str, last_modified: Optional[datetime] = None) -> None:
+    response.headers.update(cache_headers(etag, cache_control, last_modified))
+
+
+def not_modified_response(etag: str, cache_control: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, cache_control, last_modified))
+
+
+def conditional_response(
+    request: Request, body: bytes, etag: str, cache_control: str, last_modified: Optional[datetime] = None,
+    compressed: Optional[Dict[str, bytes]] = None,
+) -> Response:
+    """
+    Serve a pre-encoded JSON body, or a 304 when the client's copy is current.
+    `compressed` holds precompressed variants of the body by content coding (compression.precompress),
+    served as-is when the client accepts one, so the compression middleware leaves them alone.
+    """
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, cache_control, last_modified)
+    headers = cache_headers(etag, cache_control, last_modified)
+    encoding = compression.negotiate(request.headers.get("accept-encoding")) if compressed else None
+    if encoding is None or encoding not in compressed:
+        return Response(content=body, media_type="application/json", headers=headers)
+    response = Response(content=compressed[encoding], media_type="application/json", headers=headers)
+    response.headers["Content-Encoding"] = encoding
+    compression.add_vary(response.headers)
+    compression.weaken_etag(response.headers)
+    return response
@@ -0,0 +1,198 @@
+# app/core/invalidation.py
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.invalidation import invalidation_version_seq
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "crypta_cache_invalidation"
+
+EventHandler = Callable[[Optional[int], Dict[str, Any]], Awaitable[None]]
+ResyncHandler = Callable[[], Awaitable[None]]
+
+_RESYNC = object() # Queue marker: drop everything instead of handling a single event
+MAX_MISSING_VERSIONS = 1000 # Beyond this many outstanding versions, resync right away
+
+
+class InvalidationBus:
+    """
+    Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    Writers call publish() inside the transaction of their write: it takes a version from
+    a sequence and queues a NOTIFY, so the event is delivered only if the write commits.
+    Every worker runs one listener connection and dispatches events to the handlers
+    subscribed for the entity type. The writing worker also invalidates its own caches
+    right after commit; receiving its own event again is harmless.
+
+    Versions arrive out of order and with gaps (concurrent commits, rolled-back writes), so
+    a version that is skipped over, or that the sequence has issued (polled for a lost tail),
+    is only treated as missed when it hasn't arrived within gap_grace_seconds. Then, and
+    after a reconnect, all resync handlers run.
+    """
+
+    def __init__(self, enabled: bool, listen_url: str, poll_interval_seconds: float, gap_grace_seconds: float):
+        self.enabled = enabled
+        self.listen_url = listen_url
+        self.poll_interval_seconds = poll_interval_seconds
+        self.gap_grace_seconds = gap_grace_seconds
+        self.last_version: Optional[int] = None # Highest version seen or issued
+        self._missing: Dict[int, float] = {} # Version -> monotonic deadline for it to arrive
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._resync_handlers: List[ResyncHandler] = []
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    # --- Registration ---
+    def subscribe(self, entity_type: str, handler: EventHandler) -> None:
+        self._handlers.setdefault(entity_type, []).append(handler)
+
+    def on_resync(self, handler: ResyncHandler) -> None:
+        self._resync_handlers.append(handler)
+
+    # --- Publishing ---
+    async def publish(self, db: AsyncSession, entity_type: str, entity_id: Optional[int] = None, **data: Any) -> None:
+        """Queue an invalidation event in the current transaction; call before commit."""
+        if not self.enabled:
+            return
+        version = (await db.execute(select(invalidation_version_seq.next_value()))).scalar_one()
+        payload = json.dumps({"v": version, "type": entity_type, "id": entity_id, "data": data}, default=str)
+        await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+    # --- Listening ---
+    async def start(self, engine: AsyncEngine) -> None:
+        if not self.enabled or self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._listen(engine), name="invalidation-listener"),
+            asyncio.create_task(self._dispatch(), name="invalidation-dispatcher"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def _dsn(self) -> str:
+        # asyncpg wants a plain postgresql:// URL
+        return make_url(self.listen_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+    @staticmethod
+    async def _current_version(conn: asyncpg.Connection) -> int:
+        # Last value issued by any session, committed or not
+        return await conn.fetchval(
+            f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {invalidation_version_seq.name}"
+        )
+
+    def _advance(self, version: int, seen: bool) -> None:
+        """Move last_version up to `version`, recording the versions skipped (and `version` itself unless seen) as outstanding."""
+        if self.last_version is None or version <= self.last_version:
+            return
+        if version - self.last_version > MAX_MISSING_VERSIONS:
+            logger.warning(f"Invalidation events {self.last_version + 1}..{version - 1} were missed, resyncing.")
+            self._missing.clear()
+            self._queue.put_nowait(_RESYNC)
+        else:
+            deadline = time.monotonic() + self.gap_grace_seconds
+            for missing in range(self.last_version + 1, version if seen else version + 1):
+                self._missing[missing] = deadline
+        self.last_version = version
+
+    def _check_missing(self) -> None:
+        now = time.monotonic()
+        expired = sorted(version for version, deadline in self._missing.items() if deadline <= now)
+        if expired:
+            logger.warning(f"Invalidation events {expired[0]}..{expired[-1]} never arrived, resyncing.")
+            self._missing.clear()
+            self._queue.put_nowait(_RESYNC)
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            version = int(event["v"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+            return
+        if self._missing.pop(version, None) is None:
+            self._advance(version, seen=True)
+        # Events from before the listener connected are dispatched too: handling one twice is harmless
+        self._queue.put_nowait(event)
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        connected_before = False
+        sequence_ready = False
+        while True:
+            conn = None
+            try:
+                if not sequence_ready:
+                    async with engine.begin() as setup_conn:
+                        await setup_conn.run_sync(invalidation_version_seq.create, checkfirst=True)
+                    sequence_ready = True
+                conn = await asyncpg.connect(self._dsn())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                self._missing.clear()
+                self.last_version = await self._current_version(conn)
+                if connected_before:
+                    # Anything published while we were disconnected is lost
+                    self._queue.put_nowait(_RESYNC)
+                connected_before = True
+                logger.info(f"Invalidation listener connected at version {self.last_version}.")
+
+                while True:
+                    await asyncio.sleep(self.poll_interval_seconds)
+                    # Versions issued since the last event: their notifications may still be on the
+                    # way (or never come, for rolled-back writes), so they get the same grace window
+                    current = await self._current_version(conn)
+                    self._advance(current, seen=False)
+                    self._check_missing()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Invalidation listener failed: {e}; reconnecting in {self.poll_interval_seconds}s.")
+                await asyncio.sleep(self.poll_interval_seconds)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+    async def _dispatch(self) -> None:
+        while True:
+            event = await self._queue.get()
+            if event is _RESYNC:
+                await self.resync()
+                continue
+            for handler in self._handlers.get(event.get("type"), []):
+                try:
+                    await handler(event.get("id"), event.get("data") or {})
+                except Exception as e:
+                    logger.error(f"Invalidation handler for {event.get('type')} failed: {e}", exc_info=True)
+
+    async def resync(self) -> None:
+        """Drop every local cache (they reload lazily from the database)."""
+        for handler in self._resync_handlers:
+            try:
+                await handler()
+            except Exception as e:
+                logger.error(f"Invalidation resync handler failed: {e}", exc_info=True)
+        logger.info("Local caches resynced.")
+
+
+invalidation_bus = InvalidationBus(
+    enabled=settings.INVALIDATION_BUS_ENABLED,
+    listen_url=settings.INVALIDATION_LISTEN_URL or settings.DATABASE_URL,
+    poll_interval_seconds=settings.INVALIDATION_POLL_INTERVAL_SECONDS,
+    gap_grace_seconds=settings.INVALIDATION_GAP_GRACE_SECONDS,
+)
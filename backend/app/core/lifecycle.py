@@ -0,0 +1,106 @@
+# app/core/lifecycle.py
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+WarmupHook = Callable[[AsyncSession], Awaitable[None]]
+ShutdownHook = Callable[[], Awaitable[None]]
+
+
+class AppLifecycle:
+    """
+    Startup warm-up, readiness and graceful shutdown for the API process.
+
+    Modules register warm-up hooks (preload caches, touch hot queries) and shutdown
+    hooks (flush buffered writes). The app is reported ready only once warm-up finished,
+    and on shutdown it stops reporting ready, waits for in-flight requests to drain,
+    runs the shutdown hooks and only then lets the engines be disposed.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.started_at = time.monotonic()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._warmup_hooks: List[Tuple[str, WarmupHook]] = []
+        self._shutdown_hooks: List[Tuple[str, ShutdownHook]] = []
+
+    # --- Registration ---
+    def on_warmup(self, name: str, hook: WarmupHook) -> None:
+        self._warmup_hooks.append((name, hook))
+
+    def on_shutdown(self, name: str, hook: ShutdownHook) -> None:
+        self._shutdown_hooks.append((name, hook))
+
+    # --- Request tracking ---
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self.in_flight = 0
+            self._idle.set()
+
+    # --- Startup ---
+    async def warm_pool(self, engine: AsyncEngine, connections: int) -> None:
+        """Open `connections` pool connections at once so the first requests don't pay for the handshake."""
+        if connections <= 0:
+            return
+        opened = await asyncio.gather(*(engine.connect() for _ in range(connections)), return_exceptions=True)
+        conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+        try:
+            for conn in conns:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            for conn in conns:
+                await conn.close() # Returns the connection to the pool
+        failed = len(opened) - len(conns)
+        if failed:
+            logger.warning(f"Pool warm-up for {engine.url.host}: {failed} of {connections} connections failed.")
+        logger.info(f"Pool warm-up for {engine.url.host}: {len(conns)} connections opened.")
+
+    async def run_warmup(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """Run every warm-up hook in its own session; failures are logged, never fatal."""
+        started = time.monotonic()
+        for name, hook in self._warmup_hooks:
+            hook_started = time.monotonic()
+            try:
+                async with session_factory() as session:
+                    await hook(session)
+                logger.info(f"Warm-up '{name}' done in {(time.monotonic() - hook_started) * 1000:.0f} ms.")
+            except Exception as e:
+                logger.error(f"Warm-up '{name}' failed: {e}", exc_info=True)
+        self.ready = True
+        logger.info(f"Warm-up finished in {(time.monotonic() - started) * 1000:.0f} ms, reporting ready.")
+
+    # --- Shutdown ---
+    async def drain(self, timeout: float) -> None:
+        """Stop reporting ready, wait for in-flight requests, then run the shutdown hooks."""
+        self.ready = False
+        self.draining = True
+        if self.in_flight:
+            logger.info(f"Draining {self.in_flight} in-flight requests (timeout {timeout}s)...")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Drain timed out with {self.in_flight} requests still in flight.")
+
+        for name, hook in self._shutdown_hooks:
+            try:
+                await hook()
+                logger.info(f"Shutdown hook '{name}' done.")
+            except Exception as e:
+                logger.error(f"Shutdown hook '{name}' failed: {e}", exc_info=True)
+
+
+app_lifecycle = AppLifecycle()
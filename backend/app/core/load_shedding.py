@@ -0,0 +1,82 @@
+# app/core/load_shedding.py
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.replicas import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+
+class LoadShedder:
+    """
+    Rejects requests early, before they queue for a database connection.
+
+    - Writes (and other unsafe methods) are capped at `max_concurrent_writes` in flight (the pool
+      size plus overflow by default), so review posts and admin edits can't take every pool
+      connection from catalog reads. Routes under `uncapped_prefixes` (auth: login, registration)
+      are left out of the cap: they spend most of their time in the password hasher, which
+      has its own queue limit, and are rate limited.
+    - When the primary pool is exhausted, the number of in-flight requests beyond the checked-out
+      connections approximates the pool wait queue. Writes are shed once it exceeds
+      `write_queue_depth` and everything else once it exceeds `max_queue_depth`.
+    """
+
+    def __init__(
+        self, enabled: bool, pool_capacity: int, max_concurrent_writes: int, write_queue_depth: int, max_queue_depth: int,
+        uncapped_prefixes: Tuple[str, ...] = (),
+    ):
+        self.enabled = enabled
+        self.pool_capacity = pool_capacity
+        self.max_concurrent_writes = max_concurrent_writes
+        self.uncapped_prefixes = uncapped_prefixes
+        self.write_queue_depth = write_queue_depth
+        self.max_queue_depth = max_queue_depth
+        self.writes_in_flight = 0
+        self.shed = 0
+
+    def pool_wait_depth(self, engine: AsyncEngine, in_flight: int) -> int:
+        try:
+            checked_out = engine.sync_engine.pool.checkedout()
+        except AttributeError:
+            return 0 # Not a QueuePool (e.g. NullPool in scripts)
+        if checked_out < self.pool_capacity:
+            return 0
+        return max(0, in_flight - checked_out)
+
+    def is_capped_write(self, method: str, path: str) -> bool:
+        return method not in SAFE_METHODS and not path.startswith(self.uncapped_prefixes)
+
+    def rejection(self, method: str, path: str, engine: AsyncEngine, in_flight: int) -> Optional[JSONResponse]:
+        """A 503 response when the request should be shed, else None."""
+        if not self.enabled:
+            return None
+        is_write = method not in SAFE_METHODS
+        if self.is_capped_write(method, path) and self.writes_in_flight >= self.max_concurrent_writes:
+            return self._reject("Too many concurrent write requests")
+        depth = self.pool_wait_depth(engine, in_flight)
+        if depth > self.max_queue_depth or (is_write and depth > self.write_queue_depth):
+            return self._reject(f"Database pool queue too deep ({depth})")
+        return None
+
+    def _reject(self, reason: str) -> JSONResponse:
+        self.shed += 1
+        logger.warning(f"Shedding request: {reason}.")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server is busy, please retry shortly."},
+            headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)},
+        )
+
+
+load_shedder = LoadShedder(
+    enabled=settings.LOAD_SHED_ENABLED,
+    pool_capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    max_concurrent_writes=settings.LOAD_SHED_MAX_CONCURRENT_WRITES,
+    write_queue_depth=settings.LOAD_SHED_WRITE_QUEUE_DEPTH,
+    max_queue_depth=settings.LOAD_SHED_MAX_QUEUE_DEPTH,
+    uncapped_prefixes=(f"{settings.API_V1_STR}/auth/",),
+)
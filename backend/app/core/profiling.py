@@ -0,0 +1,270 @@
+# app/core/profiling.py
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from starlette.requests import Request
+
+from app.auth.security import get_access_token_user_id
+from app.core import query_stats
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = "__profile"
+
+# Time categories of a sample, by the innermost frame that matches (checked leaf first)
+CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("db", ("asyncpg",)),
+    ("orm", ("sqlalchemy",)),
+    ("validation", ("pydantic", "fastapi/encoders.py", "fastapi/_compat.py")),
+    ("auth", ("app/auth/", "app/dependencies.py", "jose", "passlib", "bcrypt")),
+    ("app", ("/app/",)),
+)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _category(stack: List[Any]) -> str:
+    """`stack` is innermost first. An idle event loop (waiting in select) counts as I/O wait."""
+    if stack and stack[0].f_code.co_filename.endswith("selectors.py"):
+        return "io_wait"
+    for frame in stack:
+        filename = frame.f_code.co_filename.replace(os.sep, "/")
+        for category, markers in CATEGORIES:
+            if any(marker in filename for marker in markers):
+                return category
+    return "other"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread (the event loop's) from a background thread every `interval` seconds.
+
+    Everything the loop runs meanwhile is sampled, so with concurrent requests other tasks'
+    stacks show up too; profile an endpoint off-peak, or on a dedicated worker, for a clean picture.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter() # Collapsed stack (root first, ";"-joined) -> samples
+        self.categories: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            if not stack:
+                continue
+            self.categories[_category(stack)] += 1
+            self.stacks[";".join(_frame_name(f) for f in reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def to_speedscope(name: str, stacks: Dict[str, int], interval_ms: float) -> Dict[str, Any]:
+    """Collapsed stacks -> speedscope's "sampled" file format."""
+    frames: List[Dict[str, str]] = []
+    index: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        ids = []
+        for frame in stack.split(";"):
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame})
+            ids.append(index[frame])
+        samples.append(ids)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": sum(weights), "samples": samples, "weights": weights,
+        }],
+        "name": name,
+        "exporter": "crypta-info request profiler",
+    }
+
+
+class ProfileStore:
+    """Profiles as <id>.json (metadata) + <id>.collapsed (stacks) in a directory shared by all workers; the oldest are pruned."""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, meta: Dict[str, Any], stacks: Dict[str, int]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = meta["id"]
+        (self.directory / f"{profile_id}.collapsed").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+        )
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(meta))
+        self._prune()
+
+    def _prune(self) -> None:
+        metas = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in metas[:max(0, len(metas) - self.max_profiles)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        metas = []
+        for path in self.directory.glob("*.json"):
+            try:
+                metas.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue # Being written or pruned by another worker
+        return sorted(metas, key=lambda meta: meta["created_at"], reverse=True)
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        try:
+            uuid.UUID(profile_id) # Ids are uuid4 hex; anything else could escape the directory
+        except ValueError:
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+    def get_meta(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, ".json")
+        return json.loads(path.read_text()) if path else None
+
+    def get_collapsed(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, ".collapsed")
+        return path.read_text() if path else None
+
+    def get_stacks(self, profile_id: str) -> Optional[Dict[str, int]]:
+        collapsed = self.get_collapsed(profile_id)
+        if collapsed is None:
+            return None
+        stacks = {}
+        for line in collapsed.splitlines():
+            stack, _, count = line.rpartition(" ")
+            stacks[stack] = int(count)
+        return stacks
+
+
+class RequestProfiler:
+    """
+    Opt-in profiling of single requests: `?__profile=1` with an admin token, or a random
+    `sample_rate` share of all requests. One request per worker is profiled at a time.
+    The middleware is only installed when PROFILER_ENABLED is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, store: ProfileStore, sample_rate: float, interval_ms: float):
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self._busy = threading.Lock()
+
+    async def _requested_by_admin(self, request: Request) -> bool:
+        if request.query_params.get(PROFILE_PARAM) not in ("1", "true"):
+            return False
+        authorization = request.headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        user_id = get_access_token_user_id(token)
+        if user_id is None:
+            return False
+        from app.auth.service import auth_service
+        from app.core.database import AsyncSessionFactory
+        async with AsyncSessionFactory() as db:
+            user = await auth_service.get_user_by_id(db=db, user_id=user_id)
+        return bool(user is not None and user.is_admin)
+
+    async def should_profile(self, request: Request) -> Optional[str]:
+        """The trigger ("admin" or "sampled"), or None."""
+        if await self._requested_by_admin(request):
+            return "admin"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    @contextmanager
+    def profile(self, request: Request, trigger: str) -> Iterator[Dict[str, Any]]:
+        """Profile the block; the yielded dict takes the response status as meta["status_code"]."""
+        if not self._busy.acquire(blocking=False):
+            yield {} # Another request is being profiled in this worker
+            return
+        meta: Dict[str, Any] = {}
+        sampler = SamplingProfiler(threading.get_ident(), self.interval_ms / 1000)
+        outer_stats = query_stats.current()
+        before = (outer_stats.count, outer_stats.seconds) if outer_stats is not None else (0, 0.0)
+        started = time.perf_counter()
+        try:
+            with query_stats.track() if outer_stats is None else nullcontext(outer_stats) as stats:
+                sampler.start()
+                try:
+                    yield meta
+                finally:
+                    # Failed requests are stored too (without a status code): they are often the interesting ones
+                    sampler.stop()
+                    self._store(request, trigger, meta, sampler, stats, before, time.perf_counter() - started)
+        finally:
+            self._busy.release()
+
+    def _store(self, request: Request, trigger: str, meta: Dict[str, Any], sampler: SamplingProfiler,
+               stats: query_stats.QueryStats, before: Tuple[int, float], wall_seconds: float) -> None:
+        route = request.scope.get("route")
+        samples = sum(sampler.stacks.values())
+        # Wall time per sample. The sampler needs the GIL, so during CPU-bound stretches it gets
+        # it every sys.getswitchinterval() (5 ms) rather than every interval_ms
+        sample_ms = wall_seconds * 1000 / samples if samples else self.interval_ms
+        meta.update({
+            "id": uuid.uuid4().hex,
+            "created_at": datetime.utcnow().isoformat(),
+            "trigger": trigger,
+            "method": request.method,
+            "path": request.url.path,
+            "route": getattr(route, "path", None),
+            "wall_ms": round(wall_seconds * 1000, 2),
+            "db_queries": stats.count - before[0],
+            "db_ms": round((stats.seconds - before[1]) * 1000, 2),
+            "samples": samples,
+            "interval_ms": self.interval_ms,
+            "sample_ms": round(sample_ms, 3),
+            # Time per category, from sample shares; "io_wait" is the loop waiting (DB round trips, network)
+            "breakdown_ms": {
+                category: round(count * sample_ms, 2) for category, count in sampler.categories.most_common()
+            },
+        })
+        try:
+            self.store.save(meta, dict(sampler.stacks))
+        except OSError as e:
+            logger.warning(f"Could not store request profile: {e}")
+
+
+request_profiler = RequestProfiler(
+    ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_PROFILES),
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    interval_ms=settings.PROFILER_INTERVAL_MS,
+)
@@ -0,0 +1,70 @@
+# app/core/query_stats.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    statements: Optional[List[str]] = None # Only collected when asked for (budget checks)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_installed = set()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started_at")
+    if started:
+        stats.seconds += time.perf_counter() - started.pop()
+    stats.count += 1
+    if stats.statements is not None:
+        stats.statements.append(statement)
+
+
+def install(engines: Iterable[AsyncEngine]) -> None:
+    """
+    Count SQL statements per task context on these engines.
+
+    The listeners are cheap no-ops outside a track() block. SQLAlchemy runs the sync engine
+    in a greenlet that shares the awaiting task's context, so statements land in the
+    QueryStats of the request (or test) that issued them.
+    """
+    for engine in engines:
+        sync_engine = engine.sync_engine
+        if id(sync_engine) in _installed:
+            continue
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        _installed.add(id(sync_engine))
+
+
+def current() -> Optional[QueryStats]:
+    """The QueryStats of the enclosing track() block, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track(collect_statements: bool = False) -> Iterator[QueryStats]:
+    """Statements executed inside the block (including child tasks started in it) are counted in the yielded QueryStats."""
+    stats = QueryStats(statements=[] if collect_statements else None)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
@@ -0,0 +1,162 @@
+# app/core/rate_limit.py
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitRule:
+    """`limit` requests per `window_seconds` for one route, parsed from "<limit>/<seconds>" (e.g. "10/60")."""
+
+    def __init__(self, name: str, limit: int, window_seconds: int):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @classmethod
+    def parse(cls, name: str, rate: str) -> "RateLimitRule":
+        try:
+            limit, window = rate.split("/")
+            return cls(name, int(limit), int(window))
+        except ValueError as e:
+            raise ValueError(f"Invalid rate '{rate}' for '{name}', expected '<limit>/<seconds>'.") from e
+
+
+def _sliding_count(previous: int, current: int, elapsed: float, window: int) -> float:
+    """Sliding-window estimate: the previous window counts for the part of it still inside the window."""
+    return previous * (1 - elapsed / window) + current
+
+
+# --- Backends ---
+class RateLimitBackend:
+    """Counter storage; hit() records one request and returns (allowed, retry_after_seconds)."""
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process sliding-window counters, bounded to `max_keys` (least recently seen keys are dropped)."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict() # key -> (window index, previous, current)
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        stored_index, previous, current = self._windows.get(key, (index, 0, 0))
+        if stored_index != index:
+            previous = current if stored_index == index - 1 else 0
+            current = 0
+        elapsed = now - index * window
+        if _sliding_count(previous, current, elapsed, window) >= limit:
+            self._windows[key] = (index, previous, current)
+            self._windows.move_to_end(key)
+            return False, max(1, math.ceil(window - elapsed))
+        self._windows[key] = (index, previous, current + 1)
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+        return True, 0
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Shared counters for all workers on any Redis-protocol server: one INCR'd key per window.
+    Needs the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "crypta:rl:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+        self._redis = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        current_key = f"{self.prefix}{key}:{index}"
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, window * 2)
+        pipe.get(f"{self.prefix}{key}:{index - 1}")
+        current, _, previous = await pipe.execute()
+        elapsed = now - index * window
+        # current already includes this request
+        if _sliding_count(int(previous or 0), current - 1, elapsed, window) >= limit:
+            return False, max(1, math.ceil(window - elapsed))
+        return True, 0
+
+
+def create_backend(name: str) -> Optional[RateLimitBackend]:
+    if name == "memory":
+        return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if name == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown rate limit backend '{name}'.")
+
+
+# --- Limiter ---
+def client_identity(request: Request) -> str:
+    """Authenticated clients are limited per user id, anonymous ones per IP."""
+    # Imported here: app.auth.security pulls in the auth settings, the core modules stay import-light
+    from app.auth.security import get_access_token_user_id
+
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user_id = get_access_token_user_id(token)
+        if user_id is not None:
+            return f"user:{user_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimiter:
+    """
+    Per-route rate limits keyed by route and client (user id or IP).
+    Backend errors are logged and the request is let through: limiting must not take the API down.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend]):
+        self.backend = backend
+
+    async def check(self, request: Request, rule: RateLimitRule) -> None:
+        if self.backend is None or rule.limit <= 0:
+            return
+        key = f"{rule.name}:{client_identity(request)}"
+        try:
+            allowed, retry_after = await self.backend.hit(key, rule.limit, rule.window_seconds)
+        except Exception as e:
+            logger.warning(f"Rate limit check failed for {key}: {e}")
+            return
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+
+rate_limiter = RateLimiter(create_backend(settings.RATE_LIMIT_BACKEND))
+
+
+def rate_limit(name: str, rate: str) -> Callable:
+    """Route dependency: `dependencies=[Depends(rate_limit("login", settings.RATE_LIMIT_LOGIN))]`."""
+    rule = RateLimitRule.parse(name, rate)
+
+    async def check_rate_limit(request: Request) -> None:
+        await rate_limiter.check(request, rule)
+
+    return check_rate_limit
@@ -0,0 +1,193 @@
+# app/core/replicas.py
+import asyncio
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.rate_limit import client_identity
+
+logger = logging.getLogger(__name__)
+
+# Methods that never modify data and therefore never start a read-your-writes window
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+# --- Read-your-writes pins ---
+class PinStore:
+    """Where read-your-writes pins live; a pin expires by itself after its window."""
+
+    async def pin(self, client_key: str, seconds: int) -> None:
+        raise NotImplementedError
+
+    async def is_pinned(self, client_key: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryPinStore(PinStore):
+    """Per-process pins: read-your-writes only holds on the worker that handled the write."""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._pins: Dict[str, float] = {}
+
+    async def pin(self, client_key: str, seconds: int) -> None:
+        now = time.monotonic()
+        if len(self._pins) > self.max_keys:
+            # Drop expired pins so the map stays bounded under heavy write traffic
+            self._pins = {key: until for key, until in self._pins.items() if until > now}
+        self._pins[client_key] = now + seconds
+
+    async def is_pinned(self, client_key: str) -> bool:
+        until = self._pins.get(client_key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._pins.pop(client_key, None)
+            return False
+        return True
+
+
+class RedisPinStore(PinStore):
+    """
+    Pins shared by every worker on any Redis-protocol server: one key per client with a TTL.
+    Needs the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "crypta:pin:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("REPLICA_PIN_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+        self._redis = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def pin(self, client_key: str, seconds: int) -> None:
+        await self._redis.set(self.prefix + client_key, b"1", ex=seconds)
+
+    async def is_pinned(self, client_key: str) -> bool:
+        return bool(await self._redis.exists(self.prefix + client_key))
+
+
+def create_pin_store(name: str, redis_url: str) -> PinStore:
+    if name == "memory":
+        return MemoryPinStore()
+    if name == "redis":
+        return RedisPinStore(redis_url)
+    raise ValueError(f"Unknown replica pin backend '{name}'.")
+
+
+class _ReplicaState:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.last_checked_at: float = 0.0
+        self.unhealthy_until: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """
+    Chooses which engine serves read-only sessions.
+
+    - Replicas are picked round-robin or by the lowest number of checked-out connections.
+    - A client that just wrote is pinned to the primary for `read_your_writes_seconds`;
+      clients are keyed by user id (anonymous ones by IP), so no cookie is needed, and with
+      a shared pin store the pin holds on every worker.
+    - Replicas failing a health probe are skipped for `unhealthy_cooldown_seconds`;
+      when no replica is usable, reads fall back to the primary (returned as None).
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        strategy: str = "round_robin",
+        read_your_writes_seconds: int = 5,
+        health_check_interval_seconds: int = 10,
+        health_check_timeout_seconds: float = 1.0,
+        unhealthy_cooldown_seconds: int = 30,
+        pin_store: Optional[PinStore] = None,
+    ):
+        if strategy not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unknown replica selection strategy '{strategy}'.")
+        self.replicas = [_ReplicaState(engine) for engine in engines]
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.health_check_timeout_seconds = health_check_timeout_seconds
+        self.unhealthy_cooldown_seconds = unhealthy_cooldown_seconds
+        self._round_robin = itertools.count()
+        self.pin_store = pin_store or MemoryPinStore()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    # --- Read-your-writes ---
+    async def mark_write(self, request: Request) -> None:
+        """Pin the client that sent this (successful) write to the primary."""
+        client_key = client_identity(request)
+        try:
+            await self.pin_store.pin(client_key, self.read_your_writes_seconds)
+        except Exception as e:
+            logger.warning(f"Could not pin {client_key} to the primary: {e}")
+
+    async def is_request_pinned(self, request: Request) -> bool:
+        if not self.enabled:
+            return False # Everything is read from the primary anyway
+        client_key = client_identity(request)
+        try:
+            return await self.pin_store.is_pinned(client_key)
+        except Exception as e:
+            # Unknown: the primary is always current
+            logger.warning(f"Could not check the primary pin of {client_key}: {e}")
+            return True
+
+    # --- Health ---
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        for replica in self.replicas:
+            if replica.engine is engine:
+                replica.unhealthy_until = time.monotonic() + self.unhealthy_cooldown_seconds
+                logger.warning(f"Replica {replica.name} marked unhealthy for {self.unhealthy_cooldown_seconds}s.")
+
+    async def _is_healthy(self, replica: _ReplicaState) -> bool:
+        now = time.monotonic()
+        if replica.unhealthy_until > now:
+            return False
+        if now - replica.last_checked_at < self.health_check_interval_seconds:
+            return True
+
+        replica.last_checked_at = now
+        try:
+            async with replica.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=self.health_check_timeout_seconds)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for replica {replica.name}: {e}")
+            self.mark_unhealthy(replica.engine)
+            return False
+
+    # --- Selection ---
+    def _candidates(self) -> List[_ReplicaState]:
+        if self.strategy == "least_busy":
+            return sorted(self.replicas, key=lambda replica: replica.engine.pool.checkedout())
+        start = next(self._round_robin) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    async def choose(self) -> Optional[AsyncEngine]:
+        """Return a healthy replica engine, or None to use the primary."""
+        for replica in self._candidates():
+            if await self._is_healthy(replica):
+                return replica.engine
+        return None
+
+    async def engine_for_request(self, request: Request) -> Optional[AsyncEngine]:
+        if not self.enabled or await self.is_request_pinned(request):
+            return None
+        return await self.choose()
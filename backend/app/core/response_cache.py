@@ -0,0 +1,334 @@
+# app/core/response_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from app.core import compression
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+
+# --- Invalidation tags ---
+def item_tag(item_id: int) -> str:
+    return f"item:{item_id}"
+
+def item_type_tag(item_type: Any) -> str:
+    return f"item_type:{getattr(item_type, 'value', item_type)}"
+
+def tag_tag(tag_id: int) -> str:
+    return f"tag:{tag_id}"
+
+def reviews_tag(item_id: Optional[int] = None) -> str:
+    """Approved-review lists of one item, or (without item_id) the unfiltered lists."""
+    return f"reviews:item:{item_id}" if item_id is not None else "reviews:all"
+
+
+class CachedResponse:
+    """A pre-encoded JSON response body plus its ETag, and its compressed variants once stored."""
+
+    def __init__(self, body: bytes, etag: str, tags: Iterable[str] = (), compressed: Optional[Dict[str, bytes]] = None):
+        self.body = body
+        self.etag = etag
+        self.tags = set(tags)
+        self.compressed = compressed or {} # Content coding -> body, see compression.precompress
+
+    def encode(self) -> bytes:
+        # etag \n {coding: length} \n body, then the variants in the same order
+        lengths = {"identity": len(self.body), **{encoding: len(data) for encoding, data in self.compressed.items()}}
+        return b"\n".join((self.etag.encode(), json.dumps(lengths).encode(), self.body + b"".join(self.compressed.values())))
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        etag, _, rest = raw.partition(b"\n")
+        header, _, payload = rest.partition(b"\n")
+        parts, offset = {}, 0
+        for encoding, length in json.loads(header).items():
+            parts[encoding] = payload[offset:offset + length]
+            offset += length
+        body = parts.pop("identity")
+        return cls(body=body, etag=etag.decode(), compressed=parts)
+
+
+# --- Backends ---
+class CacheBackend:
+    """Storage interface for the response cache; values are opaque bytes."""
+
+    shared = False # True when every worker sees the same entries
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying one of the tags; returns how many were dropped (if known)."""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU with TTL and a tag -> keys index. Also the backend to use in tests."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Set[str]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        self._drop(key)
+        tags = set(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        keys = set()
+        for tag in tags:
+            keys |= self._keys_by_tag.get(tag, set())
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for any Redis-protocol server (Redis, Valkey, KeyDB, ...).
+    Entries are plain keys with a TTL; each tag is a set of the keys carrying it.
+    Needs the optional `redis` package.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "crypta:rc:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+        self._redis = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(self.prefix + key, value, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            pipe.expire(self._tag_key(tag), ttl) # Tag sets live as long as their newest entry
+        await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = await self._redis.smembers(tag_key)
+            if keys:
+                dropped += await self._redis.delete(*keys)
+            await self._redis.delete(tag_key)
+        return dropped
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=f"{self.prefix}*"):
+            await self._redis.delete(key)
+
+
+class NullCacheBackend(CacheBackend):
+    """Disables caching (RESPONSE_CACHE_BACKEND=none)."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        return None
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        return 0
+
+    async def clear(self) -> None:
+        return None
+
+
+def create_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return MemoryCacheBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    if name == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown response cache backend '{name}'.")
+
+
+# --- Cache ---
+class ResponseCache:
+    """
+    Response cache for list endpoints.
+
+    - Keys are built from the endpoint namespace and its normalized filter/sort/pagination params.
+    - Entries carry invalidation tags (item id, item type, tag id, review lists);
+      writers call invalidate() with the tags they affect.
+    - Concurrent misses on one key share a single load (no thundering herd).
+    - A load racing an invalidation is not stored: each invalidated tag is stamped with a
+      generation, and a page whose tags were stamped after its load started is only returned
+      to the requests already waiting on it.
+    - Requests pinned to the primary after a write (read-your-writes) pass bypass=True and
+      neither read nor fill the cache: an entry may have been filled from a lagging replica.
+    - Backend errors are logged and treated as misses, the database stays the source of truth.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._loads_running = 0 # Including loads detached from _in_flight
+        self._generation = 0 # Bumped by every invalidation
+        self._tag_generations: Dict[str, int] = {} # Tag -> generation it was last invalidated at, while loads are in flight
+        self._cleared_generation = 0 # Generation of the last clear_local(), which invalidates every tag
+
+    @staticmethod
+    def make_key(namespace: str, **params: Any) -> str:
+        normalized = {name: value for name, value in params.items() if value is not None}
+        encoded = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+        return f"{namespace}:{hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()}"
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache get failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return CachedResponse.decode(raw)
+        except (ValueError, KeyError, AttributeError): # Entry written in an older format (entries only live for the TTL)
+            return None
+
+    async def _set(self, key: str, cached: CachedResponse) -> None:
+        try:
+            await self.backend.set(key, cached.encode(), self.ttl_seconds, cached.tags)
+        except Exception as e:
+            logger.warning(f"Response cache set failed for {key}: {e}")
+
+    def _invalidated_since(self, tags: Iterable[str], generation: int) -> bool:
+        if self._cleared_generation > generation:
+            return True
+        return any(self._tag_generations.get(tag, 0) > generation for tag in tags)
+
+    def _bump_generation(self, tags: Iterable[str]) -> None:
+        self._generation += 1
+        if not self._loads_running:
+            return # Only loads already running compare against the stamps
+        for tag in tags:
+            self._tag_generations[tag] = self._generation
+        # A page's tags are only known once it is loaded, so every running load may be stale:
+        # detach them so later requests start a fresh load instead of waiting on an old one
+        self._in_flight.clear()
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[CachedResponse]], bypass: bool = False,
+    ) -> CachedResponse:
+        if bypass:
+            return await loader()
+        cached = await self._get(key)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            await asyncio.wait({in_flight})
+            if not in_flight.cancelled(): # The leading request was cancelled: load ourselves
+                return in_flight.result()
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        started = self._generation
+        self._loads_running += 1
+        try:
+            cached = await loader()
+            if self._invalidated_since(cached.tags, started):
+                # Read before a write that has since committed: fine for the requests already
+                # waiting, but storing it would serve the old page until the TTL
+                future.set_result(cached)
+                return cached
+            # Compressed once here rather than by the middleware on every hit
+            cached.compressed = compression.precompress(cached.body)
+            await self._set(key, cached)
+            if self._invalidated_since(cached.tags, started): # Invalidated while a shared backend stored it
+                await self.invalidate(*cached.tags)
+            future.set_result(cached)
+            return cached
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception() # Mark retrieved so an unawaited failure isn't logged as "never retrieved"
+            raise
+        finally:
+            if self._in_flight.get(key) is future: # Not detached (and replaced) by an invalidation
+                del self._in_flight[key]
+            self._loads_running -= 1
+            if not self._loads_running:
+                self._tag_generations.clear()
+
+    async def clear_local(self) -> None:
+        """Drop this worker's entries after missed invalidation events; a shared backend is left alone."""
+        self._bump_generation(())
+        self._cleared_generation = self._generation
+        if not self.backend.shared:
+            await self.backend.clear()
+
+    async def invalidate(self, *tags: str) -> None:
+        self._bump_generation(tags)
+        try:
+            dropped = await self.backend.invalidate_tags(tags)
+            logger.debug(f"Response cache: dropped {dropped} entries for tags {tags}.")
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed for tags {tags}: {e}")
+
+
+response_cache = ResponseCache(
+    backend=create_backend(settings.RESPONSE_CACHE_BACKEND),
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+invalidation_bus.on_resync(response_cache.clear_local)
@@ -1,18 +1,17 @@
 # app/dependencies.py
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError
 
 # import User model
 from app.models.user import User
 
 from app.core.database import get_async_db
 from app.core.config import settings
-from app.auth.security import decode_token
+from app.auth.security import get_access_token_user_id
 from app.auth.service import auth_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -33,29 +32,12 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    try:
-        payload = decode_token(token)
-        if payload is None:
-            raise credentials_exception
-            
-        # Validate that this is an access token
-        if payload.get("type") != "access":
-            raise credentials_exception
-            
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-            
-        # Validate token hasn't expired
-        token_exp = payload.get("exp")
-        if token_exp is None or datetime.fromtimestamp(token_exp, tz=timezone.utc) < datetime.now(timezone.utc):
-            raise credentials_exception
-            
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
+
+    # Signature, token type and expiry are checked once (or served from the verified-token cache)
+    user_id = get_access_token_user_id(token)
+    if user_id is None:
         raise credentials_exception
-        
+
     user = await auth_service.get_user_by_id(db=db, user_id=user_id)
     if user is None:
         raise credentials_exception
@@ -68,27 +50,9 @@ async def get_optional_current_active_user(
     if not token:
         return None  # No token provided
 
-    try:
-        payload = decode_token(token)
-        if payload is None:
-            return None # Invalid token structure
-
-        # Validate that this is an access token
-        if payload.get("type") != "access":
-            return None # Not an access token
-
-        user_id_str: Optional[str] = payload.get("sub")
-        if user_id_str is None:
-            return None # No user ID in token
-
-        # Validate token hasn't expired
-        token_exp: Optional[int] = payload.get("exp")
-        if token_exp is None or datetime.fromtimestamp(token_exp, tz=timezone.utc) < datetime.now(timezone.utc):
-            return None # Token expired
-
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
-        return None # Token decoding or parsing error
+    user_id = get_access_token_user_id(token)
+    if user_id is None:
+        return None # Invalid, expired or not an access token
 
     user = await auth_service.get_user_by_id(db=db, user_id=user_id)
     if user is None:
@@ -0,0 +1,135 @@
+# app/exchanges/history.py
+import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.exchanges import schemas
+from app.models import exchange as exchange_models
+
+AVG_PRECISION = Decimal("0.00001")
+
+# API metric -> snapshot column
+METRIC_COLUMNS: Dict[schemas.HistoryMetric, str] = {
+    schemas.HistoryMetric.volume: "trading_volume_24h",
+    schemas.HistoryMetric.spot_maker_fee: "spot_maker_fee",
+    schemas.HistoryMetric.spot_taker_fee: "spot_taker_fee",
+    schemas.HistoryMetric.futures_maker_fee: "futures_maker_fee",
+    schemas.HistoryMetric.futures_taker_fee: "futures_taker_fee",
+}
+
+def _hour(ts: datetime.datetime) -> datetime.datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+def _day(ts: datetime.datetime) -> datetime.datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _week(ts: datetime.datetime) -> datetime.datetime:
+    return _day(ts) - datetime.timedelta(days=ts.weekday()) # Weeks start on Monday
+
+BUCKETS: Dict[schemas.HistoryResolution, Callable[[datetime.datetime], datetime.datetime]] = {
+    schemas.HistoryResolution.hour: _hour,
+    schemas.HistoryResolution.day: _day,
+    schemas.HistoryResolution.week: _week,
+}
+
+
+class ExchangeHistoryService:
+    """
+    Volume and fee history of exchanges.
+
+    Ingestion appends one ExchangeSnapshot per exchange and run and, in the same transaction,
+    folds the values into hourly/daily/weekly ExchangeMetricRollup rows. Reads only touch
+    the rollups, one row per bucket, so a chart never scans raw snapshots.
+    """
+
+    async def record_snapshots(
+        self, db: AsyncSession, points: List[Dict[str, Any]], ts: datetime.datetime, btc_price_usd: Optional[Decimal]
+    ) -> None:
+        """`points`: dicts with exchange_id and the snapshot columns (missing/None values are skipped in rollups)."""
+        if not points:
+            return
+        snapshot_columns = list(METRIC_COLUMNS.values())
+        await db.execute(insert(exchange_models.ExchangeSnapshot), [
+            {"exchange_id": point["exchange_id"], "ts": ts, "btc_price_usd": btc_price_usd,
+             **{col: point.get(col) for col in snapshot_columns}}
+            for point in points
+        ])
+
+        # (exchange_id, metric, resolution, bucket) -> [samples, sum, min, max, last]
+        rollups: Dict[Tuple[int, str, str, datetime.datetime], List[Any]] = {}
+        for point in points:
+            for metric, column in METRIC_COLUMNS.items():
+                value = point.get(column)
+                if value is None:
+                    continue
+                value = Decimal(value)
+                for resolution, bucket_of in BUCKETS.items():
+                    key = (point["exchange_id"], metric.value, resolution.value, bucket_of(ts))
+                    agg = rollups.get(key)
+                    if agg is None:
+                        rollups[key] = [1, value, value, value, value]
+                        continue
+                    agg[0] += 1
+                    agg[1] += value
+                    agg[2] = min(agg[2], value)
+                    agg[3] = max(agg[3], value)
+                    agg[4] = value
+        if not rollups:
+            return
+
+        table = exchange_models.ExchangeMetricRollup.__table__
+        stmt = pg_insert(table).values([
+            {"exchange_id": exchange_id, "metric": metric, "resolution": resolution, "bucket": bucket,
+             "samples": samples, "value_sum": total, "value_min": low, "value_max": high, "value_last": last}
+            for (exchange_id, metric, resolution, bucket), (samples, total, low, high, last) in rollups.items()
+        ])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.exchange_id, table.c.metric, table.c.resolution, table.c.bucket],
+            set_={
+                "samples": table.c.samples + stmt.excluded.samples,
+                "value_sum": table.c.value_sum + stmt.excluded.value_sum,
+                "value_min": func.least(table.c.value_min, stmt.excluded.value_min),
+                "value_max": func.greatest(table.c.value_max, stmt.excluded.value_max),
+                "value_last": stmt.excluded.value_last,
+            },
+        ))
+
+    async def get_exchange_id(self, db: AsyncSession, slug: str) -> Optional[int]:
+        result = await db.execute(select(exchange_models.Exchange.id).where(exchange_models.Exchange.slug == slug))
+        return result.scalar_one_or_none()
+
+    async def get_history(
+        self,
+        db: AsyncSession,
+        exchange_id: int,
+        metric: schemas.HistoryMetric,
+        resolution: schemas.HistoryResolution,
+        since: datetime.datetime,
+    ) -> List[schemas.ExchangeHistoryPoint]:
+        rollup = exchange_models.ExchangeMetricRollup
+        query = (
+            select(rollup)
+            .where(
+                rollup.exchange_id == exchange_id,
+                rollup.metric == metric.value,
+                rollup.resolution == resolution.value,
+                rollup.bucket >= BUCKETS[resolution](since),
+            )
+            .order_by(rollup.bucket)
+        )
+        result = await db.execute(query)
+        return [
+            schemas.ExchangeHistoryPoint(
+                ts=row.bucket, avg=(row.value_sum / row.samples).quantize(AVG_PRECISION), min=row.value_min,
+                max=row.value_max, last=row.value_last, samples=row.samples,
+            )
+            for row in result.scalars().all()
+        ]
+
+
+exchange_history_service = ExchangeHistoryService()
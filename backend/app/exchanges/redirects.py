@@ -0,0 +1,177 @@
+# app/exchanges/redirects.py
+import asyncio
+import datetime
+import hashlib
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, insert, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionFactory
+from app.core.invalidation import invalidation_bus
+from app.exchanges import schemas
+from app.models import exchange as exchange_models
+
+logger = logging.getLogger(__name__)
+
+
+class RedirectTarget(NamedTuple):
+    website_url: Optional[str]
+    referral_link: Optional[str]
+
+
+class RedirectService:
+    """
+    Serves /exchanges/go/{slug} without touching the exchange tables on the hot path.
+
+    - slug -> (website_url, referral_link) lives in memory; it is loaded with one query
+      on first use and dropped by invalidate() whenever an exchange is written. It is loaded
+      from the primary, as a replica lagging behind that write would be kept until the next
+      one, and reloaded after ttl_seconds as a safety net for writes made by other processes.
+    - Clicks go into a bounded ring buffer and are written to `exchange_clicks`
+      in batches by a background task (and once more on shutdown).
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession], ttl_seconds: int,
+        buffer_size: int, flush_interval_seconds: float, flush_batch_size: int,
+    ):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        self.dropped_clicks = 0
+        self._targets: Optional[Dict[str, RedirectTarget]] = None
+        self._loaded_at = 0.0
+        self._generation = 0 # Bumped by invalidate() so a load racing with a write is not kept
+        self._lock = asyncio.Lock()
+        self._clicks: Deque[Tuple[str, datetime.datetime, Optional[str]]] = deque(maxlen=buffer_size)
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # --- Targets ---
+    async def _load_targets(self) -> Dict[str, RedirectTarget]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(
+                    exchange_models.Exchange.slug,
+                    exchange_models.Exchange.website_url,
+                    exchange_models.Exchange.referral_link,
+                )
+            )
+            return {row.slug: RedirectTarget(row.website_url, row.referral_link) for row in result}
+
+    def _fresh_targets(self) -> Optional[Dict[str, RedirectTarget]]:
+        if self._targets is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return self._targets
+        return None
+
+    async def get_target(self, slug: str) -> Optional[RedirectTarget]:
+        targets = self._fresh_targets()
+        if targets is None:
+            async with self._lock:
+                targets = self._fresh_targets()
+                if targets is None:
+                    generation = self._generation
+                    loaded_at = time.monotonic()
+                    targets = await self._load_targets()
+                    if generation == self._generation:
+                        self._targets, self._loaded_at = targets, loaded_at
+                    logger.info(f"Loaded {len(targets)} exchange redirect targets.")
+        return targets.get(slug)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._targets = None
+
+    # --- Click tracking ---
+    def record_click(self, slug: str, referrer: Optional[str]) -> None:
+        if len(self._clicks) == self._clicks.maxlen:
+            self.dropped_clicks += 1 # deque drops the oldest entry on append
+        referrer_hash = hashlib.blake2b(referrer.encode(), digest_size=16).hexdigest() if referrer else None
+        self._clicks.append((slug, datetime.datetime.utcnow(), referrer_hash))
+
+    async def flush(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """Write buffered clicks in batches; returns how many were written."""
+        written = 0
+        while self._clicks:
+            batch: List[dict] = []
+            while self._clicks and len(batch) < self.flush_batch_size:
+                slug, clicked_at, referrer_hash = self._clicks.popleft()
+                batch.append({"slug": slug, "clicked_at": clicked_at, "referrer_hash": referrer_hash})
+            try:
+                async with session_factory() as session:
+                    await session.execute(insert(exchange_models.ExchangeClick), batch)
+                    await session.commit()
+            except Exception as e:
+                # Put the batch back (oldest first) so the next flush retries it
+                self._clicks.extendleft(
+                    (click["slug"], click["clicked_at"], click["referrer_hash"]) for click in reversed(batch)
+                )
+                logger.error(f"Failed to flush {len(batch)} exchange clicks: {e}")
+                break
+            written += len(batch)
+        if self.dropped_clicks:
+            logger.warning(f"Click buffer overflowed, {self.dropped_clicks} clicks were dropped.")
+            self.dropped_clicks = 0
+        return written
+
+    async def _flush_periodically(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush(session_factory)
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically(session_factory), name="click-flusher")
+
+    async def stop(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """Stop the background task and write whatever is still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        written = await self.flush(session_factory)
+        logger.info(f"Flushed {written} exchange clicks on shutdown.")
+
+    # --- Stats ---
+    async def get_click_stats(self, db: AsyncSession, since: datetime.datetime, limit: int = 100) -> List[schemas.ExchangeClickStats]:
+        """Clicks per slug since the given time (buffered clicks appear after the next flush)."""
+        click = exchange_models.ExchangeClick
+        clicks = func.count(click.id).label("clicks")
+        query = (
+            select(
+                click.slug,
+                clicks,
+                func.count(func.distinct(click.referrer_hash)).label("unique_referrers"),
+                func.max(click.clicked_at).label("last_click_at"),
+            )
+            .where(click.clicked_at >= since)
+            .group_by(click.slug)
+            .order_by(desc(clicks))
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [schemas.ExchangeClickStats.model_validate(dict(row._mapping)) for row in result]
+
+
+redirect_service = RedirectService(
+    session_factory=AsyncSessionFactory,
+    ttl_seconds=settings.REDIRECT_TARGETS_TTL_SECONDS,
+    buffer_size=settings.CLICK_BUFFER_SIZE,
+    flush_interval_seconds=settings.CLICK_FLUSH_INTERVAL_SECONDS,
+    flush_batch_size=settings.CLICK_FLUSH_BATCH_SIZE,
+)
+
+
+async def _drop_redirect_targets() -> None:
+    redirect_service.invalidate()
+
+invalidation_bus.on_resync(_drop_redirect_targets)
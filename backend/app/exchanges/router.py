@@ -1,16 +1,25 @@
 # app/exchanges/router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from decimal import Decimal
+from datetime import datetime, timedelta
 
-from app.core.database import get_async_db
-from app.exchanges import schemas, service
+from app.core import fast_json, http_cache
+from app.core.config import settings
+from app.core.database import get_read_db, replica_router
+from app.core.response_cache import CachedResponse, response_cache, item_tag, item_type_tag, tag_tag
+from app.exchanges import schemas, serializers, service
+from app.exchanges.redirects import redirect_service
+from app.exchanges.history import exchange_history_service
 from app.schemas.common import PaginationParams, PaginatedResponse
 from app.schemas.tag import TagRead
 from app.news import schemas as news_schemas, service as news_service
 from app.guides import schemas as guide_schemas, service as guide_service
+from app.common.reference_data import reference_data, reference_response
+from app.item.service import item_service
+from app.models.item import ItemTypeEnum
 
 router = APIRouter(
     prefix="/exchanges",
@@ -20,27 +29,31 @@ router = APIRouter(
 @router.get("/go/{slug}", status_code=status.HTTP_302_FOUND, tags=["Redirects"], include_in_schema=False)
 async def redirect_to_exchange_website(
     slug: str,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
 ):
     """
     Redirects the user to the official website of the exchange
     identified by the slug. This endpoint is typically used for tracking
     or masking the direct URL.
+    Targets come from an in-memory slug map and the click is buffered, so no query runs on a hit.
     """
-    db_exchange = await service.exchange_service.get_exchange_by_slug(db, slug=slug)
+    target = await redirect_service.get_target(slug)
 
-    if not db_exchange:
+    if target is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exchange not found")
 
-    if not db_exchange.website_url:
+    redirect_service.record_click(slug, request.headers.get("referer"))
+
+    if not target.website_url:
         fallback_url = f"/exchange/overview.html?slug={slug}"
         return RedirectResponse(url=fallback_url, status_code=status.HTTP_302_FOUND)
 
-    return RedirectResponse(url=db_exchange.website_url)
+    return RedirectResponse(url=target.website_url)
 
 @router.get("/", response_model=PaginatedResponse[schemas.ExchangeReadBrief])
 async def list_exchanges(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     # Filtering parameters as query params
     name: Optional[str] = Query(None, description="Search by exchange name (partial match)"),
     tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
@@ -77,35 +90,104 @@ async def list_exchanges(
         max_total_rating_count=max_total_rating_count,
     )
 
-    exchanges, total = await service.exchange_service.list_exchanges(
-        db=db, filters=filters, sort=sort_by, pagination=pagination
-    )
+    async def list_etag() -> str:
+        # A fingerprint of the filtered set (one aggregate query)
+        version = await service.exchange_service.get_list_version(db, filters)
+        return http_cache.weak_etag(
+            tuple(version), filters.model_dump(), sort_by.model_dump(), pagination.skip, pagination.limit,
+            await reference_data.versions(db, "tags", "countries"),
+        )
 
-    return PaginatedResponse(
-        total=total,
-        items=exchanges,
-        skip=pagination.skip,
-        limit=pagination.limit,
+    # Answer a revalidation before the page is looked up or loaded
+    etag = await list_etag() if http_cache.is_conditional(request) else None
+    if etag is not None and http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, http_cache.catalog_cache_control())
+
+    async def load_page() -> CachedResponse:
+        exchanges, total = await service.exchange_service.list_exchanges(
+            db=db, filters=filters, sort=sort_by, pagination=pagination
+        )
+        if settings.FAST_JSON_RESPONSES:
+            body = fast_json.dumps(serializers.exchange_brief_page(exchanges, total, pagination))
+        else:
+            page = PaginatedResponse[schemas.ExchangeReadBrief](
+                total=total,
+                items=[schemas.ExchangeReadBrief.model_validate(exchange) for exchange in exchanges],
+                skip=pagination.skip,
+                limit=pagination.limit,
+            )
+            body = page.model_dump_json().encode()
+        tags = {item_type_tag(ItemTypeEnum.exchange)}
+        for exchange in exchanges:
+            tags.add(item_tag(exchange.id))
+            tags.update(tag_tag(tag.id) for tag in exchange.tags)
+        if filters.tag_id is not None:
+            tags.add(tag_tag(filters.tag_id))
+        return CachedResponse(body, etag or await list_etag(), tags)
+
+    key = response_cache.make_key(
+        "exchanges:list", filters=filters.model_dump(exclude_none=True), sort=sort_by.model_dump(),
+        skip=pagination.skip, limit=pagination.limit,
+    )
+    cached = await response_cache.get_or_load(key, load_page, bypass=await replica_router.is_request_pinned(request))
+    return http_cache.conditional_response(
+        request, cached.body, cached.etag, http_cache.catalog_cache_control(), compressed=cached.compressed
     )
 
 
 @router.get("/details/{slug}", response_model=schemas.ExchangeRead)
 async def get_exchange_details(
     slug: str,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get detailed information about a specific exchange by its slug.
+    Supports If-None-Match / If-Modified-Since; a 304 is answered before any relationship is loaded.
     """
+    version = await item_service.get_item_version(db, slug=slug, item_type=ItemTypeEnum.exchange)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exchange not found")
+    etag = http_cache.weak_etag(
+        tuple(version), await reference_data.versions(db, "tags", "countries", "languages", "fiat_currencies")
+    )
+    cache_control = http_cache.catalog_cache_control()
+    if http_cache.is_not_modified(request, etag, version.updated_at):
+        return http_cache.not_modified_response(etag, cache_control, version.updated_at)
+
     db_exchange = await service.exchange_service.get_exchange_by_slug(db, slug=slug)
     if db_exchange is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exchange not found")
+    http_cache.set_cache_headers(response, etag, cache_control, version.updated_at)
     return db_exchange
 
+@router.get("/{slug}/history", response_model=schemas.ExchangeHistory)
+async def get_exchange_history(
+    slug: str,
+    request: Request,
+    metric: schemas.HistoryMetric = Query(schemas.HistoryMetric.volume),
+    resolution: schemas.HistoryResolution = Query(schemas.HistoryResolution.day),
+    days: int = Query(90, ge=1, le=3650, description="How far back to go"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Trading volume or fee history of an exchange, one point per hour, day or week.
+    Points come from rollups maintained at ingestion time.
+    """
+    exchange_id = await exchange_history_service.get_exchange_id(db, slug)
+    if exchange_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exchange not found")
+    points = await exchange_history_service.get_history(
+        db, exchange_id, metric, resolution, since=datetime.utcnow() - timedelta(days=days)
+    )
+    body = schemas.ExchangeHistory(slug=slug, metric=metric, resolution=resolution, points=points).model_dump_json().encode()
+    return http_cache.conditional_response(request, body, http_cache.weak_etag(body), http_cache.catalog_cache_control())
+
 @router.get("/news/{exchange_id}", response_model=PaginatedResponse[news_schemas.NewsItemRead])
 async def list_exchange_news(
     exchange_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     pagination: PaginationParams = Depends(),
 ):
     """
@@ -128,7 +210,7 @@ async def list_exchange_news(
 @router.get("/guides/{exchange_id}", response_model=PaginatedResponse[guide_schemas.GuideItemRead])
 async def list_exchange_guides(
     exchange_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     pagination: PaginationParams = Depends(),
 ):
     """
@@ -148,11 +230,12 @@ async def list_exchange_guides(
 
 @router.get("/tags", response_model=list[TagRead])
 async def get_exchange_tags(
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all unique tags that are attached to exchanges.
     """
-    tags = await service.exchange_service.get_exchange_tags(db)
-    return tags
+    tags = await reference_data.get(db, "exchange_tags")
+    return reference_response(request, tags.body, tags.etag, tags.compressed)
 
@@ -180,4 +180,37 @@ class ExchangeFilterParams(BaseModel):
 
 class ExchangeSortBy(BaseModel):
     field: Literal['name', 'overall_average_rating', 'trading_volume_24h', 'total_review_count', 'total_rating_count', "has_kyc", "has_p2p"] = 'overall_average_rating'
-    direction: Literal['asc', 'desc'] = 'desc'
\ No newline at end of file
+    direction: Literal['asc', 'desc'] = 'desc'
+# --- Click tracking ---
+class ExchangeClickStats(BaseModel):
+    slug: str
+    clicks: int
+    unique_referrers: int
+    last_click_at: Optional[datetime] = None
+
+# --- Volume and fee history ---
+class HistoryMetric(str, enum.Enum):
+    volume = "volume"
+    spot_maker_fee = "spot_maker_fee"
+    spot_taker_fee = "spot_taker_fee"
+    futures_maker_fee = "futures_maker_fee"
+    futures_taker_fee = "futures_taker_fee"
+
+class HistoryResolution(str, enum.Enum):
+    hour = "1h"
+    day = "1d"
+    week = "1w"
+
+class ExchangeHistoryPoint(BaseModel):
+    ts: datetime # Bucket start (UTC)
+    avg: Decimal
+    min: Decimal
+    max: Decimal
+    last: Decimal
+    samples: int
+
+class ExchangeHistory(BaseModel):
+    slug: str
+    metric: HistoryMetric
+    resolution: HistoryResolution
+    points: List[ExchangeHistoryPoint]
@@ -0,0 +1,38 @@
+# app/exchanges/serializers.py
+from typing import Any, Dict, Sequence
+
+from app.core import fast_json
+from app.models.exchange import Exchange
+from app.schemas.common import PaginationParams
+
+# Dict builders with the exact shape of schemas.ExchangeReadBrief, reading the loaded ORM objects
+# directly. Keep them in sync with the schemas; scripts/bench_serialization.py checks that both paths agree.
+
+
+def exchange_brief_to_dict(exchange: Exchange) -> Dict[str, Any]:
+    """schemas.ExchangeReadBrief"""
+    country = exchange.registration_country
+    return {
+        "id": exchange.id,
+        "logo_url": exchange.logo_url,
+        "name": exchange.name,
+        "overall_average_rating": float(exchange.overall_average_rating),
+        "total_review_count": exchange.total_review_count,
+        "total_rating_count": exchange.total_rating_count,
+        "slug": exchange.slug,
+        "tags": [{"name": tag.name, "description": tag.description, "id": tag.id} for tag in exchange.tags],
+        "trading_volume_24h": exchange.trading_volume_24h,
+        "year_founded": exchange.year_founded,
+        "registration_country": None if country is None else {
+            "id": country.id, "name": country.name, "code_iso_alpha2": country.code_iso_alpha2,
+        },
+        "spot_maker_fee": exchange.spot_maker_fee,
+        "futures_maker_fee": exchange.futures_maker_fee,
+        "spot_taker_fee": exchange.spot_taker_fee,
+        "futures_taker_fee": exchange.futures_taker_fee,
+    }
+
+
+def exchange_brief_page(exchanges: Sequence[Exchange], total: int, pagination: PaginationParams) -> Dict[str, Any]:
+    """PaginatedResponse[schemas.ExchangeReadBrief]"""
+    return fast_json.page(total, [exchange_brief_to_dict(exchange) for exchange in exchanges], pagination)
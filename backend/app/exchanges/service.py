@@ -9,11 +9,33 @@ from decimal import Decimal
 from app.models import exchange as exchange_models
 from app.models import common as common_models
 from app.models import item as item_models
-from app.models.tag import Tag
+from app.models.tag import item_tags_association
 from app.exchanges import schemas
 from app.schemas.common import PaginationParams
+from app.schemas.tag import TagRead
+from app.common.reference_data import reference_data
+from app.exchanges.redirects import redirect_service
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import response_cache, item_tag, item_type_tag
+from app.schemas.item import AssociationPatch
+from app.utils.associations import Association
 import logging
 
+# Many-to-many relationships editable through the admin API, by name
+ASSOCIATIONS = {
+    "countries": Association(exchange_models.exchange_availability_table, "exchange_id", "country_id", "available_in_countries"),
+    "languages": Association(exchange_models.exchange_languages_table, "exchange_id", "language_id", "languages"),
+    "fiat-currencies": Association(exchange_models.exchange_fiat_support_table, "exchange_id", "fiat_currency_id", "supported_fiat_currencies"),
+    "tags": Association(item_tags_association, "item_id", "tag_id", "tags"),
+}
+
+# ExchangeUpdate list field -> association it replaces
+UPDATE_FIELD_ASSOCIATIONS = {
+    "available_in_country_ids": ASSOCIATIONS["countries"],
+    "language_ids": ASSOCIATIONS["languages"],
+    "supported_fiat_currency_ids": ASSOCIATIONS["fiat-currencies"],
+}
+
 class ExchangeService:
 
     async def get_exchange_by_slug(self, db: AsyncSession, slug: str) -> Optional[exchange_models.Exchange]:
@@ -35,21 +57,12 @@ class ExchangeService:
         return result.scalar_one_or_none()
 
 
-    async def list_exchanges(
-        self,
-        db: AsyncSession,
-        filters: schemas.ExchangeFilterParams,
-        sort: schemas.ExchangeSortBy,
-        pagination: PaginationParams,
-    ) -> Tuple[List[exchange_models.Exchange], int]:
-
-        # Base query with eager loading for list view
-        query = select(exchange_models.Exchange).options(
-            selectinload(exchange_models.Exchange.registration_country),
-            selectinload(exchange_models.Exchange.tags)
-        )
-
-        # --- Filtering ---
+    def _apply_filters(self, query, filters: schemas.ExchangeFilterParams):
+        """
+        Apply the list filters (and the joins they need) to a query over exchanges.
+        Shared by the page, count and version queries so they always describe the same set.
+        Returns the query and whether a join that can duplicate rows was added.
+        """
         filter_conditions = []
         if filters.name:
             filter_conditions.append(exchange_models.Exchange.name.ilike(f"%{filters.name}%"))
@@ -63,91 +76,79 @@ class ExchangeService:
             filter_conditions.append(exchange_models.Exchange.total_review_count >= filters.min_total_review_count)
         if filters.max_total_review_count is not None:
             filter_conditions.append(exchange_models.Exchange.total_review_count <= filters.max_total_review_count)
-            
+
         # Rating count filtering
         if filters.min_total_rating_count is not None:
             filter_conditions.append(exchange_models.Exchange.total_rating_count >= filters.min_total_rating_count)
         if filters.max_total_rating_count is not None:
             filter_conditions.append(exchange_models.Exchange.total_rating_count <= filters.max_total_rating_count)
 
-        # Build separate queries for filtering with joins
+        # Filtering by relationships requires joins (explicit ON clauses so this also works for aggregate selects)
         joins_applied = False
-        
-        # Filtering by relationships requires joins or subqueries
+
         if filters.country_id:
-            # Example: Filter if registered OR available in country_id
-            query = query.outerjoin(exchange_models.exchange_availability_table).outerjoin(
-                common_models.Country, exchange_models.exchange_availability_table.c.country_id == common_models.Country.id
-            )
+            # Registered OR available in country_id
+            availability = exchange_models.exchange_availability_table
+            query = query.outerjoin(availability, exchange_models.Exchange.id == availability.c.exchange_id)
             filter_conditions.append(
                 or_(
                     exchange_models.Exchange.registration_country_id == filters.country_id,
-                    exchange_models.exchange_availability_table.c.country_id == filters.country_id
+                    availability.c.country_id == filters.country_id
                 )
             )
             joins_applied = True
 
-        # Add tag filtering if tag_id is provided
-        if hasattr(filters, 'tag_id') and filters.tag_id is not None:
-            query = query.join(item_models.item_tags_association).filter(item_models.item_tags_association.c.tag_id == filters.tag_id)
+        if filters.tag_id is not None:
+            query = query.join(item_models.item_tags_association, item_models.item_tags_association.c.item_id == exchange_models.Exchange.id)
+            filter_conditions.append(item_models.item_tags_association.c.tag_id == filters.tag_id)
             joins_applied = True
 
         if filters.has_license_in_country_id:
-             query = query.join(exchange_models.License) # Inner join ensures only exchanges with licenses
-             filter_conditions.append(exchange_models.License.jurisdiction_country_id == filters.has_license_in_country_id)
-             joins_applied = True
+            # Inner join ensures only exchanges with licenses
+            query = query.join(exchange_models.License, exchange_models.License.exchange_id == exchange_models.Exchange.id)
+            filter_conditions.append(exchange_models.License.jurisdiction_country_id == filters.has_license_in_country_id)
+            joins_applied = True
 
         if filters.supports_fiat_id:
-            query = query.join(exchange_models.exchange_fiat_support_table)
-            filter_conditions.append(exchange_models.exchange_fiat_support_table.c.fiat_currency_id == filters.supports_fiat_id)
+            fiat_support = exchange_models.exchange_fiat_support_table
+            query = query.join(fiat_support, fiat_support.c.exchange_id == exchange_models.Exchange.id)
+            filter_conditions.append(fiat_support.c.fiat_currency_id == filters.supports_fiat_id)
             joins_applied = True
 
         if filters.supports_language_id:
-            query = query.join(exchange_models.exchange_languages_table)
-            filter_conditions.append(exchange_models.exchange_languages_table.c.language_id == filters.supports_language_id)
+            languages = exchange_models.exchange_languages_table
+            query = query.join(languages, languages.c.exchange_id == exchange_models.Exchange.id)
+            filter_conditions.append(languages.c.language_id == filters.supports_language_id)
             joins_applied = True
 
         if filter_conditions:
-             if joins_applied:
-                 query = query.where(and_(*filter_conditions)).distinct() # Use distinct because of joins
-             else:
-                 query = query.where(and_(*filter_conditions))
-
-        # --- Count Total (Fixed approach) ---
-        # Create a separate count query with the same filters
-        count_query = select(func.count(func.distinct(exchange_models.Exchange.id)))
-        
-        # Apply the same joins and filters to count query
-        if filters.country_id:
-            count_query = count_query.select_from(
-                exchange_models.Exchange
-                .outerjoin(exchange_models.exchange_availability_table, 
-                           exchange_models.Exchange.id == exchange_models.exchange_availability_table.c.exchange_id)
-                .outerjoin(common_models.Country, 
-                           exchange_models.exchange_availability_table.c.country_id == common_models.Country.id)
-            )
-        else:
-            count_query = count_query.select_from(exchange_models.Exchange)
-            
-        if hasattr(filters, 'tag_id') and filters.tag_id is not None:
-            # Join to the count_query object and apply the specific filter for tag_id
-            count_query = count_query.join(item_models.item_tags_association).filter(item_models.item_tags_association.c.tag_id == filters.tag_id)
-            
-        if filters.has_license_in_country_id:
-            # Join to the count_query object; filter condition is in filter_conditions
-            count_query = count_query.join(exchange_models.License)
-            
-        if filters.supports_fiat_id:
-            # Join to the count_query object; filter condition is in filter_conditions
-            count_query = count_query.join(exchange_models.exchange_fiat_support_table)
-            
-        if filters.supports_language_id:
-            # Join to the count_query object; filter condition is in filter_conditions
-            count_query = count_query.join(exchange_models.exchange_languages_table)
-            
-        if filter_conditions:
-            count_query = count_query.where(and_(*filter_conditions))
+            query = query.where(and_(*filter_conditions))
+        return query, joins_applied
+
+    async def list_exchanges(
+        self,
+        db: AsyncSession,
+        filters: schemas.ExchangeFilterParams,
+        sort: schemas.ExchangeSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[exchange_models.Exchange], int]:
 
+        # Base query with eager loading for list view
+        query = select(exchange_models.Exchange).options(
+            selectinload(exchange_models.Exchange.registration_country),
+            selectinload(exchange_models.Exchange.tags)
+        )
+
+        # --- Filtering ---
+        query, joins_applied = self._apply_filters(query, filters)
+        if joins_applied:
+            query = query.distinct() # Use distinct because of joins
+
+        # --- Count Total ---
+        count_query, _ = self._apply_filters(
+            select(func.count(func.distinct(exchange_models.Exchange.id))).select_from(exchange_models.Exchange),
+            filters,
+        )
         total_result = await db.execute(count_query)
         total = total_result.scalar_one()
 
@@ -167,6 +168,24 @@ class ExchangeService:
 
         return exchanges, total
 
+    async def get_list_version(self, db: AsyncSession, filters: schemas.ExchangeFilterParams):
+        """
+        Fingerprint of the filtered exchange set: row count, newest updated_at and review-stat sums.
+        One aggregate query, used to answer conditional GETs on the list before loading the page.
+        """
+        matching_ids, _ = self._apply_filters(
+            select(exchange_models.Exchange.id).select_from(exchange_models.Exchange), filters
+        )
+        query = select(
+            func.count(exchange_models.Exchange.id),
+            func.max(exchange_models.Exchange.updated_at),
+            func.sum(exchange_models.Exchange.total_review_count),
+            func.sum(exchange_models.Exchange.total_rating_count),
+            func.sum(exchange_models.Exchange.overall_average_rating),
+        ).where(exchange_models.Exchange.id.in_(matching_ids))
+        result = await db.execute(query)
+        return result.one()
+
     # --- CRUD (Likely Admin Only) ---
     async def create_exchange(self, db: AsyncSession, exchange_in: schemas.ExchangeCreate) -> exchange_models.Exchange:
         logger = logging.getLogger(__name__)
@@ -208,7 +227,10 @@ class ExchangeService:
 
 
         db.add(db_exchange)
+        await db.flush()
+        await invalidation_bus.publish(db, "exchange", db_exchange.id)
         await db.commit()
+        await self.invalidate_caches(db_exchange.id)
         await db.refresh(db_exchange, attribute_names=[ # Refresh needed relationships
             'registration_country', 'headquarters_country' # Example
         ])
@@ -233,39 +255,40 @@ class ExchangeService:
         
         for key, value in update_data.items():
             setattr(db_exchange, key, value)
+        # M2M-only updates don't touch the items row; bump it so ETags change
+        db_exchange.updated_at = func.now()
         
-        # Update M2M relationships
-        if exchange_in.available_in_country_ids is not None:
-            # Clear existing relationships and add new ones
-            db_exchange.available_in_countries = []
-            if exchange_in.available_in_country_ids:
-                countries = await db.execute(select(common_models.Country).filter(
-                    common_models.Country.id.in_(exchange_in.available_in_country_ids)
-                ))
-                db_exchange.available_in_countries.extend(countries.scalars().all())
-        
-        if exchange_in.language_ids is not None:
-            db_exchange.languages = []
-            if exchange_in.language_ids:
-                langs = await db.execute(select(common_models.Language).filter(
-                    common_models.Language.id.in_(exchange_in.language_ids)
-                ))
-                db_exchange.languages.extend(langs.scalars().all())
-        
-        if exchange_in.supported_fiat_currency_ids is not None:
-            db_exchange.supported_fiat_currencies = []
-            if exchange_in.supported_fiat_currency_ids:
-                fiats = await db.execute(select(common_models.FiatCurrency).filter(
-                    common_models.FiatCurrency.id.in_(exchange_in.supported_fiat_currency_ids)
-                ))
-                db_exchange.supported_fiat_currencies.extend(fiats.scalars().all())
-        
+        # Update M2M relationships in SQL (no related rows are loaded)
+        for field, association in UPDATE_FIELD_ASSOCIATIONS.items():
+            target_ids = getattr(exchange_in, field)
+            if target_ids is not None:
+                await association.replace(db, db_exchange.id, target_ids)
+                db.expire(db_exchange, [association.attribute])
+
+        await invalidation_bus.publish(db, "exchange", db_exchange.id)
         await db.commit()
         await db.refresh(db_exchange)
+        await self.invalidate_caches(db_exchange.id)
         
         # Re-fetch full details with all relations
         return await self.get_exchange_by_slug(db, db_exchange.slug)
 
+    async def update_exchange_links(
+        self, db: AsyncSession, db_exchange: exchange_models.Exchange, relation: str, links_in: AssociationPatch
+    ) -> exchange_models.Exchange:
+        """
+        Add and/or remove links of one many-to-many relationship (see ASSOCIATIONS) without replacing the whole list.
+        """
+        association = ASSOCIATIONS[relation]
+        await association.remove(db, db_exchange.id, links_in.remove)
+        await association.add(db, db_exchange.id, links_in.add)
+        db.expire(db_exchange, [association.attribute])
+        db_exchange.updated_at = func.now() # Bump it so ETags change
+        await invalidation_bus.publish(db, "exchange", db_exchange.id)
+        await db.commit()
+        await self.invalidate_caches(db_exchange.id)
+        return await self.get_exchange_by_slug(db, db_exchange.slug)
+
     async def delete_exchange(self, db: AsyncSession, exchange_id: int) -> None:
         """
         Delete an exchange by ID.
@@ -275,25 +298,32 @@ class ExchangeService:
         if db_exchange:
             # Delete the exchange
             await db.delete(db_exchange)
+            await invalidation_bus.publish(db, "exchange", exchange_id)
             await db.commit()
+            await self.invalidate_caches(exchange_id)
             return True
         return False
 
-    async def get_exchange_tags(self, db: AsyncSession) -> List[Tag]:
+    async def invalidate_caches(self, exchange_id: Optional[int]) -> None:
         """
-        Get all unique tags that are attached to exchanges.
+        Drop cached data showing this exchange after it was created, updated or deleted
+        (without exchange_id: after a bulk write such as the CoinGecko ingestion).
         """
-        print("Fetching exchange tags...")
-        query = (
-            select(Tag)
-            .join(item_models.item_tags_association)
-            .join(item_models.Item)
-            .where(item_models.Item.item_type == item_models.ItemTypeEnum.exchange)
-            .distinct()
-            .order_by(Tag.name)
-        )
-        result = await db.execute(query)
-        return result.scalars().all()
+        reference_data.invalidate("exchange_tags")
+        redirect_service.invalidate()
+        # Any field may move the exchange in or out of a filtered/sorted page
+        tags = [item_type_tag(item_models.ItemTypeEnum.exchange)]
+        if exchange_id is not None:
+            tags.append(item_tag(exchange_id))
+        await response_cache.invalidate(*tags)
+
+    async def get_exchange_tags(self, db: AsyncSession) -> List[TagRead]:
+        """
+        Get all unique tags that are attached to exchanges (served from the reference-data store).
+        """
+        return (await reference_data.get(db, "exchange_tags")).items
+
 
+exchange_service = ExchangeService()
 
-exchange_service = ExchangeService()
\ No newline at end of file
+invalidation_bus.subscribe("exchange", lambda exchange_id, data: exchange_service.invalidate_caches(exchange_id))
\ No newline at end of file
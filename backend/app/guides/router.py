@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_async_db
+from app.core.database import get_read_db
 from app.guides import schemas as guide_schemas, service as guide_service
 from app.schemas.common import PaginationParams, PaginatedResponse
 
@@ -14,7 +14,7 @@ router = APIRouter(
 
 @router.get("/", response_model=PaginatedResponse[guide_schemas.GuideItemRead])
 async def list_guides(
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     pagination: PaginationParams = Depends(),
     exchange_id: Optional[int] = Query(None, description="Filter guides by exchange ID")
 ):
@@ -36,7 +36,7 @@ async def list_guides(
 @router.get("/{guide_id}", response_model=guide_schemas.GuideItemRead)
 async def get_guide_item(
     guide_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get details of a specific guide item.
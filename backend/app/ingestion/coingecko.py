@@ -0,0 +1,143 @@
+# app/ingestion/coingecko.py
+import asyncio
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PER_PAGE = 100 # CoinGecko's maximum for /exchanges
+MAX_PAGES = 100 # Bound on fetching "through the end of the listing"
+
+
+class CoinGeckoError(Exception):
+    """A page could not be fetched after all retries."""
+
+
+class CoinGeckoClient:
+    """
+    Async client for the paged CoinGecko /exchanges endpoint (and the BTC price used to convert volumes).
+
+    - Pages are fetched concurrently, at most `concurrency` requests at a time.
+    - 429 and 5xx responses and transport errors are retried with exponential backoff;
+      a Retry-After header on 429 is honored.
+    - Pages can be recorded to, or replayed from, a directory of page_<n>.json files,
+      so the whole pipeline runs offline (the base URL can also point at a local stub server).
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.COINGECKO_BASE_URL,
+        api_key: str = settings.COINGECKO_API_KEY,
+        concurrency: int = settings.COINGECKO_CONCURRENCY,
+        max_retries: int = settings.COINGECKO_MAX_RETRIES,
+        timeout: float = 30,
+        fixtures_dir: Optional[Path] = None,
+        record_dir: Optional[Path] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.fixtures_dir = fixtures_dir
+        self.record_dir = record_dir
+        self.concurrency = max(1, concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"accept": "application/json"}
+        if self.api_key:
+            headers["x-cg-api-key"] = self.api_key
+        return headers
+
+    @staticmethod
+    def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return min(60.0, 2 ** attempt) + random.uniform(0, 1)
+
+    async def _get_page(self, client: httpx.AsyncClient, page: int) -> List[Dict[str, Any]]:
+        return await self._get_json(client, "/exchanges", {"per_page": PER_PAGE, "page": page}, f"Page {page}")
+
+    async def _get_json(self, client: httpx.AsyncClient, path: str, params: Dict[str, Any], what: str) -> Any:
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with self._semaphore:
+                    response = await client.get(f"{self.base_url}{path}", params=params)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+                response.raise_for_status()
+                return response.json()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = response is None or response.status_code == 429 or response.status_code >= 500
+                if not retryable or attempt == self.max_retries:
+                    raise CoinGeckoError(f"{what}: {e}") from e
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"CoinGecko {what} failed ({e}), retrying in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+        raise CoinGeckoError(f"{what}: retries exhausted")
+
+    def _read_fixture(self, page: int) -> List[Dict[str, Any]]:
+        path = self.fixtures_dir / f"page_{page}.json"
+        if not path.exists():
+            return []
+        return json.loads(path.read_text())
+
+    def _record(self, page: int, rows: List[Dict[str, Any]]) -> None:
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        (self.record_dir / f"page_{page}.json").write_text(json.dumps(rows, indent=2))
+
+    async def fetch_btc_price_usd(self) -> Optional[float]:
+        """Current BTC price in USD (None when unavailable); recorded/replayed as btc_price.json."""
+        if self.fixtures_dir is not None:
+            path = self.fixtures_dir / "btc_price.json"
+            return json.loads(path.read_text()).get("bitcoin", {}).get("usd") if path.exists() else None
+        try:
+            async with httpx.AsyncClient(headers=self._headers(), timeout=self.timeout) as client:
+                data = await self._get_json(client, "/simple/price", {"ids": "bitcoin", "vs_currencies": "usd"}, "BTC price")
+        except CoinGeckoError as e:
+            logger.warning(f"Could not fetch the BTC price: {e}")
+            return None
+        if self.record_dir is not None:
+            self.record_dir.mkdir(parents=True, exist_ok=True)
+            (self.record_dir / "btc_price.json").write_text(json.dumps(data))
+        return data.get("bitcoin", {}).get("usd")
+
+    async def fetch_exchanges(self, start_page: int = 1, end_page: Optional[int] = 5) -> List[Dict[str, Any]]:
+        """
+        Rows of pages start_page..end_page in page order; pages after the first empty one are ignored.
+        With end_page=None, pages are fetched `concurrency` at a time until the listing ends.
+        """
+        if end_page is None:
+            rows: List[Dict[str, Any]] = []
+            for first in range(start_page, start_page + MAX_PAGES, self.concurrency):
+                batch = await self.fetch_exchanges(first, first + self.concurrency - 1)
+                rows.extend(batch)
+                if len(batch) < self.concurrency * PER_PAGE: # A short or empty page: the end of the listing
+                    return rows
+            raise CoinGeckoError(f"The exchange listing didn't end within {MAX_PAGES} pages.")
+        pages = list(range(start_page, end_page + 1))
+        if self.fixtures_dir is not None:
+            results = [self._read_fixture(page) for page in pages]
+        else:
+            async with httpx.AsyncClient(headers=self._headers(), timeout=self.timeout) as client:
+                results = await asyncio.gather(*[self._get_page(client, page) for page in pages])
+            if self.record_dir is not None:
+                for page, rows in zip(pages, results):
+                    self._record(page, rows)
+
+        rows: List[Dict[str, Any]] = []
+        for page_rows in results:
+            if not page_rows:
+                break
+            rows.extend(page_rows)
+        return rows
@@ -0,0 +1,118 @@
+# app/ingestion/countries.py
+import difflib
+import logging
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.common import Country
+
+logger = logging.getLogger(__name__)
+
+# Common upstream spellings -> ISO 3166-1 alpha-2 code (only used when that country exists)
+COUNTRY_ALIASES: Dict[str, str] = {
+    "usa": "US", "us": "US", "united states of america": "US", "america": "US",
+    "uk": "GB", "great britain": "GB", "britain": "GB", "england": "GB", "scotland": "GB", "wales": "GB",
+    "uae": "AE", "emirates": "AE",
+    "south korea": "KR", "republic of korea": "KR", "korea": "KR",
+    "north korea": "KP", "democratic peoples republic of korea": "KP",
+    "russian federation": "RU",
+    "czechia": "CZ",
+    "turkiye": "TR",
+    "viet nam": "VN",
+    "lao pdr": "LA", "lao peoples democratic republic": "LA",
+    "holy see": "VA",
+    "ivory coast": "CI", "cote divoire": "CI",
+    "macedonia": "MK",
+    "drc": "CD", "dr congo": "CD",
+    "burma": "MM",
+    "swaziland": "SZ", "eswatini": "SZ",
+    "cape verde": "CV", "cabo verde": "CV",
+    "east timor": "TL", "timor leste": "TL",
+    "hong kong sar": "HK", "hong kong china": "HK",
+    "macao": "MO", "macau": "MO",
+    "bvi": "VG", "british virgin islands": "VG",
+    "republic of china": "TW",
+}
+
+FUZZY_CUTOFF = 0.85
+
+
+def normalize_country_name(name: str) -> str:
+    """Casefolded, accent-free, punctuation-free, single-spaced; "St" becomes "saint" and a leading "the" is dropped."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char)).casefold()
+    name = re.sub(r"[^\w\s]", " ", name.replace("'", ""))
+    words = ["saint" if word in ("st", "ste") else word for word in name.split()]
+    if words and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+
+class CountryResolver:
+    """
+    Resolves free-form country names from importers to `countries.id`.
+
+    Countries are loaded once; lookups are dict hits on the normalized name, an alias,
+    the ISO alpha-2 code or the "Korea, South" -> "south korea" form. Anything else goes
+    through a deterministic fuzzy fallback (unique substring match, then the closest name
+    above FUZZY_CUTOFF) whose result is memoized.
+    Names that don't resolve are counted; report_unresolved() logs them at the end of a run.
+    """
+
+    def __init__(self, countries: Iterable[Tuple[int, str, str]], aliases: Optional[Mapping[str, str]] = None):
+        self._by_key: Dict[str, Optional[int]] = {}
+        ids_by_code: Dict[str, int] = {}
+        for country_id, name, code in countries:
+            normalized = normalize_country_name(name)
+            self._by_key[normalized] = country_id
+            if "," in name:
+                # "Korea, South" -> "south korea"
+                head, _, tail = name.partition(",")
+                self._by_key.setdefault(normalize_country_name(f"{tail} {head}"), country_id)
+            if code:
+                ids_by_code[code.upper()] = country_id
+                self._by_key.setdefault(code.casefold(), country_id)
+        for alias, code in {**COUNTRY_ALIASES, **(aliases or {})}.items():
+            if code.upper() in ids_by_code:
+                self._by_key.setdefault(normalize_country_name(alias), ids_by_code[code.upper()])
+        self._names: List[str] = sorted(self._by_key)
+        self.unresolved: Counter = Counter()
+
+    @classmethod
+    async def load(cls, db: AsyncSession, aliases: Optional[Mapping[str, str]] = None) -> "CountryResolver":
+        result = await db.execute(select(Country.id, Country.name, Country.code_iso_alpha2))
+        return cls(result.all(), aliases=aliases)
+
+    def _fuzzy(self, key: str) -> Optional[int]:
+        if len(key) >= 4:
+            words = key.split()
+            matches = sorted({
+                self._by_key[name] for name in self._names
+                if len(name) >= 4 and (key in name or name in words)
+            })
+            if len(matches) == 1:
+                return matches[0]
+        close = difflib.get_close_matches(key, self._names, n=1, cutoff=FUZZY_CUTOFF)
+        return self._by_key[close[0]] if close else None
+
+    def resolve(self, name: Optional[str]) -> Optional[int]:
+        if not name or not name.strip():
+            return None
+        key = normalize_country_name(name)
+        if key not in self._by_key:
+            # Memoize misses too, so each distinct name is matched fuzzily once
+            self._by_key[key] = self._fuzzy(key)
+        country_id = self._by_key[key]
+        if country_id is None:
+            self.unresolved[name.strip()] += 1
+        return country_id
+
+    def report_unresolved(self) -> None:
+        if self.unresolved:
+            names = ", ".join(f"{name} ({count})" for name, count in self.unresolved.most_common())
+            logger.warning(f"{len(self.unresolved)} country names could not be resolved: {names}")
@@ -0,0 +1,250 @@
+# app/ingestion/exchanges.py
+import datetime
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, delete, func, literal_column, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.exchanges.history import exchange_history_service
+from app.ingestion.countries import CountryResolver
+from app.models.exchange import Exchange, ExchangeSourceHash
+from app.models.item import Item, ItemTypeEnum
+
+logger = logging.getLogger(__name__)
+
+BTC_USD_RATE = Decimal(107500) # Fallback when the current BTC price can't be fetched
+FEE_COLUMNS = ("spot_maker_fee", "spot_taker_fee", "futures_maker_fee", "futures_taker_fee")
+
+ITEM_COLUMNS = ("name", "description", "logo_url", "website_url")
+EXCHANGE_COLUMNS = ("trading_volume_24h", "year_founded", "registration_country_id")
+# Slow-changing fields that decide whether a row is written. The volume moves on every run
+# (and with the BTC price), so it is refreshed separately, see update_volumes()
+HASHED_COLUMNS = (*ITEM_COLUMNS, "year_founded", "registration_country_id")
+
+
+class CoinGeckoExchange(BaseModel):
+    """The fields we use from a CoinGecko /exchanges row."""
+    id: str
+    name: str
+    description: Optional[str] = None
+    url: Optional[str] = None
+    image: Optional[str] = None
+    year_established: Optional[int] = None
+    country: Optional[str] = None
+    trade_volume_24h_btc: Optional[Decimal] = None
+
+
+@dataclass
+class IngestResult:
+    fetched: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0 # Seen on a previous run, missing from this one (rows are kept)
+    skipped_slugs: List[str] = field(default_factory=list) # Slug taken by a non-exchange item
+
+
+def map_exchange(row: CoinGeckoExchange, countries: CountryResolver, btc_price_usd: Decimal = BTC_USD_RATE) -> Dict[str, Any]:
+    volume = row.trade_volume_24h_btc
+    return {
+        "slug": row.id,
+        "name": row.name,
+        "description": row.description or None,
+        "logo_url": row.image,
+        "website_url": row.url,
+        "trading_volume_24h": round(volume * btc_price_usd, 2) if volume is not None else None,
+        "year_founded": row.year_established,
+        "registration_country_id": countries.resolve(row.country),
+    }
+
+
+def content_hash(mapped: Dict[str, Any]) -> str:
+    encoded = json.dumps({col: mapped[col] for col in HASHED_COLUMNS}, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+async def load_hashes(db: AsyncSession) -> Dict[str, str]:
+    """Stored hashes of exchanges that still exist (a deleted exchange is written again)."""
+    query = (
+        select(ExchangeSourceHash.slug, ExchangeSourceHash.content_hash)
+        .join(Item, Item.slug == ExchangeSourceHash.slug)
+        .where(Item.item_type == ItemTypeEnum.exchange)
+    )
+    return dict((await db.execute(query)).all())
+
+
+def validate_rows(raw_rows: Iterable[Dict[str, Any]], result: IngestResult) -> List[CoinGeckoExchange]:
+    rows: Dict[str, CoinGeckoExchange] = {}
+    for raw in raw_rows:
+        try:
+            row = CoinGeckoExchange.model_validate(raw)
+        except ValidationError as e:
+            result.invalid += 1
+            logger.warning(f"Skipping invalid CoinGecko row {raw.get('id')!r}: {e.errors()[0]['msg']}")
+            continue
+        rows[row.id] = row # ON CONFLICT can't touch the same slug twice in one statement
+    return list(rows.values())
+
+
+async def upsert_chunk(db: AsyncSession, mapped: List[Dict[str, Any]], result: IngestResult) -> None:
+    """Two statements per chunk: items by slug (exchanges only), then exchanges by id."""
+    items = Item.__table__
+    item_stmt = insert(items).values([
+        {"item_type": ItemTypeEnum.exchange, "slug": row["slug"], **{col: row[col] for col in ITEM_COLUMNS}}
+        for row in mapped
+    ])
+    item_stmt = item_stmt.on_conflict_do_update(
+        index_elements=[items.c.slug],
+        set_={
+            "name": item_stmt.excluded.name,
+            **{col: func.coalesce(getattr(item_stmt.excluded, col), items.c[col]) for col in ITEM_COLUMNS if col != "name"},
+            "updated_at": func.now(),
+        },
+        where=items.c.item_type == ItemTypeEnum.exchange,
+    ).returning(items.c.id, items.c.slug, literal_column("xmax = 0").label("inserted"))
+    ids_by_slug: Dict[str, int] = {}
+    for item_id, slug, inserted in (await db.execute(item_stmt)).all():
+        ids_by_slug[slug] = item_id
+        if inserted:
+            result.inserted += 1
+        else:
+            result.updated += 1
+
+    exchange_rows = []
+    for row in mapped:
+        item_id = ids_by_slug.get(row["slug"])
+        if item_id is None:
+            result.skipped_slugs.append(row["slug"])
+            continue
+        exchange_rows.append({"id": item_id, **{col: row[col] for col in EXCHANGE_COLUMNS}})
+    if not exchange_rows:
+        return
+
+    hashes = ExchangeSourceHash.__table__
+    hash_stmt = insert(hashes).values([
+        {"slug": row["slug"], "content_hash": content_hash(row)} for row in mapped if row["slug"] in ids_by_slug
+    ])
+    await db.execute(hash_stmt.on_conflict_do_update(
+        index_elements=[hashes.c.slug],
+        set_={"content_hash": hash_stmt.excluded.content_hash, "updated_at": func.now()},
+    ))
+
+    exchanges = Exchange.__table__
+    exchange_stmt = insert(exchanges).values(exchange_rows)
+    exchange_stmt = exchange_stmt.on_conflict_do_update(
+        index_elements=[exchanges.c.id],
+        set_={col: func.coalesce(getattr(exchange_stmt.excluded, col), exchanges.c[col]) for col in EXCHANGE_COLUMNS},
+    )
+    await db.execute(exchange_stmt)
+
+
+async def update_volumes(db: AsyncSession, mapped: List[Dict[str, Any]]) -> None:
+    """
+    Refresh trading_volume_24h in place. Only the exchanges row is touched (items.updated_at stays)
+    and nothing is invalidated: cached lists pick the new volumes up within their TTL.
+    """
+    volumes = [{"b_slug": row["slug"], "b_volume": row["trading_volume_24h"]} for row in mapped if row["trading_volume_24h"] is not None]
+    if not volumes:
+        return
+    exchanges, items = Exchange.__table__, Item.__table__
+    stmt = (
+        update(exchanges)
+        .where(exchanges.c.id == items.c.id)
+        .where(items.c.slug == bindparam("b_slug"), items.c.item_type == ItemTypeEnum.exchange)
+        .where(exchanges.c.trading_volume_24h.is_distinct_from(bindparam("b_volume")))
+        .values(trading_volume_24h=bindparam("b_volume"))
+    )
+    await db.execute(stmt, volumes)
+
+
+async def record_snapshots(
+    session_factory: Callable[[], AsyncSession],
+    mapped: List[Dict[str, Any]],
+    ts: datetime.datetime,
+    btc_price_usd: Decimal,
+    chunk_size: int,
+) -> None:
+    """History point for every ingested exchange, written or unchanged: upstream volume plus the current fees."""
+    volumes = {row["slug"]: row["trading_volume_24h"] for row in mapped}
+    async with session_factory() as db:
+        query = (
+            select(Exchange.id, Exchange.slug, *[getattr(Exchange, col) for col in FEE_COLUMNS])
+            .where(Exchange.slug.in_(list(volumes)))
+        )
+        points = [
+            {"exchange_id": row.id, "trading_volume_24h": volumes[row.slug], **{col: getattr(row, col) for col in FEE_COLUMNS}}
+            for row in (await db.execute(query)).all()
+        ]
+    for start in range(0, len(points), chunk_size):
+        async with session_factory() as db:
+            await exchange_history_service.record_snapshots(db, points[start:start + chunk_size], ts, btc_price_usd)
+            await db.commit()
+
+
+async def ingest_exchanges(
+    session_factory: Callable[[], AsyncSession],
+    raw_rows: List[Dict[str, Any]],
+    chunk_size: int = settings.COINGECKO_UPSERT_CHUNK_SIZE,
+    track_removed: bool = True,
+    btc_price_usd: Optional[Decimal] = None,
+) -> IngestResult:
+    """
+    Validate and map CoinGecko rows, then upsert them in chunks of `chunk_size`, one transaction per chunk.
+    Rows whose content hash (HASHED_COLUMNS) matches the one stored on the previous run are not upserted;
+    only their volume is refreshed.
+    Fields CoinGecko leaves empty keep their current value; slugs used by other item types are skipped.
+    Pass track_removed=False when raw_rows is not the full listing (e.g. a single page).
+    Every run also appends a volume/fee snapshot per exchange (see ExchangeHistoryService).
+    """
+    started_at = datetime.datetime.utcnow()
+    if btc_price_usd is None:
+        logger.warning(f"No BTC price given, converting volumes at the fallback rate {BTC_USD_RATE}.")
+        btc_price_usd = BTC_USD_RATE
+    result = IngestResult(fetched=len(raw_rows))
+    rows = validate_rows(raw_rows, result)
+    async with session_factory() as db:
+        countries = await CountryResolver.load(db)
+        stored_hashes = await load_hashes(db)
+    mapped = [map_exchange(row, countries, btc_price_usd) for row in rows]
+    countries.report_unresolved()
+    changed = [row for row in mapped if stored_hashes.get(row["slug"]) != content_hash(row)]
+    result.unchanged = len(mapped) - len(changed)
+
+    for start in range(0, len(changed), chunk_size):
+        async with session_factory() as db:
+            await upsert_chunk(db, changed[start:start + chunk_size], result)
+            await db.commit()
+    for start in range(0, len(mapped), chunk_size):
+        async with session_factory() as db:
+            await update_volumes(db, mapped[start:start + chunk_size])
+            await db.commit()
+
+    await record_snapshots(session_factory, mapped, started_at, btc_price_usd, chunk_size)
+
+    removed = set(stored_hashes) - {row["slug"] for row in mapped}
+    if track_removed and removed and rows:
+        # Forget their hashes so they are written again if they come back; the exchanges stay
+        result.removed = len(removed)
+        async with session_factory() as db:
+            await db.execute(delete(ExchangeSourceHash).where(ExchangeSourceHash.slug.in_(removed)))
+            await db.commit()
+
+    if changed:
+        # Exchange lists, redirect targets and exchange tags on every API worker
+        async with session_factory() as db:
+            await invalidation_bus.publish(db, "exchange")
+            await db.commit()
+    if result.skipped_slugs:
+        logger.warning(f"Skipped {len(result.skipped_slugs)} slugs used by non-exchange items: {result.skipped_slugs}")
+    return result
@@ -1,9 +1,11 @@
 # app/item/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List # Import List
 
-from app.core.database import get_async_db
+from app.core import http_cache
+from app.core.database import get_async_db, get_read_db
+from app.common.reference_data import reference_data
 from app.schemas import item as item_schemas
 from app.schemas import tag as tag_schemas # Import TagRead schema
 from app.schemas.common import Message # Import Message schema
@@ -18,20 +20,32 @@ router = APIRouter(
 @router.get("/{item_id}", response_model=item_schemas.ItemRead)
 async def get_item(
     item_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific item by its ID.
+    Supports If-None-Match / If-Modified-Since; a 304 is answered before the item is loaded.
     """
+    version = await item_service.item_service.get_item_version(db=db, item_id=item_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    etag = http_cache.weak_etag(tuple(version), await reference_data.versions(db, "tags"))
+    cache_control = http_cache.catalog_cache_control()
+    if http_cache.is_not_modified(request, etag, version.updated_at):
+        return http_cache.not_modified_response(etag, cache_control, version.updated_at)
+
     item = await item_service.item_service.get_item_by_id(db=db, item_id=item_id)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    http_cache.set_cache_headers(response, etag, cache_control, version.updated_at)
     return item
 
 @router.get("/{item_id}/tags", response_model=List[tag_schemas.TagRead])
 async def get_item_tags(
     item_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all tags associated with a specific item.
@@ -1,12 +1,16 @@
 # app/item/service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func
 from sqlalchemy.orm import selectinload # Import selectinload
 from typing import Optional, List # Import List
 import logging
 
 from app.models import item as item_models
 from app.models import tag as tag_models # Import tag model
+from app.common.reference_data import reference_data
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import response_cache, item_tag, tag_tag
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -24,6 +28,34 @@ class ItemService:
         logger.info(f"Item with id {item_id} {'found' if item else 'not found'}.")
         return item
 
+    async def get_item_version(
+        self,
+        db: AsyncSession,
+        item_id: Optional[int] = None,
+        slug: Optional[str] = None,
+        item_type: Optional[item_models.ItemTypeEnum] = None,
+    ):
+        """
+        Fetch only the columns that identify an item's current version
+        (id, updated_at and review stats), without loading any relationships.
+        Used to answer conditional GETs before the full item is loaded.
+        """
+        query = select(
+            item_models.Item.id,
+            item_models.Item.updated_at,
+            item_models.Item.overall_average_rating,
+            item_models.Item.total_review_count,
+            item_models.Item.total_rating_count,
+        )
+        if item_id is not None:
+            query = query.filter(item_models.Item.id == item_id)
+        if slug is not None:
+            query = query.filter(item_models.Item.slug == slug)
+        if item_type is not None:
+            query = query.filter(item_models.Item.item_type == item_type)
+        result = await db.execute(query)
+        return result.one_or_none()
+
     async def get_tags_for_item(self, db: AsyncSession, item_id: int) -> Optional[List[tag_models.Tag]]:
         """Retrieve all tags for a specific item."""
         logger.info(f"Retrieving tags for item with id {item_id}.")
@@ -34,6 +66,11 @@ class ItemService:
         logger.info(f"Found {len(item.tags)} tags for item id {item_id}.")
         return item.tags
 
+    async def invalidate_item_tags(self, item_id: int, tag_id: int) -> None:
+        """Drop caches showing the item's tags after a tag was attached or detached."""
+        reference_data.invalidate("exchange_tags", "book_tags")
+        await response_cache.invalidate(item_tag(item_id), tag_tag(tag_id))
+
     async def add_tag_to_item(
         self, db: AsyncSession, item_id: int, tag_id: int
     ) -> Optional[item_models.Item]:
@@ -60,12 +97,15 @@ class ItemService:
 
         if tag not in item.tags:
             item.tags.append(tag)
+            item.updated_at = func.now() # M2M changes don't touch the items row; bump it for ETags
+            await invalidation_bus.publish(db, "item_tags", item_id, tag_id=tag_id)
             await db.commit()
             await db.refresh(item) # Refresh to get updated relationships if necessary
             # Re-load tags explicitly after commit if refresh doesn't capture it perfectly for the response
             # For many-to-many, SQLAlchemy usually handles this well.
             # If item.tags is not populated correctly after refresh, a specific query might be needed.
             # However, the `selectinload` on the initial fetch of `item` should make `item.tags` usable.
+            await self.invalidate_item_tags(item_id, tag_id)
             logger.info(f"Tag id {tag_id} added to item id {item_id}.")
         else:
             logger.info(f"Tag id {tag_id} already associated with item id {item_id}.")
@@ -98,8 +138,11 @@ class ItemService:
         
         if tag_to_remove:
             item.tags.remove(tag_to_remove)
+            item.updated_at = func.now()
+            await invalidation_bus.publish(db, "item_tags", item_id, tag_id=tag_id)
             await db.commit()
             await db.refresh(item) # Refresh to get updated relationships
+            await self.invalidate_item_tags(item_id, tag_id)
             logger.info(f"Tag id {tag_id} removed from item id {item_id}.")
         else:
             logger.warning(f"Tag id {tag_id} not found on item id {item_id} or item/tag itself not found.")
@@ -115,3 +158,5 @@ class ItemService:
 
 item_service = ItemService()
 
+invalidation_bus.subscribe("item_tags", lambda item_id, data: item_service.invalidate_item_tags(item_id, data["tag_id"]))
+
@@ -1,9 +1,25 @@
 # app/main.py
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi import APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import (
+    engine, replica_engines, replica_router, check_database_settings, AsyncSessionFactory
+)
+from app.core.invalidation import invalidation_bus
+from app.core.lifecycle import app_lifecycle
+from app.core.load_shedding import load_shedder
+from app.core import query_stats
+from app.auth.security import password_hasher
+from app.core.replicas import SAFE_METHODS
 from app.auth.router import router as auth_router
 from app.exchanges.router import router as exchanges_router
 from app.books.router import router as books_router
@@ -16,11 +32,84 @@ from app.guides.router import router as guides_router # Import the guides router
 from app.item.router import router as item_router # Import the item router
 from app.tag.router import router as tag_router
 
+from app.common.reference_data import reference_data
+from app.static_pages.router import KNOWN_SLUGS
+from app.static_pages.service import static_page_service
+from app.exchanges import schemas as exchange_schemas
+from app.exchanges.service import exchange_service
+from app.exchanges.redirects import redirect_service
+from app.books import schemas as book_schemas
+from app.books.service import book_service
+from app.schemas.common import PaginationParams
+
+logger = logging.getLogger(__name__)
+
+# --- Warm-up ---
+async def preload_reference_data(db: AsyncSession):
+    """Load the reference-data store and encode the static pages."""
+    await reference_data.load_all(db)
+    for slug in KNOWN_SLUGS:
+        await static_page_service.get_encoded_page(db=db, slug=slug)
+
+async def preload_hot_catalog(db: AsyncSession):
+    """Run the default first page of the exchange and book lists (the landing pages)."""
+    await exchange_service.list_exchanges(
+        db=db,
+        filters=exchange_schemas.ExchangeFilterParams(),
+        sort=exchange_schemas.ExchangeSortBy(),
+        pagination=PaginationParams(),
+    )
+    await book_service.list_books(
+        db=db,
+        filters=book_schemas.BookFilterParams(),
+        sort=book_schemas.BookSortBy(),
+        pagination=PaginationParams(),
+    )
+
+async def preload_redirect_targets(db: AsyncSession):
+    """Load the slug -> URL map behind /exchanges/go/{slug} (from the primary, in its own session)."""
+    await redirect_service.get_target("")
+
+async def flush_exchange_clicks():
+    await redirect_service.stop(AsyncSessionFactory)
+
+app_lifecycle.on_warmup("reference data", preload_reference_data)
+app_lifecycle.on_warmup("hot catalog", preload_hot_catalog)
+app_lifecycle.on_warmup("redirect targets", preload_redirect_targets)
+app_lifecycle.on_shutdown("invalidation bus", invalidation_bus.stop)
+app_lifecycle.on_shutdown("exchange clicks", flush_exchange_clicks)
+app_lifecycle.on_shutdown("password hasher", password_hasher.shutdown)
+
+async def warm_up():
+    for db_engine in [engine, *replica_engines]:
+        try:
+            await app_lifecycle.warm_pool(db_engine, settings.DB_WARMUP_CONNECTIONS)
+        except Exception as e:
+            logger.error(f"Pool warm-up failed: {e}")
+    await app_lifecycle.run_warmup(AsyncSessionFactory)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await check_database_settings()
+    # Listen for cache invalidations published by the other workers
+    await invalidation_bus.start(engine)
+    # Write buffered outbound clicks in the background
+    redirect_service.start(AsyncSessionFactory)
+    # Warm up in the background: liveness answers right away, readiness only after warm-up
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    if not warmup_task.done():
+        warmup_task.cancel()
+    await app_lifecycle.drain(timeout=settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    for db_engine in [engine, *replica_engines]:
+        await db_engine.dispose()
+
 # Create FastAPI app instance
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # Customize OpenAPI path
+    openapi_url=f"{settings.API_V1_STR}/openapi.json", # Customize OpenAPI path
+    lifespan=lifespan,
 )
 
 # --- Middleware ---
@@ -38,6 +127,77 @@ app.add_middleware(
     allow_headers=["*"], # Allows all headers
 )
 
+if settings.COMPRESSION_ENABLED:
+    # Precompressed bodies (response cache, reference lists, static pages) pass through untouched
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+@app.middleware("http")
+async def shed_load(request: Request, call_next):
+    """Answer 503 early when writes pile up or the DB pool wait queue is too deep."""
+    if request.url.path.startswith("/health"):
+        return await call_next(request)
+    rejection = load_shedder.rejection(request.method, request.url.path, engine, app_lifecycle.in_flight)
+    if rejection is not None:
+        return rejection
+    if not load_shedder.is_capped_write(request.method, request.url.path):
+        return await call_next(request)
+    load_shedder.writes_in_flight += 1
+    try:
+        return await call_next(request)
+    finally:
+        load_shedder.writes_in_flight -= 1
+
+@app.middleware("http")
+async def track_in_flight_requests(request: Request, call_next):
+    """Count in-flight requests so shutdown can wait for them to finish."""
+    app_lifecycle.request_started()
+    try:
+        return await call_next(request)
+    finally:
+        app_lifecycle.request_finished()
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """
+    Read-your-writes: after a successful write, route this client's reads
+    to the primary for REPLICA_READ_YOUR_WRITES_SECONDS.
+    """
+    response = await call_next(request)
+    if replica_router.enabled and request.method not in SAFE_METHODS and response.status_code < 400:
+        # Keyed by user id (or IP), not a cookie: the frontend calls the API cross-origin without credentials.
+        # Only REPLICA_PIN_BACKEND=redis carries the pin to the other workers.
+        await replica_router.mark_write(request)
+    return response
+
+if settings.PROFILER_ENABLED:
+    from app.core.profiling import request_profiler
+    query_stats.install([engine, *replica_engines])
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        """Run admin `?__profile=1` (or sampled) requests under the sampling profiler; see /admin/profiles."""
+        trigger = await request_profiler.should_profile(request)
+        if trigger is None:
+            return await call_next(request)
+        with request_profiler.profile(request, trigger) as meta:
+            response = await call_next(request)
+            meta["status_code"] = response.status_code
+        if meta.get("id"):
+            response.headers["X-Profile-Id"] = meta["id"]
+        return response
+
+if settings.DB_QUERY_STATS_HEADERS:
+    query_stats.install([engine, *replica_engines])
+
+    @app.middleware("http")
+    async def report_query_stats(request: Request, call_next):
+        """Expose the number and total time of SQL statements run for this request."""
+        with query_stats.track() as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+        return response
+
 # --- Routers ---
 # Include modular routers
 api_router_v1 = APIRouter() # Create a router for versioning
@@ -76,6 +236,26 @@ def generate_openapi_spec(output: str):
     print(f"OpenAPI spec generated and saved to {output}")
 
 
+# --- Health Endpoints ---
+@app.get("/health/live", tags=["Root"])
+async def liveness():
+    """
+    Liveness probe: the process is up and serving.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready", tags=["Root"])
+async def readiness():
+    """
+    Readiness probe: 200 only after warm-up finished and while not draining.
+    """
+    if not app_lifecycle.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "draining" if app_lifecycle.draining else "warming_up"},
+        )
+    return {"status": "ready", "in_flight": app_lifecycle.in_flight}
+
 # --- Root Endpoint ---
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -3,7 +3,8 @@ from .base import Base  # Import Base first
 from .common import Country, Language, FiatCurrency
 from .user import User
 from .exchange import (
-    Exchange, License, ExchangeSocialLink,
+    Exchange, License, ExchangeSocialLink, ExchangeClick, ExchangeSourceHash,
+    ExchangeSnapshot, ExchangeMetricRollup,
     exchange_languages_table, exchange_availability_table,
     exchange_fiat_support_table, news_item_exchanges_table
 )
@@ -18,6 +19,7 @@ from .guide import GuideItem
 from .static_page import StaticPage
 from .item import Item, ItemTypeEnum
 from .tag import Tag, item_tags_association
+from .invalidation import invalidation_version_seq
 
 # You can optionally define __all__ if needed
 __all__ = [
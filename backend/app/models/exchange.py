@@ -3,7 +3,7 @@ import enum
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, Numeric,
     ForeignKey, Enum as SQLAlchemyEnum, SmallInteger, Date, Table,
-    UniqueConstraint, Index, PrimaryKeyConstraint
+    UniqueConstraint, Index, PrimaryKeyConstraint, BigInteger
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -131,3 +131,56 @@ class ExchangeSocialLink(Base):
     exchange = relationship("Exchange", back_populates="social_links")
 
     __table_args__ = (UniqueConstraint('exchange_id', 'platform_name', name='uk_exchange_platform'),)
+
+class ExchangeClick(Base):
+    """One outbound click on /exchanges/go/{slug}; written in batches by the redirect service."""
+    __tablename__ = 'exchange_clicks'
+    id = Column(BigInteger, primary_key=True)
+    slug = Column(String(255), nullable=False)
+    clicked_at = Column(DateTime, nullable=False)
+    referrer_hash = Column(String(32), nullable=True)  # Digest of the Referer header, never the raw URL
+
+    __table_args__ = (Index('idx_exchange_clicks_slug_clicked_at', 'slug', 'clicked_at'), )
+
+class ExchangeSourceHash(Base):
+    """Digest of the mapped CoinGecko fields last written for an exchange; unchanged rows are skipped on ingestion."""
+    __tablename__ = 'exchange_source_hashes'
+    slug = Column(String(255), primary_key=True)  # CoinGecko exchange id, same as Item.slug
+    content_hash = Column(String(32), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class ExchangeSnapshot(Base):
+    """
+    Append-only point per exchange and ingestion run: 24h volume, fees and the BTC price used for the USD volume.
+    Rows arrive in time order, so a BRIN index on ts stays tiny; charts read ExchangeMetricRollup instead.
+    """
+    __tablename__ = 'exchange_snapshots'
+    id = Column(BigInteger, primary_key=True)
+    exchange_id = Column(Integer, ForeignKey('exchanges.id', ondelete='CASCADE'), nullable=False)
+    ts = Column(DateTime, nullable=False)
+    trading_volume_24h = Column(Numeric(20, 2), nullable=True)
+    spot_maker_fee = Column(Numeric(8, 5), nullable=True)
+    spot_taker_fee = Column(Numeric(8, 5), nullable=True)
+    futures_maker_fee = Column(Numeric(8, 5), nullable=True)
+    futures_taker_fee = Column(Numeric(8, 5), nullable=True)
+    btc_price_usd = Column(Numeric(20, 2), nullable=True)
+
+    __table_args__ = (
+        Index('idx_exchange_snapshots_ts_brin', 'ts', postgresql_using='brin'),
+        Index('idx_exchange_snapshots_exchange_ts', 'exchange_id', 'ts'),
+    )
+
+class ExchangeMetricRollup(Base):
+    """Per exchange, metric and resolution ('1h', '1d', '1w'): aggregates of the snapshots in one time bucket."""
+    __tablename__ = 'exchange_metric_rollups'
+    exchange_id = Column(Integer, ForeignKey('exchanges.id', ondelete='CASCADE'), nullable=False)
+    metric = Column(String(32), nullable=False)
+    resolution = Column(String(4), nullable=False)
+    bucket = Column(DateTime, nullable=False)  # Bucket start (UTC)
+    samples = Column(Integer, nullable=False)
+    value_sum = Column(Numeric(28, 5), nullable=False)
+    value_min = Column(Numeric(20, 5), nullable=False)
+    value_max = Column(Numeric(20, 5), nullable=False)
+    value_last = Column(Numeric(20, 5), nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint('exchange_id', 'metric', 'resolution', 'bucket'), )
@@ -0,0 +1,9 @@
+# app/models/invalidation.py
+from sqlalchemy import Sequence
+
+from .base import Base
+
+# Versions of the cache invalidation events. nextval() takes no row lock, so concurrent
+# writers don't serialize on it; the price is gaps (rolled-back writes burn their value)
+# and commit order not matching version order, which the listener tolerates.
+invalidation_version_seq = Sequence("cache_invalidation_version_seq", metadata=Base.metadata)
@@ -32,14 +32,14 @@ class User(Base):
         back_populates="user",
         foreign_keys="Review.user_id", # Explicitly define FK to avoid ambiguity
         cascade="all, delete-orphan", # Delete user's reviews if user is deleted
-        lazy="selectin" # Consider loading strategy based on usage
+        lazy="select" # Loaded only when accessed; selectin loaded every collection for every user fetched
     )
     guides = relationship(
         "GuideItem",
         back_populates="creator",
         foreign_keys="GuideItem.created_by_user_id", # Explicitly define FK
         cascade="all, delete-orphan", # Delete user's guides if user is deleted
-        lazy="selectin" # Consider loading strategy based on usage
+        lazy="select" # Loaded only when accessed; selectin loaded every collection for every user fetched
     )
     usefulness_votes = relationship(
         "ReviewUsefulnessVote",
@@ -52,7 +52,7 @@ class User(Base):
         "Review",
         back_populates="moderator",
         foreign_keys="Review.moderated_by_user_id", # Explicitly define FK for this relationship
-        lazy="selectin"
+        lazy="select"
     )
 
     # News items created by this user (if they are an admin/editor)
@@ -60,7 +60,7 @@ class User(Base):
         "NewsItem",
         back_populates="creator",
         foreign_keys="NewsItem.created_by_user_id", # Explicitly define FK
-        lazy="selectin"
+        lazy="select"
     )
 
     # Static pages last updated by this user (if they are an admin/editor)
@@ -68,7 +68,7 @@ class User(Base):
         "StaticPage",
         back_populates="last_updated_by",
         foreign_keys="StaticPage.last_updated_by_user_id", # Explicitly define FK
-        lazy="selectin"
+        lazy="select"
     )
 
     def __repr__(self):
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_async_db
+from app.core.database import get_read_db
 from app.news import schemas, service
 from app.schemas.common import PaginationParams, PaginatedResponse
 
@@ -14,7 +14,7 @@ router = APIRouter(
 
 @router.get("/", response_model=PaginatedResponse[schemas.NewsItemRead])
 async def list_news(
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     pagination: PaginationParams = Depends(),
 ):
     """
@@ -31,7 +31,7 @@ async def list_news(
 @router.get("/{news_id}", response_model=schemas.NewsItemRead)
 async def get_news_item(
     news_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get details of a specific news item.
@@ -1,11 +1,16 @@
 # app/reviews/router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query, Path, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 
-from app.core.database import get_async_db
-from app.reviews import schemas, service
+from app.core import fast_json, http_cache
+from app.core.config import settings
+from app.core.database import get_async_db, get_read_db, replica_router
+from app.core.fast_json import FastJSONResponse
+from app.core.rate_limit import rate_limit
+from app.core.response_cache import CachedResponse, response_cache, item_tag, reviews_tag
+from app.reviews import schemas, serializers, service
 from app.schemas.common import PaginationParams, PaginatedResponse, Message
 from app.dependencies import get_current_active_user, get_current_admin_user, get_optional_current_active_user  # Assuming get_optional_current_active_user exists
 from app.models.user import User
@@ -19,9 +24,47 @@ router = APIRouter(
 
 CurrentUser = User  # Alias for readability
 
+
+async def _cached_approved_reviews(
+    request: Request,
+    db: AsyncSession,
+    filters: schemas.ReviewFilterParams,
+    sort_by: schemas.ReviewSortBy,
+    pagination: PaginationParams,
+):
+    """Serve a page of approved reviews through the shared response cache."""
+    async def load_page() -> CachedResponse:
+        reviews, total = await service.review_service.list_reviews(
+            db=db, filters=filters, sort=sort_by, pagination=pagination
+        )
+        if settings.FAST_JSON_RESPONSES:
+            body = fast_json.dumps(serializers.review_page(reviews, total, pagination))
+        else:
+            page = PaginatedResponse[schemas.ReviewRead](
+                total=total,
+                items=[schemas.ReviewRead.model_validate(review) for review in reviews],
+                skip=pagination.skip,
+                limit=pagination.limit,
+            )
+            body = page.model_dump_json().encode()
+        tags = {reviews_tag(filters.item_id)}
+        for review in reviews:
+            tags.update((reviews_tag(review.item_id), item_tag(review.item_id)))
+        return CachedResponse(body, http_cache.weak_etag(body), tags)
+
+    key = response_cache.make_key(
+        "reviews:approved", filters=filters.model_dump(exclude_none=True), sort=sort_by.model_dump(),
+        skip=pagination.skip, limit=pagination.limit,
+    )
+    cached = await response_cache.get_or_load(key, load_page, bypass=await replica_router.is_request_pinned(request))
+    return http_cache.conditional_response(
+        request, cached.body, cached.etag, http_cache.catalog_cache_control(), compressed=cached.compressed
+    )
+
 @router.get("/", response_model=PaginatedResponse[schemas.ReviewRead])
 async def list_all_approved_reviews(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     item_id: Optional[int] = Query(None, description="Filter by item ID (e.g., exchange, wallet)"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     min_rating: Optional[int] = Query(None, ge=1, le=5, description="Minimum rating"),
@@ -43,20 +86,11 @@ async def list_all_approved_reviews(
         moderation_status=ModerationStatusEnum.approved
     )
 
-    reviews, total = await service.review_service.list_reviews(
-        db=db, filters=filters, sort=sort_by, pagination=pagination
-    )
-
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return await _cached_approved_reviews(request, db, filters, sort_by, pagination)
 
 @router.get("/me", response_model=PaginatedResponse[schemas.ReviewRead])
 async def list_my_reviews(
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_active_user),
     moderation_status: Optional[ModerationStatusEnum] = Query(None, description="Filter by moderation status"),
     item_id: Optional[int] = Query(None, description="Filter by item ID"),
@@ -77,6 +111,8 @@ async def list_my_reviews(
     reviews, total = await service.review_service.list_reviews(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(serializers.review_page(reviews, total, pagination))
 
     return PaginatedResponse(
         total=total,
@@ -88,7 +124,8 @@ async def list_my_reviews(
 @router.get("/item/{item_id}", response_model=PaginatedResponse[schemas.ReviewRead])
 async def list_reviews_for_item(
     item_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     min_rating: Optional[int] = Query(None, ge=1, le=5, description="Minimum rating"),
     max_rating: Optional[int] = Query(None, ge=1, le=5, description="Maximum rating"),
     has_screenshot: Optional[bool] = Query(None),
@@ -106,19 +143,13 @@ async def list_reviews_for_item(
         moderation_status=ModerationStatusEnum.approved
     )
 
-    reviews, total = await service.review_service.list_reviews(
-        db=db, filters=filters, sort=sort_by, pagination=pagination
-    )
-
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return await _cached_approved_reviews(request, db, filters, sort_by, pagination)
 
 
-@router.post("/item/{item_id}", response_model=schemas.ReviewRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/item/{item_id}", response_model=schemas.ReviewRead, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("review_create", settings.RATE_LIMIT_REVIEW_CREATE))],
+)
 async def create_review_for_item(
     item_id: int,
     review_in: ItemReviewCreate = Body(...),
@@ -232,6 +263,8 @@ async def get_all_reviews_admin(
     reviews, total = await service.review_service.list_reviews(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(serializers.review_page(reviews, total, pagination))
 
     return PaginatedResponse(
         total=total,
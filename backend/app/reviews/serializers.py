@@ -0,0 +1,65 @@
+# app/reviews/serializers.py
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence
+
+from pydantic import HttpUrl, TypeAdapter
+
+from app.core import fast_json
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.common import PaginationParams
+
+# Dict builders with the exact shape of schemas.ReviewRead (same keys, same order, same JSON values),
+# reading the loaded ORM objects directly instead of validating them with from_attributes.
+# Keep them in sync with the schemas; scripts/bench_serialization.py checks that both paths agree.
+
+_HTTP_URL = TypeAdapter(HttpUrl)
+
+
+@lru_cache(maxsize=4096)
+def _http_url(url: str) -> str:
+    return str(_HTTP_URL.validate_python(url)) # HttpUrl normalizes (lower-case host, trailing slash)
+
+
+def user_to_dict(user: Optional[User]) -> Optional[Dict[str, Any]]:
+    """auth.schemas.UserRead"""
+    if user is None:
+        return None
+    return {
+        "email": user.email,
+        "nickname": user.nickname,
+        "avatar_url": user.avatar_url,
+        "id": user.id,
+        "is_admin": user.is_admin,
+        "email_verified_at": user.email_verified_at,
+        "created_at": user.created_at,
+    }
+
+
+def review_to_dict(review: Review) -> Dict[str, Any]:
+    """schemas.ReviewRead"""
+    item = review.item
+    return {
+        "comment": review.comment,
+        "rating": float(review.rating),
+        "id": review.id,
+        "created_at": review.created_at,
+        "moderation_status": review.moderation_status,
+        "useful_votes_count": review.useful_votes_count,
+        "not_useful_votes_count": review.not_useful_votes_count,
+        "item_id": review.item_id,
+        "guest_name": review.guest_name,
+        "user": user_to_dict(review.user),
+        "item": None if item is None else {
+            "id": item.id, "name": item.name, "slug": item.slug, "logo_url": item.logo_url,
+        },
+        "screenshots": [
+            {"id": screenshot.id, "file_url": _http_url(screenshot.file_url), "uploaded_at": screenshot.uploaded_at}
+            for screenshot in review.screenshots
+        ],
+    }
+
+
+def review_page(reviews: Sequence[Review], total: int, pagination: PaginationParams) -> Dict[str, Any]:
+    """PaginatedResponse[schemas.ReviewRead]"""
+    return fast_json.page(total, [review_to_dict(review) for review in reviews], pagination)
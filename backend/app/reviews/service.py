@@ -1,7 +1,7 @@
 # app/reviews/service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, asc, and_, distinct, func, select, text
+from sqlalchemy import func, desc, asc, and_, select, text
 from sqlalchemy.orm import selectinload
 from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
@@ -12,6 +12,8 @@ from app.reviews.schemas import ReviewFilterParams, ReviewSortBy, ItemReviewCrea
 from app.schemas.common import PaginationParams
 from app.models.review import ModerationStatusEnum, Review, ReviewScreenshot, ReviewUsefulnessVote
 from app.models.item import Item # Import Item model
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import response_cache, item_tag, item_type_tag, reviews_tag
 
 # Get logger and configure it properly
 logger = logging.getLogger(__name__)
@@ -25,6 +27,17 @@ if not logger.handlers:
 
 class ReviewService:
 
+    async def invalidate_item_stats(self, item_id: int, item_type) -> None:
+        """Review stats are shown on, and sort, every list of the item's type."""
+        await response_cache.invalidate(item_type_tag(item_type), item_tag(item_id))
+
+    async def invalidate_review_lists(self, item_id: int, include_unfiltered: bool = False) -> None:
+        """Drop cached approved-review pages of an item (and the unfiltered pages when membership changed)."""
+        tags = [reviews_tag(item_id)]
+        if include_unfiltered:
+            tags.append(reviews_tag())
+        await response_cache.invalidate(*tags)
+
     async def _update_item_review_stats(self, db: AsyncSession, item_id: int):
         """
         Recalculates and updates the total_review_count and overall_average_rating
@@ -53,12 +66,19 @@ class ReviewService:
         # Fetch the item
         item = await db.get(Item, item_id)
         if item:
+            stats_changed = (
+                item.total_review_count != approved_count_with_comments
+                or item.total_rating_count != total_approved_count
+                or float(item.overall_average_rating or 0) != float(average_rating)
+            )
             logger.info(f"Updating item {item_id}: count_with_comments={approved_count_with_comments}, total_count={total_approved_count}, avg_rating={average_rating:.2f}")
             item.total_review_count = approved_count_with_comments
             item.total_rating_count = total_approved_count
             # Ensure rating is stored appropriately (e.g., as float or decimal)
             item.overall_average_rating = float(average_rating)
             db.add(item) # Add item to session to ensure update is tracked
+            if stats_changed:
+                await invalidation_bus.publish(db, "item_stats", item_id, item_type=item.item_type.value)
             
             # Add an explicit commit to persist the changes to the database
             try:
@@ -68,6 +88,8 @@ class ReviewService:
                 await db.rollback()
                 logger.error(f"Failed to commit item stats update: {e}", exc_info=True)
                 raise
+            if stats_changed:
+                await self.invalidate_item_stats(item_id, item.item_type)
         else:
             logger.warning(f"Item with id {item_id} not found while trying to update review stats.")
 
@@ -84,59 +106,43 @@ class ReviewService:
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
-    async def list_reviews(
-        self,
-        db: AsyncSession,
-        filters: ReviewFilterParams,
-        sort: ReviewSortBy,
-        pagination: PaginationParams,
-    ) -> Tuple[List[Review], int]:
-        """Lists reviews with filtering, sorting, and pagination."""
-
-        query = select(Review).options(
-            selectinload(Review.user),
-            selectinload(Review.item),
-            selectinload(Review.screenshots),
-        )
-
-        count_query = select(func.count(distinct(Review.id)))
-
+    def _apply_filters(self, query, filters: ReviewFilterParams):
+        """Apply the list filters to a query over reviews; shared by the page, count and export queries."""
         filter_conditions = []
-        # Apply filter only if moderation_status is not None
         if filters.moderation_status is not None:
             filter_conditions.append(Review.moderation_status == filters.moderation_status)
-            count_query = count_query.filter(Review.moderation_status == filters.moderation_status)
-
         if filters.item_id:
             filter_conditions.append(Review.item_id == filters.item_id)
-            count_query = count_query.filter(Review.item_id == filters.item_id)
         if filters.user_id:
             filter_conditions.append(Review.user_id == filters.user_id)
-            count_query = count_query.filter(Review.user_id == filters.user_id)
-
-        # Add rating filters
         if filters.min_rating is not None:
             filter_conditions.append(Review.rating >= filters.min_rating)
-            count_query = count_query.filter(Review.rating >= filters.min_rating)
         if filters.max_rating is not None:
             filter_conditions.append(Review.rating <= filters.max_rating)
-            count_query = count_query.filter(Review.rating <= filters.max_rating)
-
         if filters.has_screenshot is not None:
-            if filters.has_screenshot:
-                # Filter for reviews that HAVE screenshots
-                query = query.join(Review.screenshots) # Use join for existence check
-                count_query = count_query.join(Review.screenshots)
-            else:
-                # Filter for reviews that DO NOT HAVE screenshots
-                query = query.outerjoin(Review.screenshots).filter(ReviewScreenshot.id == None)
-                count_query = count_query.outerjoin(Review.screenshots).filter(ReviewScreenshot.id == None)
-
+            # EXISTS instead of a join, so a review with several screenshots stays one row
+            has_screenshot = select(ReviewScreenshot.id).where(ReviewScreenshot.review_id == Review.id).exists()
+            filter_conditions.append(has_screenshot if filters.has_screenshot else ~has_screenshot)
         if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
-            # Count query already has filters applied individually above
+            query = query.where(and_(*filter_conditions))
+        return query
+
+    async def list_reviews(
+        self,
+        db: AsyncSession,
+        filters: ReviewFilterParams,
+        sort: ReviewSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[Review], int]:
+        """Lists reviews with filtering, sorting, and pagination."""
 
-        query = query.distinct() # Keep distinct after joins
+        query = select(Review).options(
+            selectinload(Review.user),
+            selectinload(Review.item),
+            selectinload(Review.screenshots),
+        )
+        query = self._apply_filters(query, filters)
+        count_query = self._apply_filters(select(func.count(Review.id)), filters)
 
         total_result = await db.execute(count_query)
         total = total_result.scalar_one()
@@ -203,6 +209,8 @@ class ReviewService:
             moderation_status=review_in.moderation_status
         )
         db.add(db_review)
+        if review_in.moderation_status == ModerationStatusEnum.approved:
+            await invalidation_bus.publish(db, "review_list", review_in.item_id, include_unfiltered=True)
 
         try:
             await db.commit()
@@ -219,6 +227,8 @@ class ReviewService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve created review after commit")
         
         logger.info(f"Created review: {created_review.id} for item_id: {review_in.item_id}")
+        if created_review.moderation_status == ModerationStatusEnum.approved:
+            await self.invalidate_review_lists(review_in.item_id, include_unfiltered=True)
         
         try:
             logger.info(f"Attempting to update item review stats for item_id: {review_in.item_id}")
@@ -270,6 +280,8 @@ class ReviewService:
             )
 
             if should_update_stats:
+                # The review enters or leaves the approved lists
+                await invalidation_bus.publish(db, "review_list", item_id, include_unfiltered=True)
                 # Update item stats before committing
                 await self._update_item_review_stats(db, item_id)
 
@@ -282,6 +294,8 @@ class ReviewService:
                 await db.rollback()
                 logger.error(f"Failed to update review moderation details for review {review_id}: {e}", exc_info=True)
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update review moderation details.")
+            if should_update_stats:
+                await self.invalidate_review_lists(item_id, include_unfiltered=True)
 
             # Fetch the potentially updated review with relations after commit
             updated_review_with_relations = await self.get_review_by_id(db, db_review.id)
@@ -344,15 +358,23 @@ class ReviewService:
             change_occurred = True
 
         if change_occurred:
+            await invalidation_bus.publish(db, "review_list", db_review.item_id)
             try:
                 await db.commit()
             except Exception as e:
                 await db.rollback()
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to record vote.")
+            await self.invalidate_review_lists(db_review.item_id)
 
         updated_review = await self.get_review_by_id(db, review_id)
         if not updated_review:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve review after voting operation")
         return updated_review
 
-review_service = ReviewService()
\ No newline at end of file
+review_service = ReviewService()
+
+invalidation_bus.subscribe("item_stats", lambda item_id, data: review_service.invalidate_item_stats(item_id, data["item_type"]))
+invalidation_bus.subscribe(
+    "review_list",
+    lambda item_id, data: review_service.invalidate_review_lists(item_id, data.get("include_unfiltered", False)),
+)
\ No newline at end of file
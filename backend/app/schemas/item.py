@@ -52,3 +52,8 @@ class ItemReadBrief(ItemBase):
 # class ItemUpdate(ItemBase):
 #     pass
 
+
+# Schema for adding/removing links of one many-to-many relationship (ids of the related rows)
+class AssociationPatch(BaseModel):
+    add: List[int] = []
+    remove: List[int] = [] # Applied before `add`
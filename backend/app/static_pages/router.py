@@ -1,8 +1,9 @@
 # app/static_pages/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_db
+from app.core import http_cache
+from app.core.database import get_read_db
 from app.static_pages import schemas, service
 
 router = APIRouter(
@@ -16,20 +17,24 @@ KNOWN_SLUGS = ["about", "contacts", "terms", "privacy", "faq"]
 @router.get("/{slug}", response_model=schemas.StaticPageRead)
 async def get_static_page(
     slug: str,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get the content of a static page by its slug (e.g., 'about', 'faq').
+    Served pre-encoded (and precompressed) from memory, with ETag/Last-Modified.
     """
     if slug not in KNOWN_SLUGS: # Optional: only allow known slugs
         # pass # Or allow any slug if pages are dynamically created via admin
          raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
 
 
-    db_page = await service.static_page_service.get_page_by_slug(db=db, slug=slug)
-    if db_page is None:
+    page = await service.static_page_service.get_encoded_page(db=db, slug=slug)
+    if page is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page content not found")
-    return db_page
+    return http_cache.conditional_response(
+        request, page.body, page.etag, http_cache.catalog_cache_control(), page.updated_at, compressed=page.compressed
+    )
 
 
 # Add POST, PUT, DELETE under /admin for managing static pages
\ No newline at end of file
@@ -1,13 +1,48 @@
 # app/static_pages/service.py
+import hashlib
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional
+from typing import Dict, Optional
 
+from app.core import compression
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
 from app.models import static_page as static_page_models
 from app.static_pages import schemas
 
+class EncodedPage:
+    """A static page as served: JSON body, ETag and compressed variants, built once per page version."""
+
+    def __init__(self, page: static_page_models.StaticPage):
+        self.body = schemas.StaticPageRead.model_validate(page).model_dump_json().encode()
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=12).hexdigest()}"'
+        self.updated_at = page.updated_at
+        self.compressed = compression.precompress(self.body)
+        self.loaded_at = time.monotonic()
+
 class StaticPageService:
 
+    def __init__(self):
+        self._encoded: Dict[str, EncodedPage] = {}
+
+    async def get_encoded_page(self, db: AsyncSession, slug: str) -> Optional[EncodedPage]:
+        """
+        The page ready to send, from memory. Admin writes drop the cached pages on every worker;
+        REFERENCE_DATA_TTL_SECONDS bounds staleness after writes that bypass the service (init scripts).
+        """
+        encoded = self._encoded.get(slug)
+        if encoded is not None and time.monotonic() - encoded.loaded_at < settings.REFERENCE_DATA_TTL_SECONDS:
+            return encoded
+        page = await self.get_page_by_slug(db, slug)
+        if page is None:
+            return None
+        encoded = self._encoded[slug] = EncodedPage(page)
+        return encoded
+
+    async def invalidate_cached_pages(self) -> None:
+        self._encoded.clear()
+
     async def get_page_by_slug(self, db: AsyncSession, slug: str) -> Optional[static_page_models.StaticPage]:
         result = await db.execute(
             select(static_page_models.StaticPage).filter(static_page_models.StaticPage.slug == slug)
@@ -24,8 +59,11 @@ class StaticPageService:
             last_updated_by_user_id=user_id
         )
         db.add(db_page)
+        await db.flush()
+        await invalidation_bus.publish(db, "static_page", db_page.id)
         await db.commit()
         await db.refresh(db_page)
+        await self.invalidate_cached_pages()
         return db_page
 
     async def update_page(self, db: AsyncSession, db_page: static_page_models.StaticPage, page_in: schemas.StaticPageUpdate, user_id: Optional[int]) -> static_page_models.StaticPage:
@@ -45,9 +83,14 @@ class StaticPageService:
         db_page.last_updated_by_user_id = user_id
         # updated_at is handled by DB onupdate trigger
 
+        await invalidation_bus.publish(db, "static_page", db_page.id)
         await db.commit()
         await db.refresh(db_page)
+        await self.invalidate_cached_pages()
         return db_page
 
 
-static_page_service = StaticPageService()
\ No newline at end of file
+static_page_service = StaticPageService()
+
+invalidation_bus.subscribe("static_page", lambda page_id, data: static_page_service.invalidate_cached_pages())
+invalidation_bus.on_resync(static_page_service.invalidate_cached_pages)
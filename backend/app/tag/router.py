@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
 from app.schemas import tag as tag_schemas
 from app.schemas.common import Message, PaginationParams
 from app.tag import service as tag_service
+from app.common.reference_data import reference_data, reference_response
 
 router = APIRouter(
     prefix="/tags",
@@ -30,26 +31,36 @@ async def create_tag(
 
 @router.get("/", response_model=List[tag_schemas.TagRead])
 async def get_tags(
+    request: Request,
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve all tags with pagination.
     """
-    return await tag_service.tag_service.get_tags(db=db, pagination=pagination)
+    tags = await reference_data.get(db, "tags")
+    body = tags.page(pagination.skip, pagination.limit)
+    return reference_response(
+        request,
+        body,
+        f'"{tags.version}-{pagination.skip}-{pagination.limit}"',
+        tags.compressed if body is tags.body else None, # Other pages are compressed by the middleware
+    )
 
 @router.get("/{tag_id}", response_model=tag_schemas.TagRead)
 async def get_tag(
     tag_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific tag by its ID.
     """
-    db_tag = await tag_service.tag_service.get_tag_by_id(db=db, tag_id=tag_id)
-    if db_tag is None:
+    tags = await reference_data.get(db, "tags")
+    body = tags.encoded_by_id.get(tag_id)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found")
-    return db_tag
+    return reference_response(request, body, f'"{tags.version}-{tag_id}"')
 
 @router.put("/{tag_id}", response_model=tag_schemas.TagRead)
 async def update_tag(
@@ -5,6 +5,9 @@ from typing import List, Optional
 import logging
 
 from app.models import tag as tag_models
+from app.common.reference_data import reference_data
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import response_cache, tag_tag
 from app.schemas import tag as tag_schemas
 from app.schemas.common import PaginationParams
 
@@ -21,22 +24,26 @@ class TagService:
         result = await db.execute(select(tag_models.Tag).filter(tag_models.Tag.name == name))
         return result.scalars().first()
 
-    async def get_tags(self, db: AsyncSession, pagination: PaginationParams) -> List[tag_models.Tag]:
+    async def get_tags(self, db: AsyncSession, pagination: PaginationParams) -> List[tag_schemas.TagRead]:
         logger.debug(f"Retrieving tags with skip {pagination.skip}, limit {pagination.limit}")
-        result = await db.execute(
-            select(tag_models.Tag)
-            .offset(pagination.skip)
-            .limit(pagination.limit)
-            .order_by(tag_models.Tag.name)
-        )
-        return result.scalars().all()
+        tags = await reference_data.get(db, "tags")
+        return tags.items[pagination.skip:pagination.skip + pagination.limit]
+
+    async def invalidate_cached_tags(self, tag_id: Optional[int] = None) -> None:
+        """Drop every cached tag list after a tag write, and the cached responses embedding the tag."""
+        reference_data.invalidate("tags", "exchange_tags", "book_tags")
+        if tag_id is not None:
+            await response_cache.invalidate(tag_tag(tag_id))
 
     async def create_tag(self, db: AsyncSession, tag_create: tag_schemas.TagCreate) -> tag_models.Tag:
         logger.info(f"Creating new tag with name '{tag_create.name}'")
         db_tag = tag_models.Tag(name=tag_create.name, description=tag_create.description)
         db.add(db_tag)
+        await db.flush()
+        await invalidation_bus.publish(db, "tag", db_tag.id)
         await db.commit()
         await db.refresh(db_tag)
+        await self.invalidate_cached_tags()
         logger.info(f"Tag '{db_tag.name}' created with id {db_tag.id}")
         return db_tag
 
@@ -53,8 +60,10 @@ class TagService:
         for key, value in update_data.items():
             setattr(db_tag, key, value)
         
+        await invalidation_bus.publish(db, "tag", tag_id)
         await db.commit()
         await db.refresh(db_tag)
+        await self.invalidate_cached_tags(tag_id)
         logger.info(f"Tag with id {tag_id} updated successfully.")
         return db_tag
 
@@ -70,8 +79,13 @@ class TagService:
         # If there were other direct relationships on Tag that needed manual handling, do it here.
 
         await db.delete(db_tag)
+        await invalidation_bus.publish(db, "tag", tag_id)
         await db.commit()
+        await self.invalidate_cached_tags(tag_id)
         logger.info(f"Tag with id {tag_id} deleted successfully.")
         return db_tag
 
 tag_service = TagService()
+
+# Other workers drop their tag caches when a tag changes
+invalidation_bus.subscribe("tag", lambda tag_id, data: tag_service.invalidate_cached_tags(tag_id))
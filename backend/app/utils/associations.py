@@ -0,0 +1,60 @@
+# app/utils/associations.py
+from dataclasses import dataclass
+from typing import Iterable, List
+
+from sqlalchemy import Table, delete, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+
+def _unique(ids: Iterable[int]) -> List[int]:
+    return list(dict.fromkeys(ids))
+
+
+@dataclass(frozen=True)
+class Association:
+    """
+    A many-to-many link table, edited with set-based statements instead of through the ORM collection.
+
+    No related entities are loaded: a full replacement is one DELETE of the ids no longer wanted
+    plus one INSERT .. SELECT .. ON CONFLICT DO NOTHING of the new ones. Ids that don't exist in
+    the target table are ignored, as they were when the collection was rebuilt from a SELECT.
+    After editing, expire `attribute` on the owner so a later load doesn't return the stale collection.
+    """
+    table: Table
+    owner_column: str
+    target_column: str
+    attribute: str # Relationship on the owner model backed by this table
+
+    @property
+    def target_table(self) -> Table:
+        return next(iter(self.table.c[self.target_column].foreign_keys)).column.table
+
+    async def add(self, db: AsyncSession, owner_id: int, target_ids: Iterable[int]) -> None:
+        target_ids = _unique(target_ids)
+        if not target_ids:
+            return
+        target_id = self.target_table.c.id
+        existing_targets = select(literal(owner_id), target_id).where(target_id.in_(target_ids))
+        await db.execute(
+            insert(self.table)
+            .from_select([self.owner_column, self.target_column], existing_targets)
+            .on_conflict_do_nothing()
+        )
+
+    async def remove(self, db: AsyncSession, owner_id: int, target_ids: Iterable[int]) -> None:
+        target_ids = _unique(target_ids)
+        if not target_ids:
+            return
+        await db.execute(delete(self.table).where(
+            self.table.c[self.owner_column] == owner_id, self.table.c[self.target_column].in_(target_ids)
+        ))
+
+    async def replace(self, db: AsyncSession, owner_id: int, target_ids: Iterable[int]) -> None:
+        target_ids = _unique(target_ids)
+        stale = delete(self.table).where(self.table.c[self.owner_column] == owner_id)
+        if target_ids:
+            stale = stale.where(self.table.c[self.target_column].not_in(target_ids))
+        await db.execute(stale)
+        await self.add(db, owner_id, target_ids)
@@ -0,0 +1,327 @@
+"""
+Repeatable HTTP benchmark of the hot endpoints.
+
+Drives scripted scenarios against the API, one after another, with `--concurrency`
+async clients each, and reports per scenario: throughput, p50/p95/p99/max latency,
+status codes and SQL statements (count and DB time) per request. Results are written
+as JSON so a PR can be compared with a stored baseline.
+
+Scenarios:
+  catalog         exchange and book lists with random filters, sorting and pages
+  exchange_page   exchange detail pages
+  review_reads    approved reviews of an item (random sort/page/rating filter)
+  review_writes   authenticated review posts
+  voting          usefulness votes on approved reviews
+  login_burst     logins of the synthetic users
+  redirect_clicks /exchanges/go/{slug} (redirect not followed)
+
+Setup:
+    python -m app.cli init-db && python -m app.cli seed-synthetic --seed 42
+    python scripts/bench_http.py --boot --output bench.json                        # boot uvicorn and run
+    python scripts/bench_http.py --boot --output new.json --baseline bench.json    # compare, exit 1 on regression
+
+With --boot, the app is started with DB_QUERY_STATS_HEADERS=true (X-DB-Queries/X-DB-Time-Ms)
+and rate limiting disabled; against an already running server, set those yourself.
+Logins use the synthetic users' password, derived from --seed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Compared against the baseline; higher is worse for all but throughput
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Context:
+    """Ids and credentials discovered from the running API before the scenarios start."""
+
+    def __init__(self):
+        self.exchanges: List[Dict[str, Any]] = []
+        self.books: List[Dict[str, Any]] = []
+        self.review_ids: List[int] = []
+        self.user_emails: List[str] = []
+        self.password = ""
+        self.tokens: List[str] = []
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        return self.exchanges + self.books
+
+
+async def discover(client: httpx.AsyncClient, args) -> Context:
+    ctx = Context()
+    ctx.password = f"synthetic-{args.seed}"
+    for skip in range(0, args.discover_items, 100):
+        ctx.exchanges += (await client.get("/exchanges/", params={"skip": skip, "limit": 100})).json().get("items", [])
+        ctx.books += (await client.get("/books/", params={"skip": skip, "limit": 100})).json().get("items", [])
+    if not ctx.exchanges:
+        raise SystemExit("No exchanges found; seed the database first (python -m app.cli seed-synthetic).")
+
+    user_ids = set()
+    for item in ctx.items[:50]:
+        reviews = (await client.get(f"/reviews/item/{item['id']}", params={"limit": 100})).json().get("items", [])
+        for review in reviews:
+            ctx.review_ids.append(review["id"])
+            if review.get("user"):
+                user_ids.add(review["user"]["id"])
+    ctx.user_emails = [args.email_pattern.format(id=user_id) for user_id in sorted(user_ids)]
+
+    for email in ctx.user_emails[:args.logged_in_users]:
+        resp = await client.post("/auth/login", json={"email": email, "password": ctx.password})
+        if resp.status_code == 200:
+            ctx.tokens.append(resp.json()["access_token"])
+    return ctx
+
+
+# --- Scenarios: one request per call ---
+Scenario = Callable[[httpx.AsyncClient, Context, random.Random], Awaitable[httpx.Response]]
+
+async def catalog(client, ctx, rng):
+    if rng.random() < 0.6:
+        params = {"skip": rng.choice([0, 0, 0, 20, 40, 100]), "limit": 20,
+                  "field": rng.choice(["overall_average_rating", "trading_volume_24h", "total_review_count", "name"]),
+                  "direction": rng.choice(["asc", "desc"])}
+        if rng.random() < 0.3:
+            params["has_kyc"] = rng.choice(["true", "false"])
+        if rng.random() < 0.2:
+            params["name"] = rng.choice(["bit", "coin", "ex", "pro"])
+        return await client.get("/exchanges/", params=params)
+    params = {"skip": rng.choice([0, 0, 20, 40]), "limit": 20,
+              "field": rng.choice(["overall_average_rating", "year", "total_review_count"]), "direction": "desc"}
+    if rng.random() < 0.3:
+        params["min_year"] = rng.choice([2000, 2010, 2020])
+    return await client.get("/books/", params=params)
+
+async def exchange_page(client, ctx, rng):
+    return await client.get(f"/exchanges/details/{rng.choice(ctx.exchanges)['slug']}")
+
+async def review_reads(client, ctx, rng):
+    params = {"skip": rng.choice([0, 0, 10, 20]), "limit": 10, "field": rng.choice(["created_at", "usefulness", "rating"])}
+    if rng.random() < 0.2:
+        params["min_rating"] = 4
+    return await client.get(f"/reviews/item/{rng.choice(ctx.items)['id']}", params=params)
+
+async def review_writes(client, ctx, rng):
+    item = rng.choice(ctx.items)
+    return await client.post(
+        f"/reviews/item/{item['id']}",
+        json={"item_id": item["id"], "rating": rng.randint(1, 5), "comment": "Benchmark review, please ignore."},
+        headers={"Authorization": f"Bearer {rng.choice(ctx.tokens)}"},
+    )
+
+async def voting(client, ctx, rng):
+    return await client.post(
+        f"/reviews/{rng.choice(ctx.review_ids)}/vote",
+        json={"is_useful": rng.random() < 0.7},
+        headers={"Authorization": f"Bearer {rng.choice(ctx.tokens)}"},
+    )
+
+async def login_burst(client, ctx, rng):
+    return await client.post("/auth/login", json={"email": rng.choice(ctx.user_emails), "password": ctx.password})
+
+async def redirect_clicks(client, ctx, rng):
+    return await client.get(f"/exchanges/go/{rng.choice(ctx.exchanges)['slug']}", follow_redirects=False)
+
+SCENARIOS: Dict[str, Scenario] = {
+    "catalog": catalog,
+    "exchange_page": exchange_page,
+    "review_reads": review_reads,
+    "review_writes": review_writes,
+    "voting": voting,
+    "login_burst": login_burst,
+    "redirect_clicks": redirect_clicks,
+}
+NEEDS = {"review_writes": "tokens", "voting": "tokens", "login_burst": "user_emails"}
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, name: str, args) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    queries: List[int] = []
+    db_ms: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def worker(index: int, deadline: float, record: bool):
+        rng = random.Random(f"{args.seed}-{name}-{index}")
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                resp = await scenario(client, ctx, rng)
+            except httpx.HTTPError:
+                statuses[0] = statuses.get(0, 0) + 1 # Transport error
+                continue
+            if not record:
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+            if "x-db-queries" in resp.headers:
+                queries.append(int(resp.headers["x-db-queries"]))
+                db_ms.append(float(resp.headers["x-db-time-ms"]))
+
+    if args.warmup:
+        deadline = time.monotonic() + args.warmup
+        await asyncio.gather(*[worker(i, deadline, record=False) for i in range(args.concurrency)])
+    statuses.clear()
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(*[worker(i, deadline, record=True) for i in range(args.concurrency)])
+
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "db_queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "db_queries_max": max(queries) if queries else None,
+        "db_ms_per_request": round(sum(db_ms) / len(db_ms), 2) if db_ms else None,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions beyond `tolerance` (a fraction) against a previous run's JSON."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for key in LATENCY_KEYS:
+            if previous.get(key) and current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+        if previous.get("throughput_rps") and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {previous['throughput_rps']} -> {current['throughput_rps']}")
+        # Query counts are deterministic enough to compare without tolerance
+        before, after = previous.get("db_queries_per_request"), current.get("db_queries_per_request")
+        if before is not None and after is not None and after > before + 0.5:
+            regressions.append(f"{name}: db_queries_per_request {before} -> {after}")
+    return regressions
+
+
+def report(results: Dict[str, Any]) -> None:
+    print(f"{'scenario':<16}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'db ms':>8}  status codes")
+    for name, r in results["scenarios"].items():
+        if "skipped" in r:
+            print(f"{name:<16}  skipped: {r['skipped']}")
+            continue
+        queries = "-" if r["db_queries_per_request"] is None else r["db_queries_per_request"]
+        db_ms = "-" if r["db_ms_per_request"] is None else r["db_ms_per_request"]
+        print(f"{name:<16}{r['throughput_rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{queries:>9}{db_ms:>8}  {r['status_codes']}")
+
+
+def boot_server(args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DB_QUERY_STATS_HEADERS": "true",
+        "RATE_LIMIT_BACKEND": "none",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 60) -> None:
+    root = base_url.split("/api/")[0]
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{root}/health/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise SystemExit(f"Server at {root} did not become ready within {timeout:.0f}s.")
+
+
+async def run(args) -> Dict[str, Any]:
+    await wait_ready(args.base_url)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        ctx = await discover(client, args)
+        results = {
+            "meta": {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                "duration_s": args.duration, "concurrency": args.concurrency, "seed": args.seed,
+                "items": len(ctx.items), "logged_in_users": len(ctx.tokens),
+            },
+            "scenarios": {},
+        }
+        for name in args.scenarios:
+            missing = NEEDS.get(name)
+            if missing and not getattr(ctx, missing):
+                results["scenarios"][name] = {"skipped": f"no {missing.replace('_', ' ')} (synthetic users not found)"}
+                continue
+            print(f"Running {name}...", file=sys.stderr)
+            results["scenarios"][name] = await run_scenario(client, ctx, name, args)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="API root (default: the booted server, or http://localhost:8300/api/v1)")
+    parser.add_argument("--boot", action="store_true", help="Start uvicorn for the run")
+    parser.add_argument("--port", type=int, default=8399, help="Port of the booted server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers of the booted server")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset, run in this order")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic dataset (and of the request mix)")
+    parser.add_argument("--email-pattern", default="user{id}@synthetic.example.com")
+    parser.add_argument("--discover-items", type=int, default=500, help="Exchanges and books to pick from")
+    parser.add_argument("--logged-in-users", type=int, default=50, help="Users logged in up front for writes and votes")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results JSON of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.base_url is None:
+        args.base_url = f"http://127.0.0.1:{args.port}/api/v1" if args.boot else "http://localhost:8300/api/v1"
+
+    server: Optional[subprocess.Popen] = boot_server(args) if args.boot else None
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Catalog latency while logins are under load.
+
+Runs against a live server (scripts/run.sh) in two phases:
+  1. baseline: only catalog requests
+  2. loaded:   the same catalog requests while `--login-concurrency` clients log in back to back
+and prints p50/p95/p99 catalog latency for both, plus login throughput and 503s
+(hashing pool saturated).
+
+Example:
+    python scripts/bench_login_load.py --email bench@example.com --password secret123
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def catalog_client(client, path, deadline, latencies):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        resp = await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        resp.raise_for_status()
+
+
+async def login_client(client, email, password, deadline, counts):
+    while time.monotonic() < deadline:
+        resp = await client.post("/auth/login", json={"email": email, "password": password})
+        counts[resp.status_code] = counts.get(resp.status_code, 0) + 1
+
+
+async def run_phase(args, with_logins):
+    latencies, login_counts = [], {}
+    deadline = time.monotonic() + args.duration
+    limits = httpx.Limits(max_connections=args.catalog_concurrency + args.login_concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        tasks = [catalog_client(client, args.catalog_path, deadline, latencies) for _ in range(args.catalog_concurrency)]
+        if with_logins:
+            tasks += [login_client(client, args.email, args.password, deadline, login_counts) for _ in range(args.login_concurrency)]
+        await asyncio.gather(*tasks)
+    return latencies, login_counts
+
+
+def report(name, latencies, login_counts, duration):
+    print(
+        f"{name:>9}: {len(latencies)} catalog requests, "
+        f"p50={percentile(latencies, 50):.1f}ms p95={percentile(latencies, 95):.1f}ms "
+        f"p99={percentile(latencies, 99):.1f}ms mean={statistics.fmean(latencies) if latencies else float('nan'):.1f}ms"
+    )
+    if login_counts:
+        total = sum(login_counts.values())
+        print(f"{'':>9}  {total / duration:.1f} logins/s, status codes: {dict(sorted(login_counts.items()))}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8300/api/v1")
+    parser.add_argument("--catalog-path", default="/exchanges/?limit=20")
+    parser.add_argument("--email", required=True, help="An existing user (register it first)")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per phase")
+    parser.add_argument("--catalog-concurrency", type=int, default=8)
+    parser.add_argument("--login-concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    baseline, _ = await run_phase(args, with_logins=False)
+    report("baseline", baseline, {}, args.duration)
+    loaded, login_counts = await run_phase(args, with_logins=True)
+    report("loaded", loaded, login_counts, args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Serialization benchmark of the review and exchange list pages: the pydantic path
+(model_validate with from_attributes, then model_dump_json) against the fast path
+(dicts built from the ORM objects, encoded with orjson; FAST_JSON_RESPONSES=true).
+
+Pages are built from in-memory ORM objects shaped like the synthetic dataset, so no
+database is needed and only the CPU cost of turning loaded rows into a response body
+is measured. Both bodies are also decoded and compared, so the script doubles as the
+check that the serializers modules still match the schemas.
+
+    python scripts/bench_serialization.py                 # 100-item pages
+    python scripts/bench_serialization.py --page-size 20 --rounds 500
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.models # noqa: F401  Configures all mappers
+from app.core import fast_json
+from app.exchanges import schemas as exchange_schemas, serializers as exchange_serializers
+from app.models.common import Country
+from app.models.exchange import Exchange
+from app.models.review import ModerationStatusEnum, Review, ReviewScreenshot
+from app.models.tag import Tag
+from app.models.user import User
+from app.reviews import schemas as review_schemas, serializers as review_serializers
+from app.schemas.common import PaginatedResponse, PaginationParams
+
+
+def build_exchanges(rng: random.Random, count: int) -> List[Exchange]:
+    countries = [Country(id=i, name=f"Country {i}", code_iso_alpha2=f"C{i % 10}") for i in range(1, 21)]
+    tags = [Tag(id=i, name=f"tag-{i}", description=rng.choice([None, f"Tag {i}"])) for i in range(1, 31)]
+    created = datetime(2024, 1, 1)
+    exchanges = []
+    for i in range(1, count + 1):
+        exchanges.append(Exchange(
+            id=i, name=f"Exchange {i}", slug=f"exchange-{i}", logo_url=f"https://cdn.example.test/logos/{i}.png",
+            overall_average_rating=Decimal(f"{rng.uniform(1, 5):.2f}"),
+            total_review_count=rng.randint(0, 5000), total_rating_count=rng.randint(0, 5000),
+            trading_volume_24h=Decimal(f"{rng.uniform(0, 1e9):.2f}"), year_founded=rng.randint(2010, 2024),
+            registration_country=rng.choice(countries + [None]),
+            spot_maker_fee=Decimal(f"{rng.uniform(0, 0.01):.5f}"), futures_maker_fee=Decimal(f"{rng.uniform(0, 0.01):.5f}"),
+            spot_taker_fee=Decimal(f"{rng.uniform(0, 0.01):.5f}"), futures_taker_fee=None,
+            tags=rng.sample(tags, rng.randint(0, 6)), created_at=created,
+        ))
+    return exchanges
+
+
+def build_reviews(rng: random.Random, count: int, items: List[Exchange]) -> List[Review]:
+    users = [
+        User(
+            id=i, email=f"user{i}@synthetic.example.com", nickname=f"user{i:05d}", avatar_url=None, is_admin=False,
+            email_verified_at=rng.choice([None, datetime(2024, 2, 1, 12, 30)]), created_at=datetime(2024, 1, 1, 8, 0, 0, 123456),
+        )
+        for i in range(1, 51)
+    ]
+    reviews = []
+    for i in range(1, count + 1):
+        item = rng.choice(items)
+        user = rng.choice(users + [None])
+        created = datetime(2024, 3, 1) + timedelta(seconds=rng.randint(0, 10**7))
+        reviews.append(Review(
+            id=i, item=item, item_id=item.id, user=user, user_id=user.id if user else None,
+            guest_name=None if user else f"guest {i}", rating=rng.choice([1.0, 2.5, 3.0, 4.5, 5.0]),
+            comment=" ".join(rng.choice(("fast", "fees", "support", "kyc", "withdrawal", "ok")) for _ in range(rng.randint(3, 80))),
+            moderation_status=ModerationStatusEnum.approved, created_at=created,
+            useful_votes_count=rng.randint(0, 50), not_useful_votes_count=rng.randint(0, 10),
+            screenshots=[
+                ReviewScreenshot(id=i * 10 + n, file_url=f"https://Files.example.test/shots/{i}-{n}.png", uploaded_at=created)
+                for n in range(rng.choice((0, 0, 0, 1, 2)))
+            ],
+        ))
+    return reviews
+
+
+def time_it(fn: Callable[[], bytes], rounds: int) -> float:
+    fn() # Warm-up (pydantic serializer build, URL cache)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main(args) -> int:
+    rng = random.Random(args.seed)
+    pagination = PaginationParams(skip=0, limit=args.page_size)
+    exchanges = build_exchanges(rng, args.page_size)
+    reviews = build_reviews(rng, args.page_size, exchanges)
+
+    cases: Dict[str, Dict[str, Callable[[], bytes]]] = {
+        "reviews": {
+            "pydantic": lambda: PaginatedResponse[review_schemas.ReviewRead](
+                total=10_000, items=[review_schemas.ReviewRead.model_validate(r) for r in reviews],
+                skip=pagination.skip, limit=pagination.limit,
+            ).model_dump_json().encode(),
+            "fast": lambda: fast_json.dumps(review_serializers.review_page(reviews, 10_000, pagination)),
+        },
+        "exchanges": {
+            "pydantic": lambda: PaginatedResponse[exchange_schemas.ExchangeReadBrief](
+                total=10_000, items=[exchange_schemas.ExchangeReadBrief.model_validate(e) for e in exchanges],
+                skip=pagination.skip, limit=pagination.limit,
+            ).model_dump_json().encode(),
+            "fast": lambda: fast_json.dumps(exchange_serializers.exchange_brief_page(exchanges, 10_000, pagination)),
+        },
+    }
+
+    mismatches = 0
+    print(f"{'page':<10} {'items':>5} {'pydantic ms':>12} {'fast ms':>9} {'speedup':>8}  body bytes")
+    for name, paths in cases.items():
+        slow_body, fast_body = paths["pydantic"](), paths["fast"]()
+        if json.loads(slow_body) != json.loads(fast_body):
+            mismatches += 1
+            print(f"MISMATCH {name}: the fast path no longer matches the schema output")
+        slow_ms = time_it(paths["pydantic"], args.rounds)
+        fast_ms = time_it(paths["fast"], args.rounds)
+        print(f"{name:<10} {args.page_size:>5} {slow_ms:>12.3f} {fast_ms:>9.3f} {slow_ms / fast_ms:>7.1f}x  {len(fast_body)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200, help="Timed serializations per path")
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(main(parser.parse_args()))
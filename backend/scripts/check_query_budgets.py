@@ -0,0 +1,208 @@
+"""
+SQL statement budgets for the read endpoints of every router in app/main.py.
+
+Each endpoint is requested in-process (httpx ASGI transport, no server needed) with the
+statements it runs counted through the engine events (app/core/query_stats.py), and the
+check fails when an endpoint runs more statements than its budget. The response cache is
+disabled so the cold path is measured; reference data is warmed up first, as in production.
+
+Fixtures are picked for fan-out, so a per-row query shows up as a blown budget rather than
+a constant: the exchange with the most availability countries, the item with the most
+reviews, the user with the most reviews, the book with the most tags. Run it against a
+database seeded with `python -m app.cli seed-synthetic`; an endpoint whose fixture is
+missing fails the check. tests/test_query_budgets.py runs the same table (plus the write
+endpoints) against data it seeds itself.
+
+    python scripts/check_query_budgets.py            # exit 1 when a budget is exceeded
+    python scripts/check_query_budgets.py --verbose  # also print the statements of failing endpoints
+    python scripts/check_query_budgets.py --strict   # also fail on GET routes without a budget
+
+Budgets are upper bounds; when a change legitimately needs another query, raise the
+budget in the same PR so the reviewer sees it.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from sqlalchemy import text
+
+from app.auth.security import create_access_token
+from app.core import query_stats
+from app.core.config import settings
+from app.core.database import AsyncSessionFactory, engine, replica_engines
+from app.main import app
+
+
+@dataclass
+class Budget:
+    path: str # Relative to API_V1_STR; {placeholders} come from the fixtures
+    max_queries: int
+    auth: Optional[str] = None # "user" or "admin"
+    params: Optional[Dict[str, str]] = None
+
+
+BUDGETS: List[Budget] = [
+    # auth
+    Budget("/auth/profile", 1, auth="user"),
+    # exchanges
+    Budget("/exchanges/", 4, params={"limit": "100"}),
+    Budget("/exchanges/", 5, params={"limit": "100", "country_id": "{country_id}", "has_kyc": "true"}),
+    Budget("/exchanges/details/{exchange_slug}", 10),
+    Budget("/exchanges/{exchange_slug}/history", 2),
+    Budget("/exchanges/news/{exchange_id}", 3),
+    Budget("/exchanges/guides/{exchange_id}", 4),
+    Budget("/exchanges/tags", 1),
+    Budget("/exchanges/go/{exchange_slug}", 0), # Redirect targets are served from memory
+    # books
+    Budget("/books/", 3, params={"limit": "100"}),
+    Budget("/books/details/{book_slug}", 2),
+    Budget("/books/tags", 1),
+    # reviews
+    Budget("/reviews/", 5, params={"limit": "100"}),
+    Budget("/reviews/item/{item_id}", 5, params={"limit": "100"}),
+    Budget("/reviews/me", 6, auth="user", params={"limit": "100"}),
+    # news, guides
+    Budget("/news/", 3, params={"limit": "100"}),
+    Budget("/news/{news_id}", 2),
+    Budget("/guides/", 4, params={"limit": "100"}),
+    Budget("/guides/{guide_id}", 3),
+    # common, items, tags
+    Budget("/common/countries", 1),
+    Budget("/common/countries/{country_id}", 1),
+    Budget("/common/fiat_currencies", 1),
+    Budget("/common/fiat_currencies/{fiat_currency_id}", 1),
+    Budget("/items/{item_id}", 2),
+    Budget("/items/{item_id}/tags", 2),
+    Budget("/tags/", 1),
+    Budget("/tags/{tag_id}", 2),
+    # static pages
+    Budget("/{static_slug}", 0), # Encoded pages are served from memory
+    # admin
+    Budget("/admin/users", 2, auth="admin"),
+    Budget("/admin/reviews/", 6, auth="admin", params={"limit": "100"}),
+    Budget("/admin/reviews/pending", 6, auth="admin", params={"limit": "100"}),
+    Budget("/reviews/admin/reviews/", 6, auth="admin", params={"limit": "100"}),
+    Budget("/admin/exchanges/clicks/stats", 2, auth="admin"),
+    Budget("/admin/profiles", 1, auth="admin"),
+]
+
+# GET routes deliberately left without a budget
+UNBUDGETED = {
+    "/admin/export/exchanges": "streams a whole table",
+    "/admin/export/books": "streams a whole table",
+    "/admin/export/reviews": "streams a whole table",
+    "/admin/profiles/{profile_id}": "needs a stored profile; reads files only",
+}
+
+FIXTURE_QUERIES = {
+    "exchange_id": "SELECT exchange_id FROM exchange_availability GROUP BY exchange_id ORDER BY count(*) DESC LIMIT 1",
+    "exchange_slug": "SELECT slug FROM items WHERE id = :exchange_id",
+    "item_id": "SELECT item_id FROM reviews WHERE moderation_status = 'approved' GROUP BY item_id ORDER BY count(*) DESC LIMIT 1",
+    "book_slug": (
+        "SELECT i.slug FROM items i LEFT JOIN item_tags t ON t.item_id = i.id WHERE i.item_type = 'book' "
+        "GROUP BY i.id ORDER BY count(t.tag_id) DESC LIMIT 1"
+    ),
+    "user_id": "SELECT user_id FROM reviews WHERE user_id IS NOT NULL GROUP BY user_id ORDER BY count(*) DESC LIMIT 1",
+    "admin_id": "SELECT id FROM users WHERE is_admin ORDER BY id LIMIT 1",
+    "country_id": "SELECT country_id FROM exchange_availability GROUP BY country_id ORDER BY count(*) DESC LIMIT 1",
+    "fiat_currency_id": "SELECT id FROM fiat_currencies ORDER BY id LIMIT 1",
+    "news_id": "SELECT news_item_id FROM news_item_exchanges GROUP BY news_item_id ORDER BY count(*) DESC LIMIT 1",
+    "guide_id": "SELECT id FROM guide_items ORDER BY id LIMIT 1",
+    "tag_id": "SELECT tag_id FROM item_tags GROUP BY tag_id ORDER BY count(*) DESC LIMIT 1",
+    "static_slug": "SELECT slug FROM static_pages ORDER BY id LIMIT 1",
+}
+
+
+async def load_fixtures() -> Dict[str, object]:
+    fixtures: Dict[str, object] = {}
+    async with AsyncSessionFactory() as db:
+        for name, query in FIXTURE_QUERIES.items():
+            params = {key: fixtures.get(key) for key in ("exchange_id",) if f":{key}" in query}
+            fixtures[name] = (await db.execute(text(query), params)).scalar()
+    return fixtures
+
+
+def resolve(value: str, fixtures: Dict[str, object]) -> str:
+    return value.format(**fixtures)
+
+
+async def measure(client: httpx.AsyncClient, budget: Budget, fixtures: Dict[str, object], tokens: Dict[str, str]):
+    placeholders = [name for name in fixtures if f"{{{name}}}" in budget.path or any(f"{{{name}}}" in v for v in (budget.params or {}).values())]
+    if any(fixtures[name] is None for name in placeholders):
+        return None, "missing fixture: " + ", ".join(name for name in placeholders if fixtures[name] is None)
+    if budget.auth and budget.auth not in tokens:
+        return None, f"no {budget.auth} user"
+
+    url = settings.API_V1_STR + resolve(budget.path, fixtures)
+    params = {key: resolve(value, fixtures) for key, value in (budget.params or {}).items()}
+    headers = {"Authorization": f"Bearer {tokens[budget.auth]}"} if budget.auth else {}
+
+    await client.get(url, params=params, headers=headers) # Warm-up: reference data, token cache, statement cache
+    with query_stats.track(collect_statements=True) as stats:
+        resp = await client.get(url, params=params, headers=headers)
+    return stats, resp
+
+
+def uncovered_routes() -> List[str]:
+    covered = {f"{settings.API_V1_STR}{budget.path}" for budget in BUDGETS}
+    routes = []
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if "GET" not in getattr(route, "methods", ()) or not path.startswith(settings.API_V1_STR) or "openapi" in path:
+            continue
+        # Compare by shape: placeholder names differ between routes and budgets
+        shape = lambda p: "/".join("{}" if part.startswith("{") else part for part in p.split("/"))
+        if shape(path) not in {shape(c) for c in covered} and path[len(settings.API_V1_STR):] not in UNBUDGETED:
+            routes.append(path)
+    return routes
+
+
+async def main(args) -> int:
+    query_stats.install([engine, *replica_engines])
+    fixtures = await load_fixtures()
+    tokens = {}
+    if fixtures["user_id"] is not None:
+        tokens["user"] = create_access_token(subject=fixtures["user_id"])
+    if fixtures["admin_id"] is not None:
+        tokens["admin"] = create_access_token(subject=fixtures["admin_id"])
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget.check") as client:
+        for budget in BUDGETS:
+            label = budget.path + (f"?{'&'.join(f'{k}={v}' for k, v in budget.params.items())}" if budget.params else "")
+            stats, resp = await measure(client, budget, fixtures, tokens)
+            if stats is None: # An unmeasured endpoint is a failure, not a pass
+                failures += 1
+                print(f"FAIL  {label:<70} {resp}")
+                continue
+            ok = resp.status_code < 400 and stats.count <= budget.max_queries
+            failures += not ok
+            status = "ok" if ok else ("FAIL" if resp.status_code < 400 else f"HTTP {resp.status_code}")
+            print(f"{status:<5} {label:<70} {stats.count:>3} / {budget.max_queries:<3} queries")
+            if not ok and args.verbose:
+                for statement in stats.statements:
+                    print(f"        {' '.join(statement.split())[:200]}")
+
+    missing = uncovered_routes()
+    for path in missing:
+        print(f"NOTE  GET {path} has no query budget")
+    if args.strict:
+        failures += len(missing)
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="Print the statements of failing endpoints")
+    parser.add_argument("--strict", action="store_true", help="Fail on GET routes without a budget")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,349 @@
+"""
+Synthetic, production-sized dataset for load testing.
+
+Everything is generated deterministically from --seed and bulk-loaded with COPY (CSV over
+asyncpg), one table at a time, in batches generated on the fly, so memory stays flat apart
+from a few compact per-review arrays. New rows get ids after the current maximum of every
+table, so the seeder can run on top of existing data (countries, languages and fiat
+currencies are reused, not generated); sequences are moved past the new ids at the end.
+
+Shapes:
+- reviews per item and activity per user are Zipfian (a few items/users get most of them);
+- ratings skew positive, ~85% of reviews are approved, ~10% pending, ~5% rejected,
+  ~10% are by guests and ~30% have no comment; ~5% have 1-3 screenshots;
+- usefulness votes go to approved reviews only, skewed towards a minority of reviews,
+  and the reviews' vote counters match the votes;
+- items get 0-5 tags, exchanges get availability countries, languages and fiat currencies,
+  news items link to 1-3 exchanges; item rating aggregates are recomputed at the end.
+"""
+import csv
+import io
+import logging
+import math
+import random
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.auth.security import get_password_hash
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+COPY_BATCH_ROWS = 20000
+ZIPF_EXPONENT = 1.1
+SPAN_DAYS = 3 * 365 # Reviews, votes and news are spread over this many days before "now"
+NOW = datetime(2025, 1, 1) # Fixed so that a seed always produces the same rows
+
+RATINGS = (1, 2, 3, 4, 5, 4.5, 3.5)
+RATING_WEIGHTS = (8, 4, 9, 25, 40, 9, 5)
+STATUSES = ("approved", "pending", "rejected")
+STATUS_WEIGHTS = (85, 10, 5)
+GUEST_SHARE = 0.10
+NO_COMMENT_SHARE = 0.30
+USEFUL_SHARE = 7 # Out of 10 votes
+
+NAME_PARTS = ("Bit", "Coin", "Block", "Chain", "Crypto", "Hash", "Ledger", "Satoshi", "Token", "Byte", "Nova", "Prime", "Apex", "Quant", "Zen")
+NAME_SUFFIXES = ("ex", "trade", "market", "hub", "dex", "flow", "pro", "x", "one", "base")
+TOPICS = ("Trading", "DeFi", "Security", "Staking", "Futures", "Beginners", "Analysis", "Mining", "History", "Regulation", "NFT", "Wallets")
+PHRASES = (
+    "Fast withdrawals and a clean interface.", "Support took three days to answer.", "Fees are lower than most competitors.",
+    "KYC was quick and painless.", "The mobile app crashes now and then.", "Great liquidity on major pairs.",
+    "Deposits took longer than promised.", "Solid choice for beginners.", "Charts and order types are excellent.",
+    "I would not keep large amounts here.", "A clear, well structured read.", "Too basic for experienced traders.",
+)
+
+
+def _dsn() -> str:
+    # asyncpg wants a plain postgresql:// URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _scramble(n: int) -> int:
+    """Deterministic pseudo-random 32-bit value for index n (Knuth's multiplicative hash)."""
+    return (n * 2654435761) & 0xFFFFFFFF
+
+
+def _timestamp(n: int, salt: int = 0) -> datetime:
+    return NOW - timedelta(seconds=_scramble(n + salt) % (SPAN_DAYS * 86400))
+
+
+class _Zipf:
+    """Samples indexes 0..n-1 with Zipfian weights over a seeded random ranking (rank 0 is the most popular)."""
+
+    def __init__(self, rng: random.Random, n: int, exponent: float = ZIPF_EXPONENT):
+        self.ranked = list(range(n))
+        rng.shuffle(self.ranked)
+        cum_weights, total = [], 0.0
+        for rank in range(n):
+            total += 1.0 / (rank + 1) ** exponent
+            cum_weights.append(total)
+        self.cum_weights = cum_weights
+        self._population = range(n)
+
+    def sample(self, rng: random.Random, k: int) -> List[int]:
+        ranks = rng.choices(self._population, cum_weights=self.cum_weights, k=k)
+        return [self.ranked[rank] for rank in ranks]
+
+
+async def _csv_batches(rows: Iterable[Sequence]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for row in rows:
+        writer.writerow(row) # None is written as an unquoted empty field, i.e. NULL
+        pending += 1
+        if pending >= COPY_BATCH_ROWS:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+async def _copy(conn: asyncpg.Connection, table: str, columns: Tuple[str, ...], rows: Iterable[Sequence]) -> None:
+    started = datetime.now()
+    status = await conn.copy_to_table(table, source=_csv_batches(rows), columns=columns, format="csv")
+    logger.info(f"{table}: {status} in {(datetime.now() - started).total_seconds():.1f}s")
+
+
+async def _next_id(conn: asyncpg.Connection, table: str) -> int:
+    return (await conn.fetchval(f"SELECT coalesce(max(id), 0) FROM {table}")) + 1
+
+
+def _useful_votes(review: int, votes: int) -> int:
+    """Vote k of a review is useful when (3 * review + k) % 10 < USEFUL_SHARE; counts them without iterating."""
+    base = (3 * review) % 10
+    full, rest = divmod(votes, 10)
+    return full * USEFUL_SHARE + sum(1 for k in range(rest) if (base + k) % 10 < USEFUL_SHARE)
+
+
+def _coprime_stride(n: int) -> int:
+    stride = max(1, int(n * 0.618))
+    while math.gcd(stride, n) != 1:
+        stride += 1
+    return stride
+
+
+async def seed_synthetic(
+    exchanges: int,
+    books: int,
+    users: int,
+    reviews: int,
+    votes: int,
+    tags: int = 200,
+    news: int = 2000,
+    seed: int = 42,
+) -> None:
+    rng = random.Random(seed)
+    conn = await asyncpg.connect(_dsn())
+    try:
+        await conn.execute("SET synchronous_commit = off")
+        country_ids = [row["id"] for row in await conn.fetch("SELECT id FROM countries ORDER BY id")]
+        language_ids = [row["id"] for row in await conn.fetch("SELECT id FROM languages ORDER BY id")]
+        fiat_ids = [row["id"] for row in await conn.fetch("SELECT id FROM fiat_currencies ORDER BY id")]
+
+        item_base = await _next_id(conn, "items")
+        tag_base = await _next_id(conn, "tags")
+        user_base = await _next_id(conn, "users")
+        news_base = await _next_id(conn, "news_items")
+        review_base = await _next_id(conn, "reviews")
+        screenshot_base = await _next_id(conn, "review_screenshots")
+        vote_base = await _next_id(conn, "review_usefulness_votes")
+        items = exchanges + books
+        users = max(users, 1)
+
+        # --- Items ---
+        def item_rows():
+            for n in range(items):
+                item_id = item_base + n
+                kind = "exchange" if n < exchanges else "book"
+                name = f"{NAME_PARTS[n % len(NAME_PARTS)]}{NAME_SUFFIXES[(n // len(NAME_PARTS)) % len(NAME_SUFFIXES)]} {item_id}"
+                created_at = _timestamp(n, salt=1)
+                yield (
+                    item_id, kind, name, f"syn-{kind}-{item_id}", f"Overview of {name}.", f"{name} is a synthetic {kind}.",
+                    f"https://cdn.example.test/logos/{item_id}.png", f"https://{kind}{item_id}.example.test",
+                    0, 0, 0, created_at, created_at,
+                )
+        await _copy(conn, "items", (
+            "id", "item_type", "name", "slug", "overview", "description", "logo_url", "website_url",
+            "overall_average_rating", "total_review_count", "total_rating_count", "created_at", "updated_at",
+        ), item_rows())
+
+        def exchange_rows():
+            for n in range(exchanges):
+                volume = round(math.exp(rng.gauss(16, 2.5)), 2) # Lognormal: a long tail of small exchanges
+                maker = round(rng.uniform(0, 0.002), 5)
+                yield (
+                    item_base + n, rng.randint(2010, 2024),
+                    rng.choice(country_ids) if country_ids else None, rng.choice(country_ids) if country_ids else None,
+                    *(rng.random() < share for share in (0.8, 0.4, 0.3, 0.6, 0.5, 0.95, 0.3)),
+                    volume, maker, round(maker + rng.uniform(0, 0.001), 5),
+                    round(maker * 0.5, 5), round(maker * 0.5 + rng.uniform(0, 0.0005), 5),
+                    round(rng.uniform(0, 100), 2), round(rng.uniform(0, 9.99), 2),
+                )
+        await _copy(conn, "exchanges", (
+            "id", "year_founded", "registration_country_id", "headquarters_country_id",
+            "has_kyc", "has_p2p", "has_copy_trading", "has_staking", "has_futures", "has_spot_trading", "has_demo_trading",
+            "trading_volume_24h", "spot_maker_fee", "spot_taker_fee", "futures_maker_fee", "futures_taker_fee",
+            "liquidity_score", "newbie_friendliness_score",
+        ), exchange_rows())
+
+        def book_rows():
+            for n in range(books):
+                yield (
+                    item_base + exchanges + n, rng.randint(1990, 2024), f"Author {rng.randint(1, max(1, books // 3))}",
+                    f"Publisher {rng.randint(1, 200)}", rng.randint(80, 900), f"978{rng.randrange(10**9, 10**10)}",
+                )
+        await _copy(conn, "books", ("id", "year", "author", "publisher", "pages", "number"), book_rows())
+
+        # --- Tags and item links ---
+        await _copy(conn, "tags", ("id", "name", "description"), (
+            (tag_base + n, f"{TOPICS[n % len(TOPICS)]} {tag_base + n}", None) for n in range(tags)
+        ))
+        if tags:
+            tag_zipf = _Zipf(rng, tags)
+            def item_tag_rows():
+                for n in range(items):
+                    for tag in sorted(set(tag_zipf.sample(rng, rng.randint(0, 5)))):
+                        yield item_base + n, tag_base + tag
+            await _copy(conn, "item_tags", ("item_id", "tag_id"), item_tag_rows())
+
+        def links(reference_ids: List[int], max_links: int):
+            for n in range(exchanges):
+                for reference_id in rng.sample(reference_ids, rng.randint(0, min(max_links, len(reference_ids)))):
+                    yield item_base + n, reference_id
+        await _copy(conn, "exchange_availability", ("exchange_id", "country_id"), links(country_ids, 150))
+        await _copy(conn, "exchange_languages", ("exchange_id", "language_id"), links(language_ids, 12))
+        await _copy(conn, "exchange_fiat_support", ("exchange_id", "fiat_currency_id"), links(fiat_ids, 10))
+
+        # --- Users ---
+        password_hash = get_password_hash(f"synthetic-{seed}") # One bcrypt hash for everyone; hashing 200k would take hours
+        def user_rows():
+            for n in range(users):
+                user_id = user_base + n
+                created_at = _timestamp(n, salt=2).replace(tzinfo=timezone.utc)
+                verified_at = created_at.replace(tzinfo=None) if n % 5 else None
+                yield user_id, f"user{user_id}@synthetic.example.com", password_hash, f"user{user_id}", verified_at, False, created_at, created_at
+        await _copy(conn, "users", (
+            "id", "email", "password_hash", "nickname", "email_verified_at", "is_admin", "created_at", "updated_at",
+        ), user_rows())
+
+        # --- News ---
+        if exchanges:
+            exchange_zipf = _Zipf(rng, exchanges)
+            await _copy(conn, "news_items", (
+                "id", "title", "content", "source_name", "source_url", "published_at", "created_at", "updated_at",
+            ), (
+                (news_base + n, f"{TOPICS[n % len(TOPICS)]} update #{news_base + n}", rng.choice(PHRASES), "Synthetic Wire",
+                 f"https://news.example.test/{news_base + n}", _timestamp(n, salt=3), _timestamp(n, salt=3), _timestamp(n, salt=3))
+                for n in range(news)
+            ))
+            def news_link_rows():
+                for n in range(news):
+                    for exchange in sorted(set(exchange_zipf.sample(rng, rng.randint(1, 3)))):
+                        yield news_base + n, item_base + exchange
+            await _copy(conn, "news_item_exchanges", ("news_item_id", "exchange_id"), news_link_rows())
+
+        if not items or not reviews:
+            return
+
+        # --- Review plan: item, author and status per review, then vote counts ---
+        item_zipf, user_zipf = _Zipf(rng, items), _Zipf(rng, users)
+        review_items, review_users, review_status = array("I"), array("i"), bytearray()
+        for start in range(0, reviews, COPY_BATCH_ROWS):
+            k = min(COPY_BATCH_ROWS, reviews - start)
+            review_items.extend(item_zipf.sample(rng, k))
+            review_users.extend(-1 if rng.random() < GUEST_SHARE else user for user in user_zipf.sample(rng, k))
+            review_status.extend(rng.choices(range(len(STATUSES)), weights=STATUS_WEIGHTS, k=k))
+
+        vote_counts = array("I", bytes(4 * reviews))
+        votes = min(votes, review_status.count(0) * users) # Each voter votes once per approved review
+        if votes:
+            placed = 0
+            while placed < votes:
+                review = int(reviews * rng.random() ** 3) # Skewed: a minority of reviews collects most votes
+                if review_status[review] == 0 and vote_counts[review] < users:
+                    vote_counts[review] += 1
+                    placed += 1
+
+        # --- Reviews ---
+        text_rng = random.Random(seed + 1)
+        def review_rows():
+            for r in range(reviews):
+                user = review_users[r]
+                status = STATUSES[review_status[r]]
+                comment = None
+                if text_rng.random() >= NO_COMMENT_SHARE:
+                    comment = " ".join(text_rng.sample(PHRASES, text_rng.randint(1, 4)))
+                rating = text_rng.choices(RATINGS, weights=RATING_WEIGHTS)[0]
+                created_at = _timestamp(r, salt=4)
+                useful = _useful_votes(r, vote_counts[r])
+                yield (
+                    review_base + r, user_base + user if user >= 0 else None, f"Guest {r}" if user < 0 else None,
+                    item_base + review_items[r], comment, rating, status,
+                    created_at + timedelta(hours=6) if status != "pending" else None,
+                    useful, vote_counts[r] - useful, created_at, created_at,
+                )
+        await _copy(conn, "reviews", (
+            "id", "user_id", "guest_name", "item_id", "comment", "rating", "moderation_status", "moderated_at",
+            "useful_votes_count", "not_useful_votes_count", "created_at", "updated_at",
+        ), review_rows())
+
+        def screenshot_rows():
+            screenshot_id = screenshot_base
+            for r in range(reviews):
+                if (_scramble(r) >> 8) % 20: # ~5% of reviews
+                    continue
+                for n in range(1 + r % 3):
+                    yield (
+                        screenshot_id, review_base + r, f"https://cdn.example.test/screenshots/{review_base + r}-{n}.png",
+                        50000 + _scramble(r + n) % 2000000, "image/png", _timestamp(r, salt=4) + timedelta(minutes=1),
+                    )
+                    screenshot_id += 1
+        await _copy(conn, "review_screenshots", (
+            "id", "review_id", "file_url", "file_size_bytes", "mime_type", "uploaded_at",
+        ), screenshot_rows())
+
+        # --- Votes: review r gets distinct voters (start + k * stride) mod users, k < its vote count ---
+        stride = _coprime_stride(users)
+        def vote_rows():
+            vote_id = vote_base
+            for r in range(reviews):
+                count = vote_counts[r]
+                if not count:
+                    continue
+                start, base, created_at = _scramble(r) % users, (3 * r) % 10, _timestamp(r, salt=4)
+                for k in range(count):
+                    yield (
+                        vote_id, review_base + r, user_base + (start + k * stride) % users,
+                        (base + k) % 10 < USEFUL_SHARE, created_at + timedelta(hours=k + 1),
+                    )
+                    vote_id += 1
+        await _copy(conn, "review_usefulness_votes", ("id", "review_id", "user_id", "is_useful", "voted_at"), vote_rows())
+
+        # --- Aggregates, sequences, statistics ---
+        await conn.execute("""
+            UPDATE items SET
+                total_review_count = stats.with_comments,
+                total_rating_count = stats.approved,
+                overall_average_rating = round(stats.average::numeric, 2)
+            FROM (
+                SELECT item_id, count(*) FILTER (WHERE comment IS NOT NULL) AS with_comments,
+                       count(*) AS approved, avg(rating) AS average
+                FROM reviews WHERE moderation_status = 'approved' AND item_id >= $1
+                GROUP BY item_id
+            ) AS stats
+            WHERE items.id = stats.item_id
+        """, item_base)
+        for table in ("items", "tags", "users", "news_items", "reviews", "review_screenshots", "review_usefulness_votes"):
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 1) FROM {table}))"
+            )
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
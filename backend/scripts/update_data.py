@@ -1,9 +1,22 @@
-import asyncio
-import requests
+"""
+Refresh exchanges from the CoinGecko /exchanges API.
+
+Pages are fetched concurrently (bounded, with retries), validated and mapped,
+then upserted in chunks with INSERT ... ON CONFLICT (slug) DO UPDATE.
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+Offline runs:
+    python update_data.py --record fixtures/   # fetch and save page_<n>.json files
+    python update_data.py --fixtures fixtures/ # replay them, no network
+    python update_data.py --base-url http://localhost:8080/api/v3 # local stub server
+
+Exchanges that dropped out of the listing are only detected with --all-pages
+(or when the listing ends before --end-page).
+"""
+import argparse
+import asyncio
+import logging
+from decimal import Decimal
+from pathlib import Path
 
 import sys
 import os
@@ -11,66 +24,42 @@ import os
 # Ensure app modules are importable
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.config import settings
 from app.core.database import AsyncSessionFactory, init_db
-from app.models.exchange import Exchange
-from app.models.common import Country
-
-COINGECKO_URL = "https://api.coingecko.com/api/v3/exchanges"
-HEADERS = {"accept": "application/json", "x-cg-api-key": "CG-FG5pGMB4HyncXHpq8YzvJ4Eg"}
-
-def fetch_exchanges_all_pages(start_page=1, end_page=5):
-    all_exchanges = []
-    for page in range(start_page, end_page + 1):
-        params = {
-            "per_page": 100,  # Max per page
-            "page": page,
-        }
-        resp = requests.get(COINGECKO_URL, headers=HEADERS, params=params)
-        resp.raise_for_status()
-        exchanges = resp.json()
-        if not exchanges:
-            break
-        all_exchanges.extend(exchanges)
-    return all_exchanges
-
-def map_api_to_exchange(api_data):
-    return {
-        "name": api_data.get("name"),
-        "slug": api_data.get("id"),
-        "description": api_data.get("description"),
-        "logo_url": api_data.get("image"),
-        "website_url": api_data.get("url"),
-        "trading_volume_24h": api_data.get("trade_volume_24h_btc")*107500
-    }
+from app.ingestion.coingecko import PER_PAGE, CoinGeckoClient
+from app.ingestion.exchanges import ingest_exchanges
 
-async def upsert_exchange(session, data):
-    # Try to find by slug
-    stmt = select(Exchange).where(Exchange.slug == data["slug"])
-    result = await session.execute(stmt)
-    exchange = result.scalar_one_or_none()
-    if exchange:
-        for k, v in data.items():
-            setattr(exchange, k, v)
-        # Update the updated_at timestamp
-        exchange.updated_at = func.now()
-    else:
-        exchange = Exchange(**data)
-        session.add(exchange)
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start-page", type=int, default=1)
+    parser.add_argument("--end-page", type=int, default=5)
+    parser.add_argument("--all-pages", action="store_true", help="Fetch through the end of the listing (ignores --end-page)")
+    parser.add_argument("--base-url", default=settings.COINGECKO_BASE_URL)
+    parser.add_argument("--fixtures", type=Path, help="Read page_<n>.json files from this directory instead of the API")
+    parser.add_argument("--record", type=Path, help="Save the fetched pages as page_<n>.json files in this directory")
+    return parser.parse_args()
 
 async def main():
+    args = parse_args()
     await init_db()
-    # Check if exchanges.json already exists
-    exchanges = fetch_exchanges_all_pages(1, 5)
-    print(f"Fetched {len(exchanges)} exchanges from CoinGecko API.")
-    async with AsyncSessionFactory() as session:
-        for api_ex in exchanges:
-            ex_data = map_api_to_exchange(api_ex)
-            try:
-                await upsert_exchange(session, ex_data)
-            except IntegrityError as e:
-                print(f"Integrity error for {ex_data['slug']}: {e}")
-        await session.commit()
-    print("Ingestion complete.")
+    client = CoinGeckoClient(base_url=args.base_url, fixtures_dir=args.fixtures, record_dir=args.record)
+    exchanges, btc_price = await asyncio.gather(
+        client.fetch_exchanges(args.start_page, None if args.all_pages else args.end_page), client.fetch_btc_price_usd()
+    )
+    print(f"Fetched {len(exchanges)} exchanges from CoinGecko API (BTC price: {btc_price}).")
+    # Exchanges missing from the full listing dropped out of it; with a page window, an exchange
+    # near its edge would flip between removed and re-inserted as the ranking moves
+    full_listing = args.all_pages or len(exchanges) < (args.end_page - args.start_page + 1) * PER_PAGE
+    result = await ingest_exchanges(
+        AsyncSessionFactory, exchanges, track_removed=args.start_page == 1 and full_listing,
+        btc_price_usd=Decimal(str(btc_price)) if btc_price else None,
+    )
+    print(
+        f"Ingestion complete: {result.inserted} inserted, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.removed} removed, "
+        f"{result.invalid} invalid, {len(result.skipped_slugs)} skipped."
+    )
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
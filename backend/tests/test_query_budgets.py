@@ -0,0 +1,121 @@
+"""
+SQL statement budgets of every router, reads and writes, against the fan-out data of conftest.py.
+
+The read budgets are the table of scripts/check_query_budgets.py (one source for both);
+writes are measured once, without a warm-up, since repeating them would measure a no-op.
+Budgets are upper bounds; when a change legitimately needs another query, raise the
+budget in the same PR so the reviewer sees it.
+"""
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from scripts.check_query_budgets import BUDGETS, UNBUDGETED, uncovered_routes
+
+API = settings.API_V1_STR
+
+
+def assert_within_budget(stats, response, budget: int) -> None:
+    assert response.status_code < 400, f"HTTP {response.status_code}: {response.text[:500]}"
+    statements = "\n".join(" ".join(statement.split())[:200] for statement in stats.statements)
+    assert stats.count <= budget, f"{stats.count} statements, budget {budget}:\n{statements}"
+
+
+def _label(budget) -> str:
+    return budget.path + (f"?{'&'.join(f'{k}={v}' for k, v in budget.params.items())}" if budget.params else "")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("budget", BUDGETS, ids=_label)
+async def test_read_budget(budget, seeded, client, count_queries):
+    try:
+        path = API + budget.path.format(**seeded.fixtures)
+        params = {key: value.format(**seeded.fixtures) for key, value in (budget.params or {}).items()}
+    except KeyError as e:
+        pytest.fail(f"No seeded fixture for {e} in {_label(budget)}")
+    headers = seeded.headers(budget.auth)
+
+    await client.get(path, params=params, headers=headers) # Warm-up: reference data, token cache, statement cache
+    with count_queries() as stats:
+        response = await client.get(path, params=params, headers=headers)
+    assert_within_budget(stats, response, budget.max_queries)
+
+
+def test_every_read_route_has_a_budget():
+    assert uncovered_routes() == []
+    routes = {getattr(route, "path", "") for route in app.routes}
+    assert not [path for path in UNBUDGETED if API + path not in routes], "UNBUDGETED lists a route that no longer exists"
+
+
+@pytest.mark.asyncio
+async def test_login_budget(seeded, client, count_queries):
+    payload = {"email": seeded.reviewer_email, "password": seeded.reviewer_password}
+    with count_queries() as stats:
+        response = await client.post(f"{API}/auth/login", json=payload)
+    assert_within_budget(stats, response, 1)
+
+
+@pytest.mark.asyncio
+async def test_profile_update_budget(seeded, client, count_queries):
+    with count_queries() as stats:
+        response = await client.patch(f"{API}/auth/profile", json={"nickname": "budget-reviewer"}, headers=seeded.headers("user"))
+    assert_within_budget(stats, response, 4)
+
+
+@pytest.mark.asyncio
+async def test_review_create_budget(seeded, client, count_queries):
+    item_id = seeded.unreviewed_item_id
+    payload = {"item_id": item_id, "rating": 5, "comment": "Measured by the budget test.", "moderation_status": "pending"}
+    with count_queries() as stats:
+        response = await client.post(f"{API}/reviews/item/{item_id}", json=payload, headers=seeded.headers("user"))
+    assert_within_budget(stats, response, 11)
+
+
+@pytest.mark.asyncio
+async def test_review_vote_budget(seeded, client, count_queries):
+    with count_queries() as stats:
+        response = await client.post(
+            f"{API}/reviews/{seeded.votable_review_id}/vote", json={"is_useful": True}, headers=seeded.headers("user")
+        )
+    assert_within_budget(stats, response, 11)
+
+
+@pytest.mark.asyncio
+async def test_admin_moderate_review_budget(seeded, client, count_queries):
+    with count_queries() as stats:
+        response = await client.patch(
+            f"{API}/admin/reviews/{seeded.pending_review_id}/moderate",
+            json={"moderation_status": "approved"}, headers=seeded.headers("admin"),
+        )
+    assert_within_budget(stats, response, 15)
+
+
+@pytest.mark.asyncio
+async def test_admin_exchange_update_budget(seeded, client, count_queries):
+    # Every country at once: the budget must not grow with the number of links
+    payload = {"available_in_country_ids": seeded.country_ids}
+    with count_queries() as stats:
+        response = await client.put(
+            f"{API}/admin/exchanges/{seeded.plain_exchange_slug}", json=payload, headers=seeded.headers("admin")
+        )
+    assert_within_budget(stats, response, 27)
+
+
+@pytest.mark.asyncio
+async def test_admin_exchange_links_budget(seeded, client, count_queries):
+    payload = {"add": seeded.tag_ids, "remove": []}
+    with count_queries() as stats:
+        response = await client.patch(
+            f"{API}/admin/exchanges/{seeded.plain_exchange_slug}/links/tags", json=payload, headers=seeded.headers("admin")
+        )
+    assert_within_budget(stats, response, 26)
+
+
+@pytest.mark.asyncio
+async def test_admin_static_page_update_budget(seeded, client, count_queries):
+    payload = {"title": "About the site", "content": "Updated by the budget test."}
+    with count_queries() as stats:
+        response = await client.put(
+            f"{API}/admin/static-pages/{seeded.fixtures['static_slug']}", json=payload, headers=seeded.headers("admin")
+        )
+    assert_within_budget(stats, response, 6)
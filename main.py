@@ -1,59 +1,273 @@
+import asyncio
+import gzip
+import hashlib
+import mimetypes
 import os
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 # from fastapi.responses import PlainTextResponse # Uncomment if using custom 404 handler
 
+try:
+    import brotli # Optional: without it only gzip variants are built
+except ImportError:
+    brotli = None
+
 # Define the path to the frontend directory relative to this script
 FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "frontend")
 
-app = FastAPI()
+# Development: rescan the frontend directory every FRONTEND_WATCH_INTERVAL seconds and reload changed files
+FRONTEND_WATCH = os.getenv("FRONTEND_WATCH", "false").lower() in ("1", "true", "yes")
+FRONTEND_WATCH_INTERVAL = float(os.getenv("FRONTEND_WATCH_INTERVAL", 1))
 
-# Route for the root path "/" to serve index.html
-@app.get("/")
-async def serve_index():
-    index_path = os.path.join(FRONTEND_DIR, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
-    raise HTTPException(status_code=404, detail="index.html not found")
+SKIPPED_DIRS = {"node_modules", "__pycache__"}
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ("application/javascript", "application/json", "application/manifest+json", "image/svg+xml", "application/xml")
 
+# Content-hashed file names (app.3f9a1c2e.js, chunk-5d41402abc4b2a76.css) never change content, so they may be cached forever
+HASHED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache" # Cached, but revalidated with the ETag on every use
 
-# Route for the root path "/" to serve index.html
-@app.get("/exchanges")
-async def serve_index():
-    index_path = os.path.join(FRONTEND_DIR, "exchanges/index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
-    raise HTTPException(status_code=404, detail="exchanges/index.html not found")
+
+@dataclass
+class Asset:
+    """One frontend file held in memory, with its validators and precompressed variants."""
+    body: bytes
+    content_type: str
+    etag: str
+    last_modified: str
+    cache_control: str
+    mtime_ns: int
+    variants: Dict[str, Tuple[bytes, str]] = field(default_factory=dict) # Content coding -> (body, etag)
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0]
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+def load_asset(path: str, name: str) -> Asset:
+    with open(path, "rb") as f:
+        body = f.read()
+    mtime_ns = os.stat(path).st_mtime_ns
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    asset = Asset(
+        body=body,
+        content_type=content_type,
+        etag=f'"{digest}"',
+        last_modified=formatdate(mtime_ns / 1e9, usegmt=True),
+        cache_control=IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(name) else REVALIDATE_CACHE_CONTROL,
+        mtime_ns=mtime_ns,
+    )
+    if len(body) >= COMPRESS_MIN_SIZE and _is_compressible(content_type):
+        # Each encoding is its own representation, so it gets its own strong ETag
+        encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=11)
+        for encoding, data in encoded.items():
+            if len(data) < len(body):
+                asset.variants[encoding] = (data, f'"{digest}-{encoding}"')
+    return asset
+
+
+class AssetTable:
+    """
+    The frontend directory loaded into memory at startup: requests are dict lookups, with no
+    filesystem access. With FRONTEND_WATCH, a background task rescans and reloads changed files.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.assets: Dict[str, Asset] = {} # Path relative to the directory, "/"-separated
+
+    def _scan(self) -> Dict[str, Tuple[str, int]]:
+        files = {}
+        for root, dirs, names in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS and not d.startswith(".")]
+            for name in names:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                files[os.path.relpath(path, self.directory).replace(os.sep, "/")] = (path, os.stat(path).st_mtime_ns)
+        return files
+
+    def load(self) -> int:
+        """(Re)load new and changed files and drop deleted ones; returns how many files changed."""
+        files = self._scan()
+        assets, changed = {}, 0
+        for name, (path, mtime_ns) in files.items():
+            asset = self.assets.get(name)
+            if asset is None or asset.mtime_ns != mtime_ns:
+                asset = load_asset(path, name)
+                changed += 1
+            assets[name] = asset
+        changed += len(self.assets.keys() - assets.keys())
+        self.assets = assets # Swapped in one assignment, so requests never see a half-loaded table
+        return changed
+
+    async def watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = await asyncio.to_thread(self.load)
+            except OSError as e: # A file vanished mid-scan (editor swap files, rebuilds); retry next round
+                print(f"Frontend reload failed: {e}")
+                continue
+            if changed:
+                print(f"Reloaded {changed} frontend file(s)")
+
+    def get(self, name: str) -> Optional[Asset]:
+        return self.assets.get(name)
+
+
+asset_table = AssetTable(FRONTEND_DIR)
+
+
+def _etag_matches(header: str, *etags: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return any(etag in tags for etag in etags)
+
+
+def _accepted_encodings(header: str) -> set:
+    """Codings of an Accept-Encoding header that aren't refused with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        try:
+            weight = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weight = 0.0
+        if coding and weight > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """A single "bytes=" range as (start, end) inclusive; None when absent, malformed or multi-range (whole body is sent)."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first: # Suffix range: the last N bytes
+            length = int(last)
+            return (max(size - length, 0), size - 1) if length > 0 else (size, size)
+        start = int(first)
+        end = int(last) if last else max(size - 1, start)
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    return start, min(end, size - 1) # start >= size: unsatisfiable, answered with 416
+
+
+def _negotiate(asset: Asset, accept_encoding: str) -> Tuple[Optional[str], bytes, str]:
+    """The (content coding, body, ETag) of the representation to send for an Accept-Encoding header."""
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding in asset.variants and encoding in accepted:
+            body, etag = asset.variants[encoding]
+            return encoding, body, etag
+    return None, asset.body, asset.etag
+
+
+def asset_response(request: Request, asset: Asset) -> Response:
+    """Serve an asset with ETag/Last-Modified/Cache-Control, answering 304, 206 (Range) or a precompressed variant."""
+    headers = {"Cache-Control": asset.cache_control, "Last-Modified": asset.last_modified, "Accept-Ranges": "bytes"}
+    if asset.variants:
+        headers["Vary"] = "Accept-Encoding"
+    encoding, body, etag = _negotiate(asset, request.headers.get("accept-encoding", ""))
+
+    # Only the negotiated representation counts: a 304 carries its ETag, which caches use to pick the stored variant
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", asset.etag) == asset.etag:
+        size = len(asset.body)
+        byte_range = _parse_range(range_header, size)
+        if byte_range is not None:
+            start, end = byte_range
+            if start >= size:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+            return Response(
+                content=asset.body[start:end + 1],
+                status_code=206,
+                media_type=asset.content_type,
+                headers={**headers, "ETag": asset.etag, "Content-Range": f"bytes {start}-{end}/{size}"},
+            )
+
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.content_type, headers={**headers, "ETag": etag})
+
+
+def serve_asset(request: Request, name: str, detail: str = "Resource not found") -> Response:
+    asset = asset_table.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail=detail)
+    return asset_response(request, asset)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    count = len(asset_table.assets) or asset_table.load()
+    print(f"Loaded {count} frontend files into memory")
+    watcher = asyncio.create_task(asset_table.watch(FRONTEND_WATCH_INTERVAL)) if FRONTEND_WATCH else None
+    yield
+    if watcher is not None:
+        watcher.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Route for the root path "/" to serve index.html
-@app.get("/books")
-async def serve_index():
-    index_path = os.path.join(FRONTEND_DIR, "books/index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
-    raise HTTPException(status_code=404, detail="books/index.html not found")
+@app.api_route("/", methods=["GET", "HEAD"])
+async def serve_index(request: Request):
+    return serve_asset(request, "index.html", "index.html not found")
+
+
+# Route for "/exchanges" to serve exchanges/index.html
+@app.api_route("/exchanges", methods=["GET", "HEAD"])
+async def serve_exchanges_index(request: Request):
+    return serve_asset(request, "exchanges/index.html", "exchanges/index.html not found")
+
+# Route for "/books" to serve books/index.html
+@app.api_route("/books", methods=["GET", "HEAD"])
+async def serve_books_index(request: Request):
+    return serve_asset(request, "books/index.html", "books/index.html not found")
 
 
 
 # Route to serve specific HTML pages like /faq, /about, etc.
-@app.get("/{page_slug}")
-async def serve_page(page_slug: str):
-    # Prevent directory traversal attacks and ignore requests with extensions
+@app.api_route("/{page_slug}", methods=["GET", "HEAD"])
+async def serve_page(page_slug: str, request: Request):
+    if "." in page_slug and not page_slug.endswith(".html"):
+        # Top-level assets (favicon.ico, app.js, ...)
+        return serve_asset(request, page_slug)
     page_slug = page_slug.replace('.html', '')  # Remove .html if present
-    if ".." in page_slug or page_slug.startswith("/") or "." in page_slug:
-         # Let StaticFiles handle requests with extensions (like .css, .js)
-         # or raise 404 if it's not found by StaticFiles either.
-         # We explicitly raise 404 here for disallowed patterns.
-        raise HTTPException(status_code=404, detail="Not Found")
+    # The table only holds files inside FRONTEND_DIR, so a lookup can't traverse out of it
+    return serve_asset(request, f"{page_slug}.html")
 
-    page_path = os.path.join(FRONTEND_DIR, f"{page_slug}.html")
-    if os.path.exists(page_path):
-        return FileResponse(page_path)
-    # If the HTML file doesn't exist, raise 404. StaticFiles below handles assets.
-    raise HTTPException(status_code=404, detail=f"Resource not found")
 
-app.mount("/", StaticFiles(directory=FRONTEND_DIR, html=False), name="static") # html=False prevents StaticFiles serving index.html for directories
+# Everything else: assets by path (CSS, JS, images). Directories don't serve index.html
+@app.api_route("/{asset_path:path}", methods=["GET", "HEAD"])
+async def serve_static(asset_path: str, request: Request):
+    return serve_asset(request, asset_path, "Not Found")
 
 
 if __name__ == "__main__":
@@ -61,4 +275,5 @@ if __name__ == "__main__":
     # Run the server; host="0.0.0.0" makes it accessible on the network
     # Use port 8080 to avoid conflict with the default API port 8000
     print(f"Serving frontend from: {FRONTEND_DIR}")
+    # uvicorn's reload restarts on .py changes; FRONTEND_WATCH=1 reloads changed frontend files in place
     uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True) # Added reload=True for development